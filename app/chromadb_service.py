@@ -10,13 +10,25 @@ ChromaDB Service - Vector database για semantic search.
 
 import chromadb
 from chromadb.config import Settings
-from typing import List, Dict, Tuple, Optional
+from typing import List, Dict, Tuple, Optional, Union
+import hashlib
+import json
 import logging
+import os
+import time
 from dataclasses import dataclass
 import numpy as np
 
+from .embeddings_service import EmbeddingStore
+
 logger = logging.getLogger(__name__)
 
+# Configuration
+CHROMA_DB_PATH = "./chroma_db"
+FAST_PATH_MAX_RESULTS = 16  # Μέχρι πόσα αποτελέσματα εξυπηρετεί το in-memory search
+ENABLE_INT8_QUANT = False  # Shadow index σε EmbeddingStore με precision="int8" (4x λιγότερη μνήμη)
+STATS_CACHE_TTL = 5.0  # Δευτερόλεπτα που κρατάμε το count/sample του get_stats
+
 
 @dataclass
 class SearchResult:
@@ -53,7 +65,7 @@ class ChromaDBService:
         # Δημιουργούμε client με persistent storage
         # Τα δεδομένα θα αποθηκεύονται στο ./chroma_db
         self.client = chromadb.PersistentClient(
-            path="./chroma_db",
+            path=CHROMA_DB_PATH,
             settings=Settings(
                 anonymized_telemetry=False,  # Απενεργοποίηση telemetry
                 allow_reset=True,            # Επιτρέπει reset της collection
@@ -64,6 +76,16 @@ class ChromaDBService:
         self.collection_name = collection_name
         self._init_collection()
         
+        # Shadow αντίγραφο των embeddings σε .npy αρχείο δίπλα στο ChromaDB.
+        # Για μικρά knowledge bases ένα brute-force scan σε mmap'ed πίνακα
+        # είναι γρηγορότερο από το HNSW + SQLite του ChromaDB.
+        shadow_prefix = os.path.join(CHROMA_DB_PATH, collection_name)
+        self._matrix_path = f"{shadow_prefix}_embeddings.npy"
+        self._ids_path = f"{shadow_prefix}_ids.npy"
+        self._meta_path = f"{shadow_prefix}_meta.json"
+        self._fast_path = False
+        self._load_shadow_index()
+        
     def _init_collection(self):
         """
         Αρχικοποιεί ή ανακτά την collection.
@@ -74,23 +96,26 @@ class ChromaDBService:
         ΣΗΜΑΝΤΙΚΟ: Χρησιμοποιούμε cosine distance αντί για L2
         για καλύτερα semantic search αποτελέσματα.
         """
-        try:
-            # Προσπαθούμε να πάρουμε υπάρχουσα collection
-            self.collection = self.client.get_collection(self.collection_name)
-            
+        # Κάθε (επαν)αρχικοποίηση ακυρώνει τα cached στατιστικά
+        self._stats_cache = None
+        
+        existing = {c.name: c for c in self.client.list_collections()}
+        collection = existing.get(self.collection_name)
+        
+        if collection is not None:
             # Ελέγχουμε αν χρησιμοποιεί cosine distance
             # Αν όχι, θα πρέπει να τη διαγράψουμε και να τη ξαναφτιάξουμε
-            metadata = self.collection.metadata
-            if metadata.get("hnsw:space") != "cosine":
+            if (collection.metadata or {}).get("hnsw:space") == "cosine":
+                self.collection = collection
+                logger.info(f"✅ Loaded existing collection '{self.collection_name}' (cosine distance)")
+                logger.info(f"   Contains {self.collection.count()} embeddings")
+            else:
                 logger.warning("⚠️  Existing collection uses L2 distance, not cosine!")
                 logger.info("🔄 Recreating collection with cosine distance...")
                 self.client.delete_collection(self.collection_name)
-                raise Exception("Need to recreate with cosine")
-            
-            logger.info(f"✅ Loaded existing collection '{self.collection_name}' (cosine distance)")
-            logger.info(f"   Contains {self.collection.count()} embeddings")
-            
-        except:
+                collection = None
+        
+        if collection is None:
             # Δημιουργούμε νέα collection με cosine distance
             # Το cosine distance είναι καλύτερο για semantic similarity
             # γιατί μετράει τη γωνία μεταξύ των vectors, όχι την απόσταση
@@ -102,12 +127,16 @@ class ChromaDBService:
                 }
             )
             logger.info(f"✅ Created new collection '{self.collection_name}' with COSINE distance")
+        
+        # Τα metadata της collection δεν αλλάζουν, οπότε τα κρατάμε τοπικά
+        self._metadata_cache = dict(self.collection.metadata or {})
     
     def add_embeddings(
         self,
-        embeddings: List[List[float]],
+        embeddings: Union[List[List[float]], np.ndarray],
         qa_pairs: List[Dict],
-        force_reset: bool = False
+        force_reset: bool = False,
+        batch_size: int = 256
     ):
         """
         Προσθέτει embeddings στη collection.
@@ -115,50 +144,210 @@ class ChromaDBService:
         Κάθε embedding αποθηκεύεται μαζί με metadata που μας
         επιτρέπουν να ανακτήσουμε το αρχικό Q&A pair.
         
+        Η εισαγωγή γίνεται σε batches, ώστε σε μεγάλα knowledge bases
+        να μην έχουμε ένα τεράστιο write που "φουσκώνει" τη μνήμη.
+        
         Args:
-            embeddings: List με τα embedding vectors
+            embeddings: Τα embedding vectors (πίνακας N x D ή list of lists)
             qa_pairs: List με τα Q&A pair objects (as dicts)
             force_reset: Αν True, διαγράφει τα παλιά δεδομένα
+            batch_size: Πόσα embeddings γράφονται ανά κλήση στο ChromaDB
         """
         if force_reset:
             # Διαγράφουμε και ξαναδημιουργούμε τη collection
             self.client.delete_collection(self.collection_name)
             self._init_collection()
+            self._remove_shadow_index()
             logger.info("🔄 Reset collection")
         
+        # Κανονικοποιούμε όλα τα vectors μαζί πριν την αποθήκευση,
+        # ώστε το cosine distance να αντιστοιχεί σε dot product
+        matrix = np.asarray(embeddings, dtype=np.float32)
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        matrix = matrix / norms
+        
         # Προετοιμάζουμε τα δεδομένα για το ChromaDB
-        ids = []
-        documents = []
-        metadatas = []
+        # Μοναδικό ID για κάθε embedding
+        ids = [f"qa_{qa['id']}" for qa in qa_pairs]
         
-        for i, qa in enumerate(qa_pairs):
-            # Μοναδικό ID για κάθε embedding
-            ids.append(f"qa_{qa['id']}")
-            
-            # Το πλήρες κείμενο (αυτό θα εμφανίζεται στα αποτελέσματα)
-            documents.append(qa['full_text'])
-            
-            # Metadata για να μπορούμε να ανακτήσουμε πληροφορίες
-            metadatas.append({
+        # Το πλήρες κείμενο (αυτό θα εμφανίζεται στα αποτελέσματα)
+        documents = [qa['full_text'] for qa in qa_pairs]
+        
+        # Metadata για να μπορούμε να ανακτήσουμε πληροφορίες
+        metadatas = [
+            {
                 "qa_id": qa['id'],
                 "question": qa['question'],
                 "answer": qa['answer']
-            })
-        
-        # Προσθήκη στο ChromaDB
-        self.collection.add(
-            embeddings=embeddings,
-            documents=documents,
-            metadatas=metadatas,
-            ids=ids
-        )
+            }
+            for qa in qa_pairs
+        ]
+        
+        # Προσθήκη στο ChromaDB σε batches
+        # Το ChromaDB API θέλει lists, οπότε μετατρέπουμε μόνο εδώ
+        total = len(matrix)
+        for start in range(0, total, batch_size):
+            end = start + batch_size
+            self.collection.add(
+                embeddings=matrix[start:end].tolist(),
+                documents=documents[start:end],
+                metadatas=metadatas[start:end],
+                ids=ids[start:end]
+            )
+            logger.info(f"   Stored embeddings {start + 1}-{min(end, total)} of {total}")
         
-        logger.info(f"✅ Added {len(embeddings)} embeddings to ChromaDB")
+        logger.info(f"✅ Added {total} embeddings to ChromaDB")
         logger.info(f"   Total embeddings in collection: {self.collection.count()}")
+        self._stats_cache = None
+        
+        # Ενημερώνουμε το shadow index ώστε να ταιριάζει με τη collection
+        self._write_shadow_index()
+    
+    def _write_shadow_index(self):
+        """
+        Γράφει όλη τη collection σε .npy/.json αρχεία για το fast path.
+        
+        Διαβάζουμε από το ChromaDB (και όχι μόνο τα νέα embeddings)
+        ώστε το αντίγραφο να είναι πάντα ίδιο με τη collection.
+        """
+        data = self.collection.get(include=["embeddings", "documents", "metadatas"])
+        
+        matrix = np.asarray(data['embeddings'], dtype=np.float32)
+        if matrix.size == 0:
+            self._remove_shadow_index()
+            return
+        
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        matrix /= norms
+        
+        rows = [
+            {
+                "qa_id": metadata['qa_id'],
+                "question": metadata['question'],
+                "answer": metadata['answer'],
+                "text": document
+            }
+            for document, metadata in zip(data['documents'], data['metadatas'])
+        ]
+        
+        # Το count και το checksum των ids επιτρέπουν στο _load_shadow_index
+        # να καταλάβει αν τα αρχεία ανήκουν σε άλλη (ή παλιότερη) collection
+        meta = {
+            "count": len(rows),
+            "ids_checksum": self._ids_checksum(data['ids']),
+            "rows": rows
+        }
+        
+        np.save(self._matrix_path, matrix)
+        np.save(self._ids_path, np.array([row["qa_id"] for row in rows], dtype=np.int64))
+        with open(self._meta_path, 'w', encoding='utf-8') as f:
+            json.dump(meta, f, ensure_ascii=False)
+        
+        logger.info(f"💾 Saved shadow index with {len(rows)} embeddings")
+        self._load_shadow_index()
+    
+    @staticmethod
+    def _ids_checksum(ids: List[str]) -> str:
+        """Checksum των ChromaDB ids, ανεξάρτητο από τη σειρά τους."""
+        return hashlib.sha256("\n".join(sorted(ids)).encode('utf-8')).hexdigest()
+    
+    def _load_shadow_index(self):
+        """
+        Φορτώνει το shadow index με mmap (zero-copy από το page cache)
+        σε ένα EmbeddingStore.
+        
+        Τα αρχεία χρησιμοποιούνται μόνο αν το count και το checksum των ids
+        τους ταιριάζουν με τη collection. Αλλιώς (π.χ. η collection
+        ξαναφτιάχτηκε ή τα αρχεία είναι από άλλο knowledge base) τα
+        διαγράφουμε και τα searches πηγαίνουν κανονικά στο ChromaDB.
+        """
+        self._fast_path = False
+        paths = (self._matrix_path, self._ids_path, self._meta_path)
+        if not all(os.path.exists(path) for path in paths):
+            return
+        
+        try:
+            matrix = np.load(self._matrix_path, mmap_mode='r')
+            self._ids = np.load(self._ids_path, mmap_mode='r')
+            with open(self._meta_path, 'r', encoding='utf-8') as f:
+                meta = json.load(f)
+        except (OSError, ValueError) as e:
+            logger.warning(f"⚠️  Could not load shadow index: {e}")
+            return
+        
+        # Παλιά αρχεία (χωρίς count/checksum) δεν μπορούν να ελεγχθούν
+        if not isinstance(meta, dict) or "rows" not in meta:
+            logger.warning("⚠️  Shadow index has no checksum, removing it")
+            self._remove_shadow_index()
+            return
+        self._rows = meta["rows"]
+        
+        if not (len(matrix) == len(self._ids) == len(self._rows) == meta.get("count")):
+            logger.warning("⚠️  Shadow index files are inconsistent, removing them")
+            self._remove_shadow_index()
+            return
+        
+        collection_ids = self.collection.get(include=[])['ids']
+        if (len(collection_ids) != meta["count"]
+                or self._ids_checksum(collection_ids) != meta.get("ids_checksum")):
+            logger.warning("⚠️  Shadow index does not match the collection, removing it")
+            self._remove_shadow_index()
+            return
+        
+        # Η αναζήτηση γίνεται από ένα EmbeddingStore, όπως και στο RAG service,
+        # οπότε η int8 εκδοχή χρησιμοποιεί το ίδιο quantize_int8 και scale.
+        # Το _write_shadow_index γράφει ήδη unit vectors, οπότε με float32
+        # ο mmap'ed πίνακας χρησιμοποιείται όπως είναι, χωρίς αντίγραφο
+        self._store = EmbeddingStore(
+            matrix,
+            precision="int8" if ENABLE_INT8_QUANT else "float32",
+            normalized=True
+        )
+        
+        self._fast_path = True
+        logger.info(f"⚡ Loaded shadow index with {len(self._rows)} embeddings")
+    
+    def _remove_shadow_index(self):
+        """Διαγράφει τα shadow αρχεία (π.χ. όταν αδειάζει η collection)."""
+        self._fast_path = False
+        self._store = self._ids = self._rows = None
+        for path in (self._matrix_path, self._ids_path, self._meta_path):
+            if os.path.exists(path):
+                os.remove(path)
+    
+    def _search_shadow_index(
+        self,
+        query_embedding: Union[List[float], np.ndarray],
+        n_results: int
+    ) -> List[SearchResult]:
+        """
+        Brute-force cosine search στο EmbeddingStore του shadow index.
+        
+        Τα cosine similarities είναι κατά προσέγγιση αν είναι ενεργό
+        το ENABLE_INT8_QUANT. Χρησιμοποιούμε την ίδια κλίμακα με
+        το ChromaDB: cosine distance = 1 - cos, similarity = 1 - distance / 2.
+        """
+        top = self._store.search(query_embedding, n_results)
+        
+        search_results = []
+        for row_index, cosine in top:
+            row = self._rows[row_index]
+            similarity = min(max((1.0 + cosine) / 2.0, 0.0), 1.0)
+            search_results.append(SearchResult(
+                qa_id=row['qa_id'],
+                text=row['text'],
+                question=row['question'],
+                answer=row['answer'],
+                similarity=similarity
+            ))
+        
+        return search_results
     
     def search(
         self,
-        query_embedding: List[float],
+        query_embedding: Union[List[float], np.ndarray],
         n_results: int = 3
     ) -> List[SearchResult]:
         """
@@ -179,74 +368,70 @@ class ChromaDBService:
         Returns:
             List of SearchResult objects, ταξινομημένα κατά similarity
         """
+        # Fast path: in-memory search στο shadow index
+        if self._fast_path and n_results <= FAST_PATH_MAX_RESULTS:
+            return self._search_shadow_index(query_embedding, n_results)
+        
         # Query στο ChromaDB
         results = self.collection.query(
-            query_embeddings=[query_embedding],
+            query_embeddings=[np.asarray(query_embedding, dtype=np.float32).tolist()],
             n_results=n_results,
             include=["documents", "metadatas", "distances"]
         )
         
-        # Μετατροπή αποτελεσμάτων σε SearchResult objects
-        search_results = []
-        
         # Το ChromaDB επιστρέφει lists of lists (για batch queries)
         # Εμείς έχουμε μόνο ένα query, οπότε παίρνουμε το πρώτο
         documents = results['documents'][0]
         metadatas = results['metadatas'][0]
-        distances = results['distances'][0]
+        distances = np.asarray(results['distances'][0], dtype=np.float32)
         
-        # Ας καταλάβουμε τι distances παίρνουμε
-        logger.debug(f"🔍 Raw cosine distances: {distances}")
+        # Μετατροπή cosine distance σε similarity (0-1 range), για όλα
+        # τα αποτελέσματα μαζί:
+        # distance = 0 → similarity = 1
+        # distance = 1 → similarity = 0.5
+        # distance = 2 → similarity = 0
+        # Αν το ChromaDB επιστρέψει distance > 2 (διαφορετικό scaling),
+        # χρησιμοποιούμε την εναλλακτική μετατροπή 1 / (1 + distance)
+        unexpected = distances > 2
+        if unexpected.any():
+            logger.warning("⚠️  Unexpected cosine distance > 2: %s",
+                           distances[unexpected].tolist())
+        similarities = np.where(unexpected, 1.0 / (1.0 + distances), 1.0 - distances * 0.5)
+        np.clip(similarities, 0.0, 1.0, out=similarities)
         
-        for i in range(len(documents)):
-            # Μετατροπή cosine distance σε similarity score
-            # Το cosine distance στο ChromaDB κυμαίνεται από 0 έως 2
-            # όπου 0 = ίδια vectors, 1 = ορθογώνια, 2 = αντίθετα
-            distance = distances[i]
-            
-            # Μετατροπή σε similarity (0-1 range)
-            # Για normalized embeddings, το cosine similarity = 1 - (cosine_distance / 2)
-            # Αλλά το ChromaDB μπορεί να χρησιμοποιεί διαφορετικό scaling
-            
-            # Ας ελέγξουμε αν οι αποστάσεις είναι στο αναμενόμενο range [0, 2]
-            if distance > 2:
-                # Αν οι αποστάσεις είναι μεγαλύτερες από 2, το ChromaDB
-                # μπορεί να χρησιμοποιεί διαφορετικό scaling
-                logger.warning(f"⚠️  Unexpected cosine distance > 2: {distance}")
-                # Χρησιμοποιούμε εναλλακτική μετατροπή
-                similarity = 1.0 / (1.0 + distance)
-            else:
-                # Κανονική μετατροπή για cosine distance [0, 2]
-                # distance = 0 → similarity = 1
-                # distance = 1 → similarity = 0.5
-                # distance = 2 → similarity = 0
-                similarity = 1.0 - (distance / 2.0)
-            
-            # Βεβαιωνόμαστε ότι το similarity είναι στο [0, 1]
-            similarity = max(0.0, min(1.0, similarity))
-            
-            # Log για debugging
-            logger.debug(f"   Result {i+1}: distance={distance:.4f}, "
-                        f"similarity={similarity:.3f}, "
-                        f"question='{metadatas[i]['question'][:50]}...'")
-            
-            result = SearchResult(
-                qa_id=metadatas[i]['qa_id'],
-                text=documents[i],
-                question=metadatas[i]['question'],
-                answer=metadatas[i]['answer'],
-                similarity=float(similarity)
-            )
-            search_results.append(result)
+        # Log για debugging, μόνο αν είναι ενεργό το DEBUG level
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(f"🔍 Raw cosine distances: {distances.tolist()}")
+            for i, (distance, similarity, metadata) in enumerate(
+                zip(distances.tolist(), similarities.tolist(), metadatas)
+            ):
+                logger.debug(f"   Result {i+1}: distance={distance:.4f}, "
+                            f"similarity={similarity:.3f}, "
+                            f"question='{metadata['question'][:50]}...'")
         
-        return search_results
+        # Μετατροπή αποτελεσμάτων σε SearchResult objects
+        return [
+            SearchResult(
+                qa_id=metadata['qa_id'],
+                text=document,
+                question=metadata['question'],
+                answer=metadata['answer'],
+                similarity=similarity
+            )
+            for document, metadata, similarity in zip(documents, metadatas, similarities.tolist())
+        ]
     
-    def get_stats(self) -> Dict:
+    def _get_count_and_sample(self) -> Tuple[int, Optional[Dict]]:
         """
-        Επιστρέφει στατιστικά για τη collection.
+        Επιστρέφει (count, sample) της collection, με cache STATS_CACHE_TTL.
         
-        Χρήσιμο για debugging και monitoring.
+        Έτσι ένα monitoring endpoint που καλεί συχνά το get_stats
+        δεν κάνει κάθε φορά count() + peek() στο ChromaDB.
         """
+        now = time.monotonic()
+        if self._stats_cache is not None and now - self._stats_cache[0] < STATS_CACHE_TTL:
+            return self._stats_cache[1], self._stats_cache[2]
+        
         count = self.collection.count()
         
         # Παίρνουμε ένα sample για να δούμε τη δομή
@@ -259,19 +444,23 @@ class ChromaDBService:
                     "metadata": sample_results['metadatas'][0]
                 }
         
-        # Προσπαθούμε να πάρουμε πληροφορίες για το distance metric
-        try:
-            metadata = self.collection.metadata
-            distance_metric = metadata.get("hnsw:space", "unknown")
-        except:
-            distance_metric = "unknown"
+        self._stats_cache = (now, count, sample)
+        return count, sample
+    
+    def get_stats(self) -> Dict:
+        """
+        Επιστρέφει στατιστικά για τη collection.
+        
+        Χρήσιμο για debugging και monitoring.
+        """
+        count, sample = self._get_count_and_sample()
         
         return {
             "collection_name": self.collection_name,
             "total_embeddings": count,
-            "distance_metric": distance_metric,
+            "distance_metric": self._metadata_cache.get("hnsw:space", "unknown"),
             "sample": sample,
-            "storage_path": "./chroma_db"
+            "storage_path": CHROMA_DB_PATH
         }
     
     def clear_collection(self):
@@ -282,12 +471,13 @@ class ChromaDBService:
         """
         self.client.delete_collection(self.collection_name)
         self._init_collection()
+        self._remove_shadow_index()
         logger.info("🧹 Cleared collection")
     
     def find_similar_questions(
         self,
         question: str,
-        query_embedding: List[float],
+        query_embedding: Union[List[float], np.ndarray],
         threshold: float = 0.7
     ) -> List[str]:
         """
@@ -310,4 +500,17 @@ class ChromaDBService:
             if result.similarity >= threshold and result.question.lower() != question.lower():
                 similar_questions.append(result.question)
         
-        return similar_questions[:3]  # Max 3 προτάσεις
\ No newline at end of file
+        return similar_questions[:3]  # Max 3 προτάσεις
+
+
+# Global instance του service, δημιουργείται την πρώτη φορά που χρειάζεται
+# ώστε τα scripts που το χρησιμοποιούν να ανοίγουν τον client μία φορά
+_chromadb_service: Optional[ChromaDBService] = None
+
+
+def get_chromadb_service() -> ChromaDBService:
+    """Lazy initialization του ChromaDB service."""
+    global _chromadb_service
+    if _chromadb_service is None:
+        _chromadb_service = ChromaDBService()
+    return _chromadb_service
@@ -0,0 +1,32 @@
+"""
+Command line εργαλεία για το FAQ service.
+
+Usage:
+    python -m app.cli init-db
+"""
+
+import argparse
+
+from .database import engine
+from .models import Base
+
+
+def init_db():
+    """Δημιουργεί τους πίνακες στη βάση (αν δεν υπάρχουν ήδη)."""
+    Base.metadata.create_all(bind=engine)
+    print("📚 Database tables created/verified")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="FAQ Service management commands")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    subparsers.add_parser("init-db", help="Create the database tables")
+    
+    args = parser.parse_args()
+    
+    if args.command == "init-db":
+        init_db()
+
+
+if __name__ == "__main__":
+    main()
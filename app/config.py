@@ -0,0 +1,34 @@
+"""
+Κεντρικές ρυθμίσεις του FAQ service.
+
+Οι τιμές διαβάζονται μία φορά από environment variables κατά το import,
+ώστε όλα τα modules να μοιράζονται την ίδια πηγή.
+"""
+
+import os
+from dataclasses import dataclass
+
+
+@dataclass(frozen=True)
+class Timeouts:
+    """
+    Timeouts (σε δευτερόλεπτα) για τα HTTP requests προς το Ollama.
+    
+    Το connect είναι μικρό ώστε ένα Ollama που δεν τρέχει να αποτυγχάνει
+    γρήγορα, ενώ το read είναι μεγάλο γιατί το generation μπορεί να αργήσει.
+    """
+    connect: float = 5.0   # TCP connect
+    read: float = 60.0     # Αναμονή για την απάντηση (και για το write του request)
+    pool: float = 5.0      # Αναμονή για ελεύθερη connection από το pool
+
+    @classmethod
+    def from_env(cls) -> "Timeouts":
+        """Διαβάζει τα LLM_CONNECT_TIMEOUT, LLM_READ_TIMEOUT, LLM_POOL_TIMEOUT."""
+        return cls(
+            connect=float(os.getenv("LLM_CONNECT_TIMEOUT", cls.connect)),
+            read=float(os.getenv("LLM_READ_TIMEOUT", cls.read)),
+            pool=float(os.getenv("LLM_POOL_TIMEOUT", cls.pool)),
+        )
+
+
+LLM_TIMEOUTS = Timeouts.from_env()
@@ -3,25 +3,56 @@ Database configuration and session management.
 Αυτό το αρχείο ρυθμίζει τη σύνδεση με τη βάση δεδομένων.
 """
 
-from sqlalchemy import create_engine
-from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy import create_engine, event
+from sqlalchemy.pool import QueuePool
+from sqlalchemy.orm import DeclarativeBase, sessionmaker
 
 # Δημιουργούμε τη σύνδεση με SQLite
 # Το sqlite:///./faq.db σημαίνει: χρησιμοποίησε SQLite και αποθήκευσε στο αρχείο faq.db
 SQLALCHEMY_DATABASE_URL = "sqlite:///./faq.db"
 
+# PRAGMAs που εκτελούνται σε κάθε νέα σύνδεση SQLite:
+# - WAL: οι readers δεν μπλοκάρουν όσο γράφει ο writer
+# - synchronous=NORMAL: λιγότερα fsync, ασφαλές σε συνδυασμό με WAL
+# - temp_store=MEMORY: τα προσωρινά (sorts, indexes) μένουν στη μνήμη
+# - cache_size=-65536: 64MB page cache (αρνητική τιμή = KiB)
+# - mmap_size: 256MB memory-mapped I/O
+SQLITE_PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA cache_size=-65536",
+    "PRAGMA mmap_size=268435456",
+)
+
 # Δημιουργούμε τη "μηχανή" που θα διαχειρίζεται τη σύνδεση
 engine = create_engine(
-    SQLALCHEMY_DATABASE_URL, 
-    connect_args={"check_same_thread": False}  # Απαραίτητο για SQLite
+    SQLALCHEMY_DATABASE_URL,
+    connect_args={"check_same_thread": False},  # Απαραίτητο για SQLite
+    poolclass=QueuePool,
+    pool_size=10,
+    max_overflow=20,
+    pool_pre_ping=True  # Ελέγχει ότι η σύνδεση ζει πριν τη δώσει σε request
 )
 
+
+@event.listens_for(engine, "connect")
+def _set_sqlite_pragmas(dbapi_connection, connection_record):
+    """Ρυθμίζει κάθε νέα SQLite σύνδεση με τα SQLITE_PRAGMAS."""
+    cursor = dbapi_connection.cursor()
+    try:
+        for pragma in SQLITE_PRAGMAS:
+            cursor.execute(pragma)
+    finally:
+        cursor.close()
+
+
 # Δημιουργούμε το SessionLocal - αυτό θα χρησιμοποιούμε για κάθε database operation
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
 # Base class για τα models μας - όλα τα tables θα κληρονομούν από αυτό
-Base = declarative_base()
+class Base(DeclarativeBase):
+    pass
 
 # Dependency για το FastAPI - δίνει μας database session για κάθε request
 def get_db():
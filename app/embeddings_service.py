@@ -6,16 +6,204 @@ Embeddings Service - Μετατρέπει κείμενο σε vectors.
 """
 
 import requests
+from requests.adapters import HTTPAdapter
+from concurrent.futures import ThreadPoolExecutor
+from collections import OrderedDict
 import numpy as np
-from typing import List, Dict, Any, Tuple
+from typing import List, Dict, Any, Tuple, Optional, Union
+import hashlib
 import logging
-import time
+import threading
+
+# Προαιρετικό: SIMD kernels για το cosine similarity. Αν δεν είναι
+# εγκατεστημένο, το semantic search γίνεται με NumPy (BLAS).
+try:
+    import simsimd
+except ImportError:
+    simsimd = None
 
 logger = logging.getLogger(__name__)
 
 # Configuration
 OLLAMA_BASE_URL = "http://localhost:11434"
 EMBEDDING_MODEL = "nomic-embed-text"  # Lightweight embedding model
+EMBEDDING_CONCURRENCY = 8  # Πόσα embedding requests τρέχουν ταυτόχρονα
+EMBEDDING_CACHE_SIZE = 4096  # Πόσα query embeddings κρατάμε στη μνήμη
+EMBEDDING_BATCH_SIZE = 256  # Πόσα κείμενα στέλνονται σε κάθε /api/embed request
+EMBEDDINGS_WARM_ON_START = True  # Φόρτωση του model στο Ollama κατά το startup
+STORE_PRECISIONS = ("float32", "float16", "int8")  # Επιτρεπτές ακρίβειες του EmbeddingStore
+
+
+def _normalize(vec) -> np.ndarray:
+    """
+    Κανονικοποιεί ένα vector σε μοναδιαίο μήκος (norm = 1).
+    
+    Για unit vectors το cosine similarity είναι απλά το dot product.
+    Το (v @ v) ** 0.5 είναι φθηνότερο από το np.linalg.norm.
+    """
+    v = np.asarray(vec, dtype=np.float32)
+    n = (v @ v) ** 0.5
+    return v / n if n else v
+
+
+def select_top_k(scores: np.ndarray, k: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Επιστρέφει τα indices και τα scores των k μεγαλύτερων τιμών,
+    ταξινομημένα κατά φθίνουσα σειρά.
+    
+    Το argpartition είναι O(N), οπότε ταξινομούμε μόνο τα k
+    αποτελέσματα και όχι ολόκληρο τον πίνακα.
+    """
+    if k < len(scores):
+        top = np.argpartition(-scores, k)[:k]
+    else:
+        top = np.arange(len(scores))
+    
+    top = top[np.argsort(-scores[top])]
+    return top, scores[top]
+
+
+def quantize_int8(
+    matrix: np.ndarray, 
+    quantile: float = 0.99
+) -> Tuple[np.ndarray, float]:
+    """
+    Scalar quantization σε int8 με ένα κοινό scale για όλο τον πίνακα.
+    
+    Το scale βγαίνει από το 99ο percentile των απόλυτων τιμών, ώστε
+    λίγες ακραίες τιμές να μη "σπαταλούν" το εύρος των 256 επιπέδων.
+    Οι τιμές έξω από το εύρος κόβονται στο [-128, 127].
+    
+    Args:
+        matrix: Float πίνακας (ή ένα vector)
+        quantile: Ποιο percentile των |τιμών| αντιστοιχεί στο 127
+        
+    Returns:
+        Tuple (int8 πίνακας, scale) με matrix ≈ quantized * scale
+    """
+    matrix = np.asarray(matrix, dtype=np.float32)
+    scale = float(np.quantile(np.abs(matrix), quantile)) / 127.0
+    if scale == 0:
+        scale = 1.0
+    
+    quantized = np.clip(np.round(matrix / scale), -128, 127).astype(np.int8)
+    return quantized, scale
+
+
+class EmbeddingStore:
+    """
+    Αποθήκη embeddings σε μορφή πίνακα.
+    
+    Αντί για List[List[float]] (ένα Python float object ανά τιμή),
+    κρατάμε όλα τα embeddings σε ένα contiguous float32 πίνακα (N, D)
+    με κανονικοποιημένα rows. Έτσι η αναζήτηση γίνεται με ένα
+    matrix-vector product χωρίς επιπλέον μετατροπές.
+    """
+    
+    def __init__(
+        self,
+        embeddings: Union[List[List[float]], np.ndarray],
+        ids: Optional[List[int]] = None,
+        precision: str = "float32",
+        normalized: bool = False
+    ):
+        """
+        Args:
+            embeddings: Τα embedding vectors (list of lists ή πίνακας N x D)
+            ids: Προαιρετικά IDs για κάθε row (default: 0..N-1)
+            precision: Πώς κρατάμε τον πίνακα στη μνήμη - "float32",
+                "float16" (μισή μνήμη) ή "int8" (scalar quantization,
+                1/4 της μνήμης). Το query μένει πάντα float32.
+            normalized: Αν True, τα rows είναι ήδη unit vectors. Με
+                float32 πίνακα (π.χ. mmap'ed .npy) δεν γίνεται αντίγραφο.
+        """
+        if precision not in STORE_PRECISIONS:
+            raise ValueError(f"Unknown precision '{precision}', expected one of {STORE_PRECISIONS}")
+        
+        if normalized:
+            matrix = np.asarray(embeddings, dtype=np.float32)
+            if matrix.ndim == 1:
+                matrix = matrix[np.newaxis, :]
+        else:
+            matrix = np.array(embeddings, dtype=np.float32, ndmin=2)
+            
+            # Normalization μία φορά κατά την εισαγωγή
+            norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+            norms[norms == 0] = 1.0
+            matrix /= norms
+        
+        # Το scale επαναφέρει τα int8 dot products στην κλίμακα του cosine
+        self.precision = precision
+        self.scale = 1.0
+        if precision == "float16":
+            matrix = matrix.astype(np.float16)
+        elif precision == "int8":
+            matrix, self.scale = quantize_int8(matrix)
+        
+        self.matrix = matrix
+        self.ids = (
+            np.arange(len(matrix), dtype=np.int64) if ids is None
+            else np.asarray(ids, dtype=np.int64)
+        )
+    
+    def __len__(self) -> int:
+        return len(self.matrix)
+
+    def search(
+        self,
+        query_embedding: Union[List[float], np.ndarray],
+        k: int
+    ) -> List[Tuple[int, float]]:
+        """
+        Flat inner-product αναζήτηση (brute force, ακριβή αποτελέσματα).
+
+        Τα rows είναι unit vectors, οπότε ένα matrix-vector product
+        δίνει κατευθείαν τα cosine similarities.
+
+        Args:
+            query_embedding: Το embedding της ερώτησης
+            k: Πόσα αποτελέσματα να επιστρέψει
+
+        Returns:
+            List of tuples (id, cosine similarity), ταξινομημένα φθίνοντα
+        """
+        if len(self.matrix) == 0 or k <= 0:
+            return []
+
+        top_indices, top_scores = select_top_k(self.similarities(query_embedding), k)
+        return list(zip(self.ids[top_indices].tolist(), top_scores.tolist()))
+
+    def similarities(self, query_embedding: Union[List[float], np.ndarray]) -> np.ndarray:
+        """
+        Cosine similarity του query με όλα τα rows, ως float32 array.
+
+        Το query δεν κβαντίζεται (asymmetric), οπότε το μόνο σφάλμα
+        είναι αυτό της αποθήκευσης του πίνακα σε float16/int8.
+        """
+        query = _normalize(query_embedding)
+        
+        if simsimd is not None and self.precision == "float32":
+            # Το simsimd επιστρέφει cosine distance (1 - cos) για κάθε row,
+            # χωρίς το overhead μιας BLAS κλήσης για μικρούς πίνακες
+            distances = np.asarray(
+                simsimd.cdist(query[np.newaxis, :], self.matrix, metric="cosine"),
+                dtype=np.float32
+            ).ravel()
+            similarities = 1.0 - distances
+        else:
+            similarities = (self.matrix @ query).astype(np.float32, copy=False)
+            if self.scale != 1.0:
+                similarities *= self.scale
+
+        # Το rounding μπορεί να δώσει π.χ. 1.0000001
+        np.clip(similarities, -1.0, 1.0, out=similarities)
+        return similarities
+
+    def to_float16(self) -> np.ndarray:
+        """Αντίγραφο του πίνακα σε float16 (μισή μνήμη, π.χ. για caching)."""
+        if self.precision == "int8":
+            return (self.matrix * self.scale).astype(np.float16)
+        return self.matrix.astype(np.float16)
 
 
 class EmbeddingsService:
@@ -40,6 +228,29 @@ class EmbeddingsService:
         """
         self.base_url = base_url
         self.model = model
+        
+        # Persistent session με keep-alive connection pool,
+        # ώστε να μην ανοίγουμε νέα σύνδεση για κάθε embedding
+        self._session = requests.Session()
+        # Ένα host (το Ollama), αλλά έως EMBEDDING_CONCURRENCY ταυτόχρονες
+        # συνδέσεις από το batch path - το pool_maxsize πρέπει να τις χωράει
+        adapter = HTTPAdapter(
+            pool_connections=4, 
+            pool_maxsize=max(16, EMBEDDING_CONCURRENCY)
+        )
+        self._session.mount("http://", adapter)
+        self._session.mount("https://", adapter)
+        
+        # None = δεν έχουμε ελέγξει ακόμα αν υπάρχει το /api/embed
+        self._native_batch: Optional[bool] = None
+        
+        # LRU cache για embeddings: οι χρήστες ρωτάνε συχνά τα ίδια,
+        # και κάθε embedding κοστίζει ένα HTTP round-trip στο Ollama
+        self._cache: "OrderedDict[bytes, np.ndarray]" = OrderedDict()
+        self._cache_lock = threading.Lock()
+        self._cache_hits = 0
+        self._cache_misses = 0
+        
         self._ensure_model_available()
     
     def _ensure_model_available(self):
@@ -49,7 +260,7 @@ class EmbeddingsService:
         """
         try:
             # Έλεγχος αν το model υπάρχει
-            response = requests.get(f"{self.base_url}/api/tags")
+            response = self._session.get(f"{self.base_url}/api/tags")
             models = response.json().get("models", [])
             model_names = [m["name"] for m in models]
             
@@ -61,7 +272,7 @@ class EmbeddingsService:
                 
                 # Προσπαθούμε να το κατεβάσουμε αυτόματα
                 logger.info("🔄 Attempting to pull model automatically...")
-                pull_response = requests.post(
+                pull_response = self._session.post(
                     f"{self.base_url}/api/pull",
                     json={"name": self.model}
                 )
@@ -78,8 +289,25 @@ class EmbeddingsService:
             raise ConnectionError(
                 "Cannot connect to Ollama. Make sure it's running with: ollama serve"
             )
+        
+        if EMBEDDINGS_WARM_ON_START:
+            self._warm_up()
     
-    def create_embedding(self, text: str) -> List[float]:
+    def _warm_up(self):
+        """
+        Στέλνει ένα dummy embedding request ώστε το Ollama να φορτώσει
+        το model στη μνήμη κατά το startup.
+        
+        Αλλιώς το cold load (μερικά δευτερόλεπτα) το πληρώνει
+        η πρώτη πραγματική ερώτηση χρήστη.
+        """
+        try:
+            self.create_embedding("warmup")
+            logger.info(f"🔥 Embedding model '{self.model}' warmed up")
+        except Exception as e:
+            logger.warning(f"⚠️  Embedding model warm-up failed: {e}")
+    
+    def create_embedding(self, text: str) -> np.ndarray:
         """
         Δημιουργεί embedding για ένα κείμενο.
         
@@ -87,11 +315,14 @@ class EmbeddingsService:
         το νόημα του κειμένου. Παρόμοια κείμενα θα έχουν
         παρόμοια embeddings (μικρή απόσταση μεταξύ τους).
         
+        Τα αποτελέσματα κρατιούνται σε LRU cache, οπότε μια ερώτηση
+        που έχει ξαναγίνει δεν χρειάζεται νέο request στο Ollama.
+        
         Args:
             text: Το κείμενο που θα μετατραπεί
             
         Returns:
-            List of floats (το embedding vector)
+            Float32 numpy array (το embedding vector, κανονικοποιημένο σε norm = 1)
         """
         try:
             # Καθαρίζουμε το κείμενο
@@ -99,8 +330,21 @@ class EmbeddingsService:
             if not text:
                 raise ValueError("Cannot create embedding for empty text")
             
+            # Έλεγχος στο cache - το key είναι ένα μικρό hash του (model, text)
+            key = hashlib.blake2b(
+                f"{self.model}\0{text}".encode("utf-8"), digest_size=8
+            ).digest()
+            
+            with self._cache_lock:
+                cached = self._cache.get(key)
+                if cached is not None:
+                    self._cache.move_to_end(key)
+                    self._cache_hits += 1
+                    return cached
+                self._cache_misses += 1
+            
             # API call στο Ollama
-            response = requests.post(
+            response = self._session.post(
                 f"{self.base_url}/api/embeddings",
                 json={
                     "model": self.model,
@@ -109,56 +353,177 @@ class EmbeddingsService:
             )
             response.raise_for_status()
             
-            # Παίρνουμε το embedding
-            embedding = response.json()["embedding"]
+            # Παίρνουμε το embedding και το κανονικοποιούμε μία φορά εδώ,
+            # ώστε οι συγκρίσεις να είναι απλά dot products
+            embedding = _normalize(response.json()["embedding"])
+            
+            # Το ίδιο array επιστρέφεται σε όλους, οπότε δεν επιτρέπουμε αλλαγές
+            embedding.setflags(write=False)
+            
+            with self._cache_lock:
+                self._cache[key] = embedding
+                if len(self._cache) > EMBEDDING_CACHE_SIZE:
+                    self._cache.popitem(last=False)
             
             return embedding
             
         except Exception as e:
-            logger.error(f"Error creating embedding: {e}")
+            logger.error("Error creating embedding: %s", e)
             raise
     
+    def cache_clear(self):
+        """Αδειάζει το embeddings cache και τα στατιστικά του (χρήσιμο για testing)."""
+        with self._cache_lock:
+            self._cache.clear()
+            self._cache_hits = 0
+            self._cache_misses = 0
+    
+    def cache_stats(self) -> Dict[str, int]:
+        """
+        Στατιστικά του embeddings cache, όπως το cache_info() του lru_cache.
+        
+        Returns:
+            Dictionary με hits, misses, size και maxsize
+        """
+        with self._cache_lock:
+            return {
+                "hits": self._cache_hits,
+                "misses": self._cache_misses,
+                "size": len(self._cache),
+                "maxsize": EMBEDDING_CACHE_SIZE
+            }
+    
     def create_embeddings_batch(
         self, 
         texts: List[str], 
-        show_progress: bool = True
-    ) -> List[List[float]]:
+        show_progress: bool = True,
+        batch_size: int = EMBEDDING_BATCH_SIZE
+    ) -> np.ndarray:
         """
         Δημιουργεί embeddings για πολλά κείμενα.
         
-        Επεξεργάζεται τα κείμενα ένα-ένα με progress indication.
-        Σε production θα χρησιμοποιούσαμε true batching,
-        αλλά το Ollama δεν το υποστηρίζει ακόμα.
+        Αν το Ollama υποστηρίζει το batch endpoint (/api/embed) στέλνουμε
+        τα κείμενα σε chunks των batch_size, ώστε ένα μεγάλο knowledge base
+        να μη γίνεται ένα τεράστιο request. Αλλιώς στέλνουμε τα requests
+        ταυτόχρονα μέσω thread pool, αφού ο χρόνος καθορίζεται από τα
+        HTTP round-trips και όχι από υπολογισμούς.
         
         Args:
             texts: List με τα κείμενα
             show_progress: Αν θα δείχνει progress bar
+            batch_size: Πόσα κείμενα ανά /api/embed request
             
         Returns:
-            List of embeddings (κάθε embedding είναι list of floats)
+            Float32 πίνακας (N, D) με ένα κανονικοποιημένο embedding
+            ανά row, στην ίδια σειρά με τα texts
         """
-        embeddings = []
+        if not texts:
+            return np.empty((0, 0), dtype=np.float32)
         
-        for i, text in enumerate(texts):
-            if show_progress:
-                print(f"\r📊 Creating embeddings: {i+1}/{len(texts)}", end="")
-            
-            # Μικρή καθυστέρηση για να μην πνίξουμε το Ollama
-            if i > 0:
-                time.sleep(0.1)
-            
-            embedding = self.create_embedding(text)
-            embeddings.append(embedding)
+        # Dedupe: κάθε μοναδικό κείμενο στέλνεται μία μόνο φορά στο Ollama.
+        # Το back_index δείχνει για κάθε input ποιο unique row του αντιστοιχεί.
+        seen: Dict[str, int] = {}
+        unique_texts = []
+        back_index = []
+        for text in texts:
+            key = text.strip()
+            if key not in seen:
+                seen[key] = len(unique_texts)
+                unique_texts.append(key)
+            back_index.append(seen[key])
+        
+        if show_progress and len(unique_texts) < len(texts):
+            print(f"♻️  Skipping {len(texts) - len(unique_texts)} duplicate texts")
+        
+        embeddings = self._create_embeddings_native(unique_texts, batch_size)
+        
+        if embeddings is None:
+            embeddings = self._create_embeddings_concurrent(unique_texts, show_progress)
+        
+        # Ανακατασκευή της πλήρους σειράς (N, D) από τα unique rows
+        if len(unique_texts) < len(texts):
+            embeddings = embeddings[back_index]
         
         if show_progress:
             print(f"\r✅ Created {len(embeddings)} embeddings successfully!")
         
         return embeddings
     
+    def _create_embeddings_native(
+        self, 
+        texts: List[str],
+        batch_size: int = EMBEDDING_BATCH_SIZE
+    ) -> Optional[np.ndarray]:
+        """
+        Batch embeddings μέσω του /api/embed, ένα request ανά batch_size κείμενα.
+        
+        Το endpoint υπάρχει μόνο σε νεότερες εκδόσεις του Ollama.
+        Ελέγχουμε μία φορά αν υπάρχει και θυμόμαστε το αποτέλεσμα.
+        
+        Returns:
+            Τα embeddings, ή None αν το endpoint δεν υποστηρίζεται
+        """
+        if self._native_batch is False:
+            return None
+        
+        cleaned = [text.strip() for text in texts]
+        if not all(cleaned):
+            raise ValueError("Cannot create embedding for empty text")
+        
+        # Κάθε chunk γράφεται κατευθείαν στη θέση του στον τελικό πίνακα
+        embeddings = None
+        
+        for start in range(0, len(cleaned), batch_size):
+            response = self._session.post(
+                f"{self.base_url}/api/embed",
+                json={
+                    "model": self.model,
+                    "input": cleaned[start:start + batch_size]
+                }
+            )
+            
+            if response.status_code == 404:
+                # Παλιότερο Ollama - χρησιμοποιούμε το /api/embeddings
+                logger.info("Ollama has no /api/embed endpoint, using concurrent requests")
+                self._native_batch = False
+                return None
+            
+            response.raise_for_status()
+            self._native_batch = True
+            
+            chunk = EmbeddingStore(response.json()["embeddings"]).matrix
+            if embeddings is None:
+                embeddings = np.empty((len(cleaned), chunk.shape[1]), dtype=np.float32)
+            embeddings[start:start + len(chunk)] = chunk
+        
+        return embeddings
+    
+    def _create_embeddings_concurrent(
+        self, 
+        texts: List[str], 
+        show_progress: bool
+    ) -> np.ndarray:
+        """
+        Στέλνει ένα request ανά κείμενο, με έως EMBEDDING_CONCURRENCY
+        requests ταυτόχρονα πάνω στο ίδιο connection pool.
+        """
+        embeddings = []
+        
+        with ThreadPoolExecutor(max_workers=EMBEDDING_CONCURRENCY) as executor:
+            futures = executor.map(self.create_embedding, texts)
+            
+            for i, embedding in enumerate(futures):
+                if show_progress:
+                    print(f"\r📊 Creating embeddings: {i+1}/{len(texts)}", end="")
+                embeddings.append(embedding)
+        
+        # Ένας contiguous πίνακας (N, D) αντί για N ξεχωριστά vectors
+        return np.vstack(embeddings)
+    
     def cosine_similarity(
         self, 
-        embedding1: List[float], 
-        embedding2: List[float]
+        embedding1: Union[List[float], np.ndarray], 
+        embedding2: Union[List[float], np.ndarray]
     ) -> float:
         """
         Υπολογίζει την ομοιότητα μεταξύ δύο embeddings.
@@ -176,27 +541,32 @@ class EmbeddingsService:
         Returns:
             Similarity score (0 έως 1 συνήθως)
         """
-        # Μετατροπή σε numpy arrays για ευκολότερους υπολογισμούς
-        vec1 = np.array(embedding1)
-        vec2 = np.array(embedding2)
+        vec1 = np.asarray(embedding1, dtype=np.float32)
+        vec2 = np.asarray(embedding2, dtype=np.float32)
+        
+        if simsimd is not None:
+            # Μηδενικό vector: ίδια συμπεριφορά με το NumPy path (0.0)
+            if not vec1.any() or not vec2.any():
+                return 0.0
+            # SIMD kernel για dot και norms σε ένα πέρασμα (cosine distance = 1 - cos)
+            return float(1.0 - simsimd.cosine(vec1, vec2))
         
         # Cosine similarity = dot product / (norm1 * norm2)
-        dot_product = np.dot(vec1, vec2)
-        norm1 = np.linalg.norm(vec1)
-        norm2 = np.linalg.norm(vec2)
+        # Τα embeddings από το create_embedding είναι ήδη unit vectors,
+        # οπότε τα norms είναι 1 και μένει μόνο το dot product
+        norm1 = (vec1 @ vec1) ** 0.5
+        norm2 = (vec2 @ vec2) ** 0.5
         
         # Αποφυγή διαίρεσης με μηδέν
         if norm1 == 0 or norm2 == 0:
             return 0.0
         
-        similarity = dot_product / (norm1 * norm2)
-        
-        return float(similarity)
+        return float((vec1 @ vec2) / (norm1 * norm2))
     
     def find_most_similar(
         self, 
-        query_embedding: List[float],
-        embeddings_db: List[List[float]],
+        query_embedding: Union[List[float], np.ndarray],
+        embeddings_db: Union[List[List[float]], np.ndarray, EmbeddingStore],
         top_k: int = 3
     ) -> List[Tuple[int, float]]:
         """
@@ -204,24 +574,27 @@ class EmbeddingsService:
         
         Args:
             query_embedding: Το embedding της ερώτησης
-            embeddings_db: List με όλα τα embeddings της βάσης
+            embeddings_db: Όλα τα embeddings της βάσης (list, πίνακας ή EmbeddingStore)
             top_k: Πόσα αποτελέσματα να επιστρέψει
             
         Returns:
             List of tuples (index, similarity_score)
         """
-        similarities = []
+        if len(embeddings_db) == 0 or top_k <= 0:
+            return []
         
-        # Υπολογίζουμε similarity με κάθε embedding στη βάση
-        for i, db_embedding in enumerate(embeddings_db):
-            similarity = self.cosine_similarity(query_embedding, db_embedding)
-            similarities.append((i, similarity))
+        # Αν δεν μας δώσουν έτοιμο store, φτιάχνουμε έναν κανονικοποιημένο
+        # πίνακα (N, D). Για επαναλαμβανόμενες αναζητήσεις είναι καλύτερο
+        # να περνάμε EmbeddingStore ώστε η normalization να γίνεται μία φορά.
+        if not isinstance(embeddings_db, EmbeddingStore):
+            embeddings_db = EmbeddingStore(embeddings_db)
         
-        # Ταξινομούμε κατά φθίνουσα σειρά similarity
-        similarities.sort(key=lambda x: x[1], reverse=True)
+        # Ένα matrix-vector product (BLAS) για όλα τα similarities
+        similarities = embeddings_db.similarities(query_embedding)
         
-        # Επιστρέφουμε τα top_k
-        return similarities[:top_k]
+        top_indices, top_scores = select_top_k(similarities, top_k)
+        
+        return list(zip(top_indices.tolist(), top_scores.tolist()))
     
     def test_similarity(self):
         """
@@ -250,6 +623,19 @@ class EmbeddingsService:
             print()
 
 
+# Global instance του service, δημιουργείται την πρώτη φορά που χρειάζεται
+# ώστε τα scripts που το χρησιμοποιούν να μοιράζονται session και cache
+_embeddings_service: Optional[EmbeddingsService] = None
+
+
+def get_embeddings_service() -> EmbeddingsService:
+    """Lazy initialization του embeddings service."""
+    global _embeddings_service
+    if _embeddings_service is None:
+        _embeddings_service = EmbeddingsService()
+    return _embeddings_service
+
+
 # Utility function
 def test_embeddings():
     """Γρήγορο test για τα embeddings."""
@@ -5,25 +5,57 @@ Knowledge Base Parser - Διαβάζει και οργανώνει το knowledg
 σε δομημένα Q&A pairs που μπορούμε να επεξεργαστούμε.
 """
 
-import re
-from typing import List, Dict, Tuple
-from dataclasses import dataclass
+from typing import List, Dict, Tuple, Iterator, Optional
+from dataclasses import dataclass, field
 import logging
+import mmap
+import os
+import re
 
 logger = logging.getLogger(__name__)
 
+# Ένα "token" για το keyword index: συνεχόμενοι word characters
+_TOKEN_RE = re.compile(r'\w+')
+
+# Γραμμή που ανοίγει ερώτηση ή απάντηση, με προαιρετική αρίθμηση
+# ή bullet μπροστά (π.χ. "Q: ...", "1. Q: ...", "- A: ...")
+_QUESTION_LINE_RE = re.compile(r'\s*(?:(?:\d+[.)]|[-*•])\s*)?Q:')
+_ANSWER_LINE_RE = re.compile(r'\s*(?:(?:\d+[.)]|[-*•])\s*)?A:')
+
+# "A:" μέσα στη γραμμή της ερώτησης (format "Q: ... A: ..." σε μία γραμμή)
+_INLINE_ANSWER_RE = re.compile(r'\bA:')
 
-@dataclass
+# Μέγιστο μήκος (χαρακτήρες) του answer_preview
+ANSWER_PREVIEW_LENGTH = 200
+
+
+@dataclass(frozen=True, slots=True)
 class QAPair:
     """
     Αναπαριστά ένα ζευγάρι ερώτησης-απάντησης.
     
     Χρησιμοποιούμε dataclass για clean και type-safe κώδικα.
     Κάθε QAPair είναι ένα αυτόνομο chunk πληροφορίας.
+    
+    Είναι immutable (frozen), οπότε το full_text και το answer_preview
+    υπολογίζονται μία φορά στη δημιουργία και δεν αλλάζουν ποτέ.
     """
     question: str
     answer: str
     id: int  # Μοναδικό ID για κάθε pair
+    full_text: str = field(init=False, repr=False, compare=False)
+    answer_preview: str = field(init=False, repr=False, compare=False)  # Για το /rag/search
+    
+    def __post_init__(self):
+        # Frozen dataclass: το setattr περνάει μέσω object
+        object.__setattr__(
+            self, 'full_text', f"Question: {self.question}\nAnswer: {self.answer}"
+        )
+        
+        preview = self.answer
+        if len(preview) > ANSWER_PREVIEW_LENGTH:
+            preview = preview[:ANSWER_PREVIEW_LENGTH] + "..."
+        object.__setattr__(self, 'answer_preview', preview)
     
     def to_text(self) -> str:
         """
@@ -32,7 +64,7 @@ class QAPair:
         Συνδυάζουμε question και answer γιατί θέλουμε το search
         να βρίσκει chunks είτε από την ερώτηση είτε από την απάντηση.
         """
-        return f"Question: {self.question}\nAnswer: {self.answer}"
+        return self.full_text
     
     def to_dict(self) -> Dict[str, any]:
         """Μετατροπή σε dictionary για εύκολη αποθήκευση."""
@@ -40,7 +72,7 @@ class QAPair:
             "id": self.id,
             "question": self.question,
             "answer": self.answer,
-            "full_text": self.to_text()
+            "full_text": self.full_text
         }
 
 
@@ -61,6 +93,9 @@ class KnowledgeBaseParser:
         """
         self.file_path = file_path
         self.qa_pairs: List[QAPair] = []
+        self._by_id: Dict[int, QAPair] = {}
+        self._keyword_index: Dict[str, List[int]] = {}
+        self._stats: Optional[Dict[str, any]] = None  # Cache του get_stats
         
     def parse(self) -> List[QAPair]:
         """
@@ -68,7 +103,7 @@ class KnowledgeBaseParser:
         
         Η διαδικασία:
         1. Διαβάζει όλο το αρχείο
-        2. Χρησιμοποιεί regex για να βρει Q: και A: patterns
+        2. Περνάει μία φορά τις γραμμές ψάχνοντας για Q: και A: στην αρχή τους
         3. Δημιουργεί QAPair objects
         4. Καθαρίζει και validates τα δεδομένα
         
@@ -76,33 +111,20 @@ class KnowledgeBaseParser:
             List of QAPair objects
         """
         try:
-            # Διαβάζουμε το αρχείο
-            with open(self.file_path, 'r', encoding='utf-8') as f:
-                content = f.read()
-            
-            # Regex pattern για να βρούμε Q&A pairs
-            # Ψάχνουμε για "Q:" στην αρχή γραμμής, μετά οτιδήποτε μέχρι "A:", 
-            # και μετά την απάντηση μέχρι το επόμενο "Q:" ή το τέλος
-            pattern = r'Q:\s*(.*?)\s*A:\s*(.*?)(?=Q:|$)'
+            # Διαβάζουμε το αρχείο γραμμή-γραμμή μέσω mmap, χωρίς
+            # να φτιάξουμε ένα αντίγραφο ολόκληρου του αρχείου ως str
+            with open(self.file_path, 'rb') as f:
+                if os.fstat(f.fileno()).st_size == 0:
+                    # Το mmap δεν δουλεύει σε κενά αρχεία
+                    self.qa_pairs = []
+                else:
+                    with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                        self.qa_pairs = self._parse_lines(self._iter_lines(mm))
             
-            # Βρίσκουμε όλα τα matches
-            matches = re.findall(pattern, content, re.DOTALL)
-            
-            # Δημιουργούμε QAPair objects
-            self.qa_pairs = []
-            for i, (question, answer) in enumerate(matches):
-                # Καθαρίζουμε whitespace και empty lines
-                question = self._clean_text(question)
-                answer = self._clean_text(answer)
-                
-                # Μόνο αν έχουμε και question και answer
-                if question and answer:
-                    qa_pair = QAPair(
-                        id=i,
-                        question=question,
-                        answer=answer
-                    )
-                    self.qa_pairs.append(qa_pair)
+            # Index για O(1) αναζήτηση βάσει ID
+            self._by_id = {qa.id: qa for qa in self.qa_pairs}
+            self._keyword_index = self._build_keyword_index(self.qa_pairs)
+            self._stats = None
             
             logger.info(f"✅ Parsed {len(self.qa_pairs)} Q&A pairs from knowledge base")
             
@@ -119,26 +141,112 @@ class KnowledgeBaseParser:
             logger.error(f"Error parsing knowledge base: {e}")
             raise
     
-    def _clean_text(self, text: str) -> str:
+    @staticmethod
+    def _iter_lines(mm: mmap.mmap) -> Iterator[str]:
         """
-        Καθαρίζει το κείμενο από περιττά whitespaces και characters.
+        Επιστρέφει τις γραμμές του mmap'ed αρχείου ως str.
+        
+        Κάνουμε decode μία γραμμή κάθε φορά, οπότε δεν κρατάμε
+        ποτέ στη μνήμη ολόκληρο το αρχείο ως Python string.
+        """
+        for raw_line in iter(mm.readline, b''):
+            yield raw_line.decode('utf-8').rstrip('\r\n')
+    
+    def _parse_lines(self, lines: Iterator[str]) -> List[QAPair]:
+        """
+        Γραμμικό πέρασμα πάνω στις γραμμές του knowledge base.
+        
+        Μια γραμμή που ξεκινάει με "Q:" (ή "1. Q:") ανοίγει νέο pair και
+        μια γραμμή που ξεκινάει με "A:" ξεκινάει την απάντηση. Ένα "A:"
+        μέσα στη γραμμή της ερώτησης ("Q: ... A: ...") ξεκινάει επίσης
+        την απάντηση. Οι υπόλοιπες γραμμές συνεχίζουν την ερώτηση ή την
+        απάντηση που είναι ανοιχτή. Κείμενο πριν από το πρώτο "Q:" (π.χ.
+        τίτλος) αγνοείται.
+        
+        Τα IDs μετράνε μόνο τα blocks που έχουν "A:", όπως και στο παλιό
+        regex parsing, οπότε ένα "Q:" χωρίς απάντηση δεν μετακινεί τα IDs
+        των επόμενων pairs (που είναι ήδη αποθηκευμένα στο ChromaDB/cache).
         
         Args:
-            text: Raw text από το file
+            lines: Οι γραμμές του αρχείου
             
         Returns:
-            Καθαρισμένο κείμενο
+            List of QAPair objects
         """
-        # Αφαιρούμε περιττά whitespaces
-        text = ' '.join(text.split())
+        qa_pairs = []
+        question_lines: List[str] = []
+        answer_lines: List[str] = []
+        mode = None  # None, "q" ή "a"
+        pair_index = 0
         
-        # Αφαιρούμε leading/trailing whitespace
-        text = text.strip()
+        def flush():
+            nonlocal pair_index
+            if mode != 'a':
+                if mode == 'q':
+                    logger.warning(
+                        "Skipping question without answer: %.50s",
+                        self._clean_text(' '.join(question_lines))
+                    )
+                return
+            
+            # Καθαρίζουμε whitespace και empty lines
+            question = self._clean_text(' '.join(question_lines))
+            answer = self._clean_text(' '.join(answer_lines))
+            
+            # Μόνο αν έχουμε και question και answer
+            if question and answer:
+                qa_pairs.append(QAPair(
+                    id=pair_index,
+                    question=question,
+                    answer=answer
+                ))
+            pair_index += 1
         
-        # Αντικαθιστούμε πολλαπλά spaces με ένα
-        text = re.sub(r'\s+', ' ', text)
+        for line in lines:
+            marker = _QUESTION_LINE_RE.match(line)
+            if marker:
+                flush()
+                question_text = line[marker.end():]
+                inline_answer = _INLINE_ANSWER_RE.search(question_text)
+                if inline_answer:
+                    question_lines = [question_text[:inline_answer.start()]]
+                    answer_lines = [question_text[inline_answer.end():]]
+                    mode = 'a'
+                else:
+                    question_lines = [question_text]
+                    answer_lines = []
+                    mode = 'q'
+                continue
+            
+            if mode == 'q':
+                marker = _ANSWER_LINE_RE.match(line)
+                if marker:
+                    answer_lines.append(line[marker.end():])
+                    mode = 'a'
+                else:
+                    question_lines.append(line)
+            elif mode == 'a':
+                answer_lines.append(line)
+        
+        flush()
+        
+        return qa_pairs
+    
+    @staticmethod
+    def _clean_text(text: str) -> str:
+        """
+        Καθαρίζει το κείμενο από περιττά whitespaces και characters.
         
-        return text
+        Args:
+            text: Raw text από το file
+            
+        Returns:
+            Καθαρισμένο κείμενο
+        """
+        # Το split() χωρίς όρισμα κόβει σε κάθε whitespace και αγνοεί
+        # τα leading/trailing, οπότε το join δίνει ήδη μονά spaces.
+        # Είναι ~4x γρηγορότερο από ένα compiled re.sub(r'\s+', ' ') + strip()
+        return ' '.join(text.split())
     
     def get_by_id(self, qa_id: int) -> QAPair:
         """
@@ -147,10 +255,25 @@ class KnowledgeBaseParser:
         Χρήσιμο όταν το search επιστρέφει IDs και θέλουμε
         να ανακτήσουμε το πλήρες content.
         """
-        for qa in self.qa_pairs:
-            if qa.id == qa_id:
-                return qa
-        raise ValueError(f"QAPair with id {qa_id} not found")
+        try:
+            return self._by_id[qa_id]
+        except KeyError:
+            raise ValueError(f"QAPair with id {qa_id} not found") from None
+    
+    @staticmethod
+    def _build_keyword_index(qa_pairs: List[QAPair]) -> Dict[str, List[int]]:
+        """
+        Χτίζει inverted index: lowercase token -> IDs των pairs που το περιέχουν.
+        
+        Τα IDs μπαίνουν με τη σειρά του knowledge base, οπότε τα
+        αποτελέσματα του search_by_keyword έχουν την ίδια σειρά με πριν.
+        """
+        index: Dict[str, List[int]] = {}
+        for qa in qa_pairs:
+            tokens = set(_TOKEN_RE.findall(f"{qa.question} {qa.answer}".lower()))
+            for token in tokens:
+                index.setdefault(token, []).append(qa.id)
+        return index
     
     def search_by_keyword(self, keyword: str) -> List[QAPair]:
         """
@@ -158,37 +281,73 @@ class KnowledgeBaseParser:
         
         Αυτό είναι ένα fallback για πολύ απλές αναζητήσεις.
         Το κύριο search θα γίνεται με ChromaDB και TF-IDF.
+        
+        Το matching είναι substring (π.χ. το "refund" βρίσκει και τα
+        "Refunds", "refundable"). Μια μονή λέξη βρίσκεται πάντα μέσα σε
+        ένα token, οπότε ψάχνουμε μόνο στο vocabulary του inverted index
+        αντί για όλο το κείμενο. Φράσεις ή keywords με σημεία στίξης
+        πέφτουν σε substring scan των pairs.
         """
         keyword_lower = keyword.lower()
-        results = []
         
-        for qa in self.qa_pairs:
-            if (keyword_lower in qa.question.lower() or 
-                keyword_lower in qa.answer.lower()):
-                results.append(qa)
+        if _TOKEN_RE.fullmatch(keyword_lower):
+            qa_ids = set()
+            for token, token_ids in self._keyword_index.items():
+                if keyword_lower in token:
+                    qa_ids.update(token_ids)
+            # Τα IDs αυξάνονται με τη σειρά του knowledge base
+            return [self._by_id[qa_id] for qa_id in sorted(qa_ids)]
         
-        return results
+        return [
+            qa for qa in self.qa_pairs
+            if keyword_lower in qa.question.lower() or keyword_lower in qa.answer.lower()
+        ]
     
     def get_stats(self) -> Dict[str, any]:
         """
         Επιστρέφει στατιστικά για το knowledge base.
         
-        Χρήσιμο για debugging και monitoring.
+        Χρήσιμο για debugging και monitoring. Τα στατιστικά υπολογίζονται
+        μία φορά ανά parse() και μετά επιστρέφεται αντίγραφο του cache.
         """
         if not self.qa_pairs:
             return {"error": "No Q&A pairs loaded"}
         
-        total_chars = sum(len(qa.to_text()) for qa in self.qa_pairs)
-        avg_q_length = sum(len(qa.question) for qa in self.qa_pairs) / len(self.qa_pairs)
-        avg_a_length = sum(len(qa.answer) for qa in self.qa_pairs) / len(self.qa_pairs)
+        if self._stats is None:
+            self._stats = self._compute_stats()
+        return dict(self._stats)
+    
+    def _compute_stats(self) -> Dict[str, any]:
+        """Υπολογίζει τα στατιστικά του get_stats."""
+        # Ένα μόνο πέρασμα για όλα τα aggregates.
+        # Το to_text() είναι "Question: {q}\nAnswer: {a}", δηλαδή
+        # len(q) + len(a) + 19 χαρακτήρες, χωρίς να το φτιάξουμε.
+        total_chars = 0
+        q_length_sum = 0
+        a_length_sum = 0
+        shortest_q = (float('inf'), None)
+        longest_a = (-1, None)
+        
+        for qa in self.qa_pairs:
+            q_length = len(qa.question)
+            a_length = len(qa.answer)
+            q_length_sum += q_length
+            a_length_sum += a_length
+            total_chars += q_length + a_length + 19
+            if q_length < shortest_q[0]:
+                shortest_q = (q_length, qa)
+            if a_length > longest_a[0]:
+                longest_a = (a_length, qa)
+        
+        total_pairs = len(self.qa_pairs)
         
         return {
-            "total_pairs": len(self.qa_pairs),
+            "total_pairs": total_pairs,
             "total_characters": total_chars,
-            "average_question_length": round(avg_q_length),
-            "average_answer_length": round(avg_a_length),
-            "shortest_question": min(self.qa_pairs, key=lambda x: len(x.question)).question[:50],
-            "longest_answer_preview": max(self.qa_pairs, key=lambda x: len(x.answer)).answer[:100] + "..."
+            "average_question_length": round(q_length_sum / total_pairs),
+            "average_answer_length": round(a_length_sum / total_pairs),
+            "shortest_question": shortest_q[1].question[:50],
+            "longest_answer_preview": longest_a[1].answer[:100] + "..."
         }
 
 
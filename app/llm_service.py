@@ -7,11 +7,20 @@ LLM Service για επικοινωνία με Ollama/Mistral.
 3. Τη διαχείριση του context
 """
 
+import asyncio
+import functools
 import json
-import requests
-from typing import Optional, Dict, Any
+import os
+import random
+import time
+import warnings
+import httpx
+import orjson
+from typing import Optional, Dict, Any, List, AsyncIterator
 import logging
 
+from .config import LLM_TIMEOUTS
+
 # Ρυθμίζουμε το logging για debugging
 logger = logging.getLogger(__name__)
 
@@ -20,6 +29,57 @@ OLLAMA_BASE_URL = "http://localhost:11434"
 DEFAULT_MODEL = "mistral"
 DEFAULT_TEMPERATURE = 0.7  # Πόσο "δημιουργικό" θα είναι το model (0-1)
 DEFAULT_MAX_TOKENS = 500   # Μέγιστο μήκος απάντησης
+# Πόσα generate requests στέλνουμε ταυτόχρονα - ίδιο με το OLLAMA_NUM_PARALLEL του server
+OLLAMA_NUM_PARALLEL = int(os.getenv("OLLAMA_NUM_PARALLEL", "4"))
+LLM_MAX_ATTEMPTS = 3           # Προσπάθειες ανά generate request (timeouts / 5xx)
+CIRCUIT_BREAKER_THRESHOLD = 5  # Συνεχόμενες αποτυχίες πριν "ανοίξει" το circuit
+CIRCUIT_BREAKER_COOLDOWN = 30.0  # Δευτερόλεπτα που απορρίπτουμε αμέσως τα requests
+MAX_CONTEXT_CHARS = 4000  # Άνω όριο στο RAG context, για φραγμένο prefill
+# Πόσο μένει φορτωμένο το model στο Ollama μετά από κάθε request (default του Ollama: 5m)
+OLLAMA_KEEP_ALIVE = os.getenv("OLLAMA_KEEP_ALIVE", "24h")
+TAGS_CACHE_TTL = 30.0  # Δευτερόλεπτα που κρατάμε τη λίστα models του /api/tags
+
+
+# Headers για τα payloads που κάνουμε serialize μόνοι μας με orjson
+_JSON_HEADERS = {"content-type": "application/json"}
+
+# Σταθερά κομμάτια του prompt γύρω από την ερώτηση του χρήστη
+_PROMPT_QUESTION_PREFIX = "Customer Question: "
+_PROMPT_ANSWER_SUFFIX = "\n\nAssistant Answer:"
+
+
+@functools.lru_cache(maxsize=8)
+def _build_system_prompt(knowledge_base: str) -> str:
+    """
+    Φτιάχνει το system prompt για ένα knowledge base.
+    
+    Το knowledge base αλλάζει σπάνια, οπότε κρατάμε το αποτέλεσμα
+    σε cache αντί να αντιγράφουμε όλο το κείμενο σε κάθε ερώτηση.
+    Το key είναι το ίδιο το περιεχόμενο, άρα ένα αλλαγμένο
+    knowledge base παίρνει αυτόματα νέο prompt.
+    """
+    return f"""You are a helpful customer support assistant for CloudSphere Platform.
+
+Your role is to answer customer questions based ONLY on the following knowledge base.
+If a question cannot be answered using the knowledge base, politely say that you don't have that information.
+
+IMPORTANT RULES:
+1. Only use information from the knowledge base below
+2. Be concise and direct in your answers
+3. If you're not sure, say so - don't make up information
+4. Be friendly and professional
+5. Format your answers clearly with proper punctuation
+6. If the question is about something not in the knowledge base, respond with: "I don't have information about that in my knowledge base. Please contact support@cloudsphere.com for assistance with topics not covered here."
+7. If someone asks a general greeting (hello, hi, etc.), respond professionally but remind them you're here to answer CloudSphere-related questions
+
+KNOWLEDGE BASE:
+{knowledge_base}
+
+Remember: You are ONLY a CloudSphere support assistant. Do not answer questions unrelated to CloudSphere or provide information not in the knowledge base above."""
+
+
+class LLMUnavailableError(Exception):
+    """Το circuit breaker είναι ανοιχτό - το Ollama απέτυχε πολλές φορές πρόσφατα."""
 
 
 class LLMService:
@@ -49,20 +109,112 @@ class LLMService:
         self.model = model
         self.temperature = temperature
         
-        # Ελέγχουμε αν το Ollama είναι διαθέσιμο
-        self._check_connection()
+        # Ένας κοινός async client για όλα τα requests, με keep-alive
+        # connections, ώστε να μην πληρώνουμε νέο TCP handshake ανά ερώτηση
+        # και να μην μπλοκάρουμε το event loop του FastAPI.
+        self._client = httpx.AsyncClient(
+            base_url=base_url,
+            timeout=self._timeout(),
+            limits=httpx.Limits(max_keepalive_connections=32, max_connections=64)
+        )
+        
+        # Τα σταθερά κομμάτια των payloads φτιάχνονται μία φορά εδώ,
+        # όχι σε κάθε request
+        self._base_payload = {
+            "model": model,
+            "temperature": temperature,
+            "stream": False,  # Θέλουμε την απάντηση μονομιάς, όχι streaming
+            "keep_alive": OLLAMA_KEEP_ALIVE  # Να μην ξεφορτώνεται το model όταν δεν έχει κίνηση
+        }
+        self._kb_options = {
+            "num_predict": DEFAULT_MAX_TOKENS,
+            "stop": ["Customer Question:", "\n\n"]  # Σταματάει αν δει αυτά
+        }
+        self._context_options = {
+            "num_predict": DEFAULT_MAX_TOKENS,
+            "stop": ["QUESTION:", "\n\n\n"]
+        }
+        
+        # Όριο στα ταυτόχρονα generate requests. Το Ollama εξυπηρετεί μέχρι
+        # OLLAMA_NUM_PARALLEL παράλληλα, τα υπόλοιπα απλώς περιμένουν στην ουρά του.
+        self._semaphore = asyncio.Semaphore(OLLAMA_NUM_PARALLEL)
+        
+        # Circuit breaker: μετά από CIRCUIT_BREAKER_THRESHOLD συνεχόμενες
+        # αποτυχίες, απορρίπτουμε αμέσως τα requests μέχρι το _open_until,
+        # αντί να γεμίζουμε το connection pool με requests που θα κάνουν timeout
+        self._fail_count = 0
+        self._open_until = 0.0
+        
+        # (timestamp, model names) από το τελευταίο /api/tags
+        self._tags_cache: Optional[tuple] = None
     
-    def _check_connection(self) -> None:
+    async def aclose(self) -> None:
+        """Κλείνει τις ανοιχτές connections του client (στο shutdown)."""
+        await self._client.aclose()
+    
+    async def _check_connection(self) -> None:
         """Ελέγχει αν μπορούμε να συνδεθούμε στο Ollama."""
         try:
-            response = requests.get(f"{self.base_url}/api/tags")
+            response = await self._client.get("/api/tags")
             response.raise_for_status()
-            logger.info(f"✅ Connected to Ollama at {self.base_url}")
+            logger.info("[OK] Connected to Ollama at %s", self.base_url)
         except Exception as e:
-            logger.error(f"❌ Cannot connect to Ollama: {e}")
+            logger.error("[FAIL] Cannot connect to Ollama: %s", e)
             logger.error("Make sure Ollama is running with: ollama serve")
             raise ConnectionError(f"Cannot connect to Ollama at {self.base_url}")
     
+    async def verify_connection_with_retry(self, retries: int = 5, backoff: float = 2.0) -> bool:
+        """
+        Ελέγχει τη σύνδεση με το Ollama, με επαναλήψεις.
+        
+        Τρέχει στο background κατά το startup, οπότε ένα Ollama που
+        ξεκινάει λίγο αργότερα (π.χ. σε Docker) δεν ρίχνει την εφαρμογή.
+        
+        Args:
+            retries: Πόσες προσπάθειες θα κάνουμε
+            backoff: Πολλαπλασιαστής της αναμονής ανάμεσα στις προσπάθειες
+            
+        Returns:
+            True αν συνδεθήκαμε, αλλιώς False
+        """
+        delay = 1.0
+        for attempt in range(1, retries + 1):
+            try:
+                await self._check_connection()
+                return True
+            except ConnectionError:
+                if attempt == retries:
+                    break
+                await asyncio.sleep(delay)
+                delay *= backoff
+        
+        logger.warning("[WARN] Ollama not reachable after %d attempts - LLM requests will fail until it is up", retries)
+        return False
+    
+    async def warm_up(self) -> None:
+        """
+        Φορτώνει το model στο Ollama με ένα μικρό generate request.
+        
+        Αλλιώς το φόρτωμα του model (μερικά δευτερόλεπτα) το
+        πληρώνει η πρώτη πραγματική ερώτηση.
+        """
+        try:
+            response = await self._client.post(
+                "/api/generate",
+                content=orjson.dumps({
+                    "model": self.model,
+                    "prompt": " ",
+                    "stream": False,
+                    "keep_alive": OLLAMA_KEEP_ALIVE,
+                    "options": {"num_predict": 1}
+                }),
+                headers=_JSON_HEADERS
+            )
+            response.raise_for_status()
+            logger.info("[OK] LLM model '%s' loaded (keep_alive=%s)", self.model, OLLAMA_KEEP_ALIVE)
+        except Exception as e:
+            logger.warning("[WARN] LLM warm-up failed: %s", e)
+    
     def create_system_prompt(self, knowledge_base: str) -> str:
         """
         Δημιουργεί το system prompt που καθορίζει τη συμπεριφορά του AI.
@@ -78,48 +230,46 @@ class LLMService:
         Returns:
             Το πλήρες system prompt
         """
-        return f"""You are a helpful customer support assistant for CloudSphere Platform.
-
-Your role is to answer customer questions based ONLY on the following knowledge base.
-If a question cannot be answered using the knowledge base, politely say that you don't have that information.
-
-IMPORTANT RULES:
-1. Only use information from the knowledge base below
-2. Be concise and direct in your answers
-3. If you're not sure, say so - don't make up information
-4. Be friendly and professional
-5. Format your answers clearly with proper punctuation
-6. If the question is about something not in the knowledge base, respond with: "I don't have information about that in my knowledge base. Please contact support@cloudsphere.com for assistance with topics not covered here."
-7. If someone asks a general greeting (hello, hi, etc.), respond professionally but remind them you're here to answer CloudSphere-related questions
-
-KNOWLEDGE BASE:
-{knowledge_base}
-
-Remember: You are ONLY a CloudSphere support assistant. Do not answer questions unrelated to CloudSphere or provide information not in the knowledge base above."""
+        return _build_system_prompt(knowledge_base)
     
-    def generate_answer_with_context(
-        self, 
-        question: str, 
-        context: str,
-        max_tokens: int = DEFAULT_MAX_TOKENS
-    ) -> str:
+    @staticmethod
+    def _timeout(read: Optional[float] = None) -> httpx.Timeout:
         """
-        Στέλνει ερώτηση στο LLM με συγκεκριμένο context.
-        
-        Αυτή είναι η νέα μέθοδος που χρησιμοποιεί μόνο το σχετικό
-        context από το RAG, όχι όλο το knowledge base.
-        
-        Args:
-            question: Η ερώτηση του χρήστη
-            context: Το σχετικό context από το RAG search
-            max_tokens: Μέγιστο μήκος απάντησης
-            
-        Returns:
-            Η απάντηση από το LLM
+        Φτιάχνει το httpx.Timeout από το LLM_TIMEOUTS, με προαιρετικά
+        διαφορετικό read timeout (π.χ. για ένα request που ξέρουμε ότι αργεί).
         """
-        try:
-            # Δημιουργούμε πιο στοχευμένο prompt
-            prompt = f"""You are a helpful customer support assistant for CloudSphere Platform.
+        read = LLM_TIMEOUTS.read if read is None else read
+        return httpx.Timeout(
+            connect=LLM_TIMEOUTS.connect,
+            read=read,
+            write=read,
+            pool=LLM_TIMEOUTS.pool
+        )
+    
+    @staticmethod
+    def _options(base_options: Dict[str, Any], max_tokens: int) -> Dict[str, Any]:
+        """Επιστρέφει τα options, αντιγράφοντάς τα μόνο αν αλλάζει το max_tokens."""
+        if max_tokens == DEFAULT_MAX_TOKENS:
+            return base_options
+        return {**base_options, "num_predict": max_tokens}
+    
+    def _context_payload(
+        self,
+        question: str,
+        context: str,
+        max_tokens: int,
+        stream: bool
+    ) -> Dict[str, Any]:
+        """Φτιάχνει το /api/generate payload για ερώτηση με RAG context."""
+        # Κρατάμε το prefill φραγμένο, ό,τι κι αν επιστρέψει το RAG
+        if len(context) > MAX_CONTEXT_CHARS:
+            logger.warning(
+                "[WARN] RAG context is %d chars, truncating to %d", len(context), MAX_CONTEXT_CHARS
+            )
+            context = context[:MAX_CONTEXT_CHARS]
+        
+        # Δημιουργούμε πιο στοχευμένο prompt
+        prompt = f"""You are a helpful customer support assistant for CloudSphere Platform.
 
 Answer the following question based ONLY on the context provided below.
 If the answer cannot be found in the context, say so clearly.
@@ -130,44 +280,100 @@ CONTEXT:
 QUESTION: {question}
 
 ANSWER:"""
-            
-            # Προετοιμάζουμε το request για το Ollama
-            payload = {
-                "model": self.model,
-                "prompt": prompt,
-                "temperature": self.temperature,
-                "stream": False,
-                "options": {
-                    "num_predict": max_tokens,
-                    "stop": ["QUESTION:", "\n\n\n"]
-                }
-            }
-            
-            # Log για debugging
-            logger.info(f"📤 Sending to LLM with context length: {len(context)} chars")
-            
-            # Στέλνουμε το request
-            response = requests.post(
-                f"{self.base_url}/api/generate",
-                json=payload,
-                timeout=60  # 60 seconds for busy LLM scenarios
+        
+        # Προετοιμάζουμε το request για το Ollama
+        return {
+            **self._base_payload,
+            "prompt": prompt,
+            "stream": stream,
+            "options": self._options(self._context_options, max_tokens)
+        }
+    
+    def _check_circuit(self) -> None:
+        """Αποτυγχάνει αμέσως αν το circuit breaker είναι ανοιχτό."""
+        if time.monotonic() < self._open_until:
+            raise LLMUnavailableError("LLM temporarily unavailable after repeated failures")
+    
+    def _record_failure(self) -> None:
+        """Μετράει μια αποτυχία και ανοίγει το circuit αν ξεπεράσουμε το όριο."""
+        self._fail_count += 1
+        if self._fail_count >= CIRCUIT_BREAKER_THRESHOLD:
+            self._open_until = time.monotonic() + CIRCUIT_BREAKER_COOLDOWN
+            self._fail_count = 0
+            logger.error(
+                "[FAIL] LLM failed %d times in a row, rejecting requests for %.0fs",
+                CIRCUIT_BREAKER_THRESHOLD, CIRCUIT_BREAKER_COOLDOWN
             )
-            response.raise_for_status()
-            
-            # Παίρνουμε την απάντηση
-            result = response.json()
-            answer = result.get("response", "").strip()
-            
-            if not answer:
-                logger.error("Empty response from LLM")
-                return "I apologize, but I couldn't generate an answer. Please try again."
-            
-            logger.info(f"✅ Received answer from LLM ({len(answer)} chars)")
-            return answer
-            
-        except Exception as e:
-            logger.error(f"Error in generate_answer_with_context: {e}")
-            return "An error occurred while processing your question. Please try again."
+    
+    async def _generate(self, payload: Dict[str, Any], timeout: Optional[float] = None) -> str:
+        """
+        Στέλνει ένα payload στο /api/generate και επιστρέφει την απάντηση.
+        
+        Κοινό κομμάτι όλων των generate methods. Τα HTTP errors
+        περνάνε στον caller, που αποφασίζει τι μήνυμα θα δει ο χρήστης.
+        
+        Args:
+            payload: Το request για το Ollama
+            timeout: Read timeout για αυτό το request (default: LLM_TIMEOUTS.read)
+        """
+        self._check_circuit()
+        body = orjson.dumps(payload)
+        
+        # Νέο httpx.Timeout μόνο αν ζητήθηκε κάτι διαφορετικό από το default
+        request_timeout = (
+            httpx.USE_CLIENT_DEFAULT
+            if timeout is None or timeout == LLM_TIMEOUTS.read
+            else self._timeout(read=timeout)
+        )
+        
+        # Στέλνουμε το request, με retry και exponential backoff (+ jitter)
+        # για timeouts και 5xx, π.χ. όταν το Ollama είναι υπερφορτωμένο
+        for attempt in range(LLM_MAX_ATTEMPTS):
+            try:
+                async with self._semaphore:
+                    response = await self._client.post(
+                        "/api/generate",
+                        content=body,
+                        headers=_JSON_HEADERS,
+                        timeout=request_timeout
+                    )
+                response.raise_for_status()
+                break
+            except (httpx.TransportError, httpx.HTTPStatusError) as e:
+                retryable = (
+                    not isinstance(e, httpx.HTTPStatusError)
+                    or e.response.status_code >= 500
+                )
+                if not retryable:
+                    raise
+                if attempt == LLM_MAX_ATTEMPTS - 1:
+                    self._record_failure()
+                    raise
+                delay = min(2 ** attempt, 4) + random.random() * 0.25
+                logger.warning("[WARN] LLM request failed (%s), retrying in %.1fs", e, delay)
+                await asyncio.sleep(delay)
+        
+        self._fail_count = 0
+        
+        # Παίρνουμε την απάντηση
+        result = response.json()
+        answer = result.get("response", "").strip()
+        
+        # Αν η απάντηση είναι κενή, κάτι πήγε στραβά
+        if not answer:
+            logger.error("Empty response from LLM")
+            return "I apologize, but I couldn't generate an answer. Please try again."
+        
+        logger.info("[OK] Received answer from LLM (%d chars)", len(answer))
+        return answer
+    
+    async def generate_answer(
+        self,
+        question: str,
+        knowledge_base: str,
+        max_tokens: int = DEFAULT_MAX_TOKENS,
+        timeout: Optional[float] = None
+    ) -> str:
         """
         Στέλνει ερώτηση στο LLM και παίρνει απάντηση.
         
@@ -177,67 +383,198 @@ ANSWER:"""
         3. Στέλνουμε στο Ollama
         4. Επιστρέφουμε την απάντηση
         
+        DEPRECATED: Βάζει ολόκληρο το knowledge base σε κάθε prompt, οπότε
+        το prefill μεγαλώνει με το μέγεθος του knowledge base. Τα routes
+        χρησιμοποιούν πάντα το generate_answer_with_context με το RAG context.
+        Η μέθοδος (και το όρισμα knowledge_base) μένει μόνο για backward
+        compatibility.
+        
         Args:
             question: Η ερώτηση του χρήστη
             knowledge_base: Το περιεχόμενο που θα χρησιμοποιήσει για context
             max_tokens: Μέγιστο μήκος απάντησης
+            timeout: Read timeout σε δευτερόλεπτα (default: LLM_TIMEOUTS.read)
             
         Returns:
             Η απάντηση από το LLM
         """
+        warnings.warn(
+            "generate_answer sends the whole knowledge base on every call; "
+            "use generate_answer_with_context with the RAG context instead",
+            DeprecationWarning,
+            stacklevel=2
+        )
+        
         try:
-            # Δημιουργούμε το πλήρες prompt
-            system_prompt = self.create_system_prompt(knowledge_base)
-            full_prompt = f"{system_prompt}\n\nCustomer Question: {question}\n\nAssistant Answer:"
-            
-            # Προετοιμάζουμε το request για το Ollama
+            # Το system prompt (με το knowledge base) πάει στο πεδίο "system"
+            # και μόνο η ερώτηση στο "prompt". Έτσι κάθε request ξεκινάει με
+            # ακριβώς τα ίδια tokens και το Ollama ξαναχρησιμοποιεί το KV cache
+            # του prefix αντί να κάνει ξανά prefill όλο το knowledge base.
             payload = {
-                "model": self.model,
-                "prompt": full_prompt,
-                "temperature": self.temperature,
-                "stream": False,  # Θέλουμε την απάντηση μονομιάς, όχι streaming
-                "options": {
-                    "num_predict": max_tokens,
-                    "stop": ["Customer Question:", "\n\n"]  # Σταματάει αν δει αυτά
-                }
+                **self._base_payload,
+                "system": self.create_system_prompt(knowledge_base),
+                "prompt": "".join((_PROMPT_QUESTION_PREFIX, question, _PROMPT_ANSWER_SUFFIX)),
+                "options": self._options(self._kb_options, max_tokens)
             }
             
             # Log για debugging
-            logger.info(f"📤 Sending question to LLM: {question[:50]}...")
-            
-            # Στέλνουμε το request
-            response = requests.post(
-                f"{self.base_url}/api/generate",
-                json=payload,
-                timeout=60  # 60 seconds for busy LLM scenarios
-            )
-            response.raise_for_status()
-            
-            # Παίρνουμε την απάντηση
-            result = response.json()
-            answer = result.get("response", "").strip()
+            logger.info("[SEND] Sending question to LLM: %.50s...", question)
             
-            # Αν η απάντηση είναι κενή, κάτι πήγε στραβά
-            if not answer:
-                logger.error("Empty response from LLM")
-                return "I apologize, but I couldn't generate an answer. Please try again."
+            return await self._generate(payload, timeout)
             
-            logger.info(f"✅ Received answer from LLM ({len(answer)} chars)")
-            return answer
-            
-        except requests.exceptions.Timeout:
+        except httpx.TimeoutException:
             logger.error("LLM request timed out")
             return "The request took too long. Please try again with a simpler question."
             
-        except requests.exceptions.RequestException as e:
-            logger.error(f"Request error: {e}")
+        except (httpx.HTTPError, LLMUnavailableError) as e:
+            logger.error("Request error: %s", e)
             return "I'm having trouble connecting to the AI service. Please try again later."
             
         except Exception as e:
-            logger.error(f"Unexpected error: {e}")
+            logger.error("Unexpected error: %s", e)
             return "An unexpected error occurred. Please try again."
     
-    def test_connection(self) -> Dict[str, Any]:
+    async def generate_answer_with_context(
+        self, 
+        question: str, 
+        context: str,
+        max_tokens: int = DEFAULT_MAX_TOKENS,
+        timeout: Optional[float] = None
+    ) -> str:
+        """
+        Στέλνει ερώτηση στο LLM με συγκεκριμένο context.
+        
+        Αυτή είναι η νέα μέθοδος που χρησιμοποιεί μόνο το σχετικό
+        context από το RAG, όχι όλο το knowledge base.
+        
+        Args:
+            question: Η ερώτηση του χρήστη
+            context: Το σχετικό context από το RAG search
+            max_tokens: Μέγιστο μήκος απάντησης
+            timeout: Read timeout σε δευτερόλεπτα (default: LLM_TIMEOUTS.read)
+            
+        Returns:
+            Η απάντηση από το LLM
+        """
+        try:
+            payload = self._context_payload(question, context, max_tokens, stream=False)
+            
+            # Log για debugging
+            logger.info("[SEND] Sending to LLM with context length: %d chars", len(context))
+            
+            return await self._generate(payload, timeout)
+            
+        except Exception as e:
+            logger.error("Error in generate_answer_with_context: %s", e)
+            return "An error occurred while processing your question. Please try again."
+    
+    async def stream_answer_with_context(
+        self,
+        question: str,
+        context: str,
+        max_tokens: int = DEFAULT_MAX_TOKENS
+    ) -> AsyncIterator[str]:
+        """
+        Σαν το generate_answer_with_context, αλλά επιστρέφει την
+        απάντηση σε κομμάτια, όπως τα παράγει το Ollama (stream=True).
+        
+        Ο client βλέπει τις πρώτες λέξεις σε χιλιοστά του δευτερολέπτου,
+        αντί να περιμένει να ολοκληρωθεί όλη η απάντηση.
+        
+        Σε αντίθεση με το generate_answer_with_context, τα errors δεν
+        γίνονται κείμενο απάντησης: περνάνε στον caller, ώστε να μπορεί να
+        στείλει error event (μέρος της απάντησης μπορεί να έχει ήδη σταλεί).
+        Timeouts και 5xx μετράνε στο circuit breaker όπως στο _generate.
+        Δεν γίνεται retry, γιατί ένα stream δεν μπορεί να ξαναρχίσει.
+        
+        Args:
+            question: Η ερώτηση του χρήστη
+            context: Το σχετικό context από το RAG search
+            max_tokens: Μέγιστο μήκος απάντησης
+            
+        Yields:
+            Κομμάτια κειμένου της απάντησης
+            
+        Raises:
+            LLMUnavailableError: Αν το circuit breaker είναι ανοιχτό
+            httpx.HTTPError: Αν αποτύχει το request προς το Ollama
+        """
+        self._check_circuit()
+        payload = self._context_payload(question, context, max_tokens, stream=True)
+        
+        logger.info("[SEND] Streaming from LLM with context length: %d chars", len(context))
+        
+        try:
+            async with self._semaphore:
+                async with self._client.stream(
+                    "POST", "/api/generate", content=orjson.dumps(payload), headers=_JSON_HEADERS
+                ) as response:
+                    response.raise_for_status()
+                    
+                    # Το Ollama στέλνει ένα JSON object ανά γραμμή
+                    async for line in response.aiter_lines():
+                        if not line:
+                            continue
+                        chunk = json.loads(line)
+                        if chunk.get("response"):
+                            yield chunk["response"]
+                        if chunk.get("done"):
+                            break
+        except (httpx.TransportError, httpx.HTTPStatusError) as e:
+            if not isinstance(e, httpx.HTTPStatusError) or e.response.status_code >= 500:
+                self._record_failure()
+            raise
+        
+        self._fail_count = 0
+    
+    async def generate_answers(
+        self,
+        questions: List[str],
+        contexts: List[str],
+        max_tokens: int = DEFAULT_MAX_TOKENS
+    ) -> List[str]:
+        """
+        Στέλνει πολλές ερωτήσεις στο LLM ταυτόχρονα.
+        
+        Τα requests τρέχουν παράλληλα με asyncio.gather (έως
+        OLLAMA_NUM_PARALLEL κάθε στιγμή), οπότε το Ollama μπορεί
+        να τα εξυπηρετήσει μαζί αντί για ένα-ένα.
+        
+        Args:
+            questions: Οι ερωτήσεις των χρηστών
+            contexts: Το RAG context για κάθε ερώτηση (ίδια σειρά)
+            max_tokens: Μέγιστο μήκος κάθε απάντησης
+            
+        Returns:
+            Οι απαντήσεις, στην ίδια σειρά με τις ερωτήσεις
+        """
+        if len(questions) != len(contexts):
+            raise ValueError("questions and contexts must have the same length")
+        
+        return await asyncio.gather(*(
+            self.generate_answer_with_context(question, context, max_tokens)
+            for question, context in zip(questions, contexts)
+        ))
+    
+    async def _available_models(self) -> List[str]:
+        """
+        Τα ονόματα των models του Ollama, με cache TAGS_CACHE_TTL.
+        
+        Σε μεγάλες εγκαταστάσεις το /api/tags είναι αρκετά KB JSON,
+        οπότε δεν το ζητάμε σε κάθε health check.
+        """
+        now = time.monotonic()
+        if self._tags_cache is not None and now - self._tags_cache[0] < TAGS_CACHE_TTL:
+            return self._tags_cache[1]
+        
+        response = await self._client.get("/api/tags")
+        response.raise_for_status()
+        models = [m["name"] for m in response.json().get("models", [])]
+        
+        self._tags_cache = (now, models)
+        return models
+    
+    async def test_connection(self) -> Dict[str, Any]:
         """
         Τεστάρει τη σύνδεση και επιστρέφει πληροφορίες.
         
@@ -245,25 +582,23 @@ ANSWER:"""
         """
         try:
             # Έλεγχος models
-            response = requests.get(f"{self.base_url}/api/tags")
-            models = response.json()
+            available_models = await self._available_models()
             
-            # Απλό test generation
-            test_response = requests.post(
-                f"{self.base_url}/api/generate",
-                json={
-                    "model": self.model,
-                    "prompt": "Say 'Hello, I am working!'",
-                    "stream": False
-                }
-            )
+            # Απλό test generation, μέσω του _generate (semaphore, circuit
+            # breaker) και με το keep_alive του _base_payload, ώστε ένα health
+            # check να μην επαναφέρει το unload timer του Ollama στο default
+            test_response = await self._generate({
+                **self._base_payload,
+                "prompt": "Say 'Hello, I am working!'",
+                "options": {"num_predict": 8}
+            })
             
             return {
                 "status": "connected",
                 "ollama_url": self.base_url,
                 "model": self.model,
-                "available_models": [m["name"] for m in models.get("models", [])],
-                "test_response": test_response.json().get("response", "No response")
+                "available_models": available_models,
+                "test_response": test_response
             }
         except Exception as e:
             return {
@@ -273,6 +608,22 @@ ANSWER:"""
             }
 
 
-# Δημιουργούμε ένα global instance του service
-# Αυτό θα χρησιμοποιηθεί από τα routes
-llm_service = LLMService()
\ No newline at end of file
+# Global instance του service, δημιουργείται την πρώτη φορά που χρειάζεται
+# ώστε το import του module να μην κάνει τίποτα ακριβό
+_llm_service: Optional[LLMService] = None
+
+
+def get_llm_service() -> LLMService:
+    """Lazy initialization του LLM service."""
+    global _llm_service
+    if _llm_service is None:
+        _llm_service = LLMService()
+    return _llm_service
+
+
+async def close_llm_service() -> None:
+    """Κλείνει το global LLM service, αν έχει δημιουργηθεί."""
+    global _llm_service
+    if _llm_service is not None:
+        await _llm_service.aclose()
+        _llm_service = None
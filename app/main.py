@@ -10,13 +10,20 @@ Main FastAPI application entry point.
 Η πραγματική λογική βρίσκεται στα άλλα modules.
 """
 
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
+import asyncio
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import ORJSONResponse
 import logging
+import os
 
 from .database import engine
 from .models import Base
 from .routes import router
+from .llm_service import get_llm_service, close_llm_service
+from .qa_log import start_qa_writer, stop_qa_writer
 
 # Ρύθμιση logging
 logging.basicConfig(
@@ -25,8 +32,75 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
-# Δημιουργούμε τους πίνακες στη βάση (αν δεν υπάρχουν ήδη)
-Base.metadata.create_all(bind=engine)
+# Origins που επιτρέπεται να καλούν το API από browser, χωρισμένα με κόμμα
+# π.χ. CORS_ORIGINS="https://faq.example.com,http://localhost:3000"
+CORS_ORIGINS = [origin.strip() for origin in os.getenv("CORS_ORIGINS", "").split(",") if origin.strip()]
+
+# Αν θα δημιουργούνται αυτόματα οι πίνακες στο startup. Αλλιώς
+# τρέξε μία φορά: python -m app.cli init-db
+AUTO_CREATE_TABLES = os.getenv("AUTO_CREATE_TABLES", "1") == "1"
+
+
+async def prepare_llm() -> None:
+    """
+    Ελέγχει τη σύνδεση με το Ollama και φορτώνει το model,
+    ώστε η πρώτη ερώτηση να μην περιμένει το φόρτωμα.
+    """
+    llm = get_llm_service()
+    if await llm.verify_connection_with_retry(retries=5, backoff=2):
+        await llm.warm_up()
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    Τρέχει όταν ξεκινάει (πριν το yield) και όταν σταματάει
+    (μετά το yield) η εφαρμογή.
+    
+    Μπορούμε να προσθέσουμε εδώ:
+    - Έλεγχο σύνδεσης με τη βάση
+    - Προφόρτωση του LLM model
+    - Άλλες αρχικοποιήσεις και cleanup tasks
+    """
+    logger.info("[START] FAQ Service is starting up...")
+    
+    # Δημιουργούμε τους πίνακες στη βάση (αν δεν υπάρχουν ήδη).
+    # Γίνεται εδώ και όχι στο import, ώστε το import να μην αγγίζει τη βάση.
+    if AUTO_CREATE_TABLES:
+        Base.metadata.create_all(bind=engine)
+        logger.info("[DB] Database tables created/verified")
+    
+    # Background writer για τα Q&A logs, ώστε τα requests να μην περιμένουν το commit
+    start_qa_writer()
+    
+    # Ελέγχουμε αν το Ollama είναι διαθέσιμο και φορτώνουμε το model, στο
+    # background ώστε το startup να μην περιμένει (ή να αποτυγχάνει) αν αργεί
+    ollama_check = asyncio.create_task(prepare_llm())
+    
+    # Initialize RAG service during startup
+    from .routes import get_rag_service
+    try:
+        logger.info("[RAG] Initializing RAG service...")
+        get_rag_service()
+        logger.info("[OK] RAG service initialized successfully!")
+    except Exception as e:
+        logger.error("[FAIL] Failed to initialize RAG service: %s", e)
+    
+    logger.info("[OK] Ready to serve requests!")
+    
+    yield
+    
+    logger.info("[STOP] FAQ Service is shutting down...")
+    
+    # Σταματάμε τον έλεγχο σύνδεσης αν τρέχει ακόμα
+    ollama_check.cancel()
+    
+    # Γράφουμε στη βάση όσα Q&A περιμένουν ακόμα στην ουρά
+    await stop_qa_writer()
+    
+    # Κλείνουμε τις keep-alive connections προς το Ollama
+    await close_llm_service()
+
 
 # Δημιουργούμε την κύρια FastAPI εφαρμογή
 app = FastAPI(
@@ -35,17 +109,25 @@ app = FastAPI(
     version="1.0.0",
     docs_url="/docs",      # Swagger UI
     redoc_url="/redoc",    # ReDoc - εναλλακτικό documentation
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse,  # Γρηγορότερο JSON serialization
 )
 
 # Προσθέτουμε CORS middleware (επιτρέπει requests από browser)
 app.add_middleware(
     CORSMiddleware,
-    allow_origins=["*"],  # Στο production, βάλε συγκεκριμένα origins
+    allow_origins=CORS_ORIGINS,
     allow_credentials=True,
-    allow_methods=["*"],
+    allow_methods=["GET", "POST"],
     allow_headers=["*"],
+    max_age=600,  # Ο browser κρατάει το preflight 10 λεπτά
 )
 
+# Συμπίεση των responses (οι απαντήσεις του LLM είναι συνήθως μερικά KB).
+# Το /ask/stream στέλνει Content-Encoding: identity, ώστε το middleware
+# να μην κάνει buffer/συμπίεση στο SSE stream
+app.add_middleware(GZipMiddleware, minimum_size=512)
+
 # Συνδέουμε τα routes από το routes.py
 app.include_router(router)
 
@@ -63,10 +145,13 @@ async def root():
         "documentation": "/docs",
         "api_endpoints": {
             "POST /api/v1/ask": "Ask a question",
+            "POST /api/v1/ask/stream": "Ask a question, stream the answer (SSE)",
+            "POST /api/v1/ask_batch": "Ask many questions at once",
             "GET /api/v1/history": "Get question history",
             "GET /api/v1/stats": "Get system statistics"
         },
-        "health_check": "/health"
+        "health_check": "/health",
+        "deep_health_check": "/health/deep"
     }
 
 
@@ -79,6 +164,9 @@ async def health_check():
     - Docker health checks
     - Load balancer checks
     - Monitoring systems
+    
+    Δεν καλεί το Ollama, οπότε είναι φθηνό για readiness probes.
+    Για πλήρη έλεγχο δες το /health/deep.
     """
     return {
         "status": "healthy",
@@ -87,37 +175,17 @@ async def health_check():
     }
 
 
-@app.on_event("startup")
-async def startup_event():
-    """
-    Τρέχει όταν ξεκινάει η εφαρμογή.
-    
-    Μπορούμε να προσθέσουμε εδώ:
-    - Έλεγχο σύνδεσης με τη βάση
-    - Προφόρτωση του LLM model
-    - Άλλες αρχικοποιήσεις
-    """
-    print("🚀 FAQ Service is starting up...")
-    print("📚 Database tables created/verified")
-    
-    # Initialize RAG service during startup
-    from .routes import get_rag_service
-    try:
-        print("🔄 Initializing RAG service...")
-        get_rag_service()
-        print("✅ RAG service initialized successfully!")
-    except Exception as e:
-        print(f"❌ Failed to initialize RAG service: {e}")
-        logger.error(f"RAG initialization failed: {e}")
-    
-    print("✅ Ready to serve requests!")
-
-
-@app.on_event("shutdown")
-async def shutdown_event():
+@app.get("/health/deep")
+async def deep_health_check():
     """
-    Τρέχει όταν σταματάει η εφαρμογή.
+    Πλήρης health check, μαζί με τη σύνδεση στο Ollama.
     
-    Καλό μέρος για cleanup tasks.
+    Πιο αργό από το /health, γιατί κάνει και ένα test generation.
     """
-    print("👋 FAQ Service is shutting down...")
\ No newline at end of file
+    llm_status = await get_llm_service().test_connection()
+    return {
+        "status": "healthy" if llm_status["status"] == "connected" else "degraded",
+        "service": "FAQ Service",
+        "version": "1.0.0",
+        "llm": llm_status
+    }
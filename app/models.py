@@ -3,7 +3,11 @@ Database models για το FAQ service.
 Αυτά είναι τα "καλούπια" που ορίζουν πώς θα αποθηκεύονται τα δεδομένα.
 """
 
-from sqlalchemy import Column, Integer, String, DateTime, Text
+from datetime import datetime
+from typing import Optional
+
+from sqlalchemy import String, DateTime, Text
+from sqlalchemy.orm import Mapped, mapped_column
 from sqlalchemy.sql import func
 from app.database import Base
 
@@ -15,19 +19,23 @@ class Question(Base):
     __tablename__ = "questions"
     
     # Primary key - μοναδικό ID για κάθε ερώτηση
-    id = Column(Integer, primary_key=True, index=True)
+    # (το primary key έχει ήδη index, δεν χρειάζεται δεύτερο)
+    id: Mapped[int] = mapped_column(primary_key=True)
     
     # Η ερώτηση του χρήστη
-    question_text = Column(Text, nullable=False)
+    question_text: Mapped[str] = mapped_column(Text, nullable=False)
     
     # Η απάντηση από το LLM
-    answer_text = Column(Text, nullable=False)
+    answer_text: Mapped[str] = mapped_column(Text, nullable=False)
     
     # Πότε έγινε η ερώτηση (αυτόματα συμπληρώνεται)
-    timestamp = Column(DateTime(timezone=True), server_default=func.now())
+    # Με index, γιατί το /history ταξινομεί βάσει timestamp
+    timestamp: Mapped[Optional[datetime]] = mapped_column(
+        DateTime(timezone=True), server_default=func.now(), index=True
+    )
 
-    source = Column(String(50), nullable=True, default="api")
+    source: Mapped[Optional[str]] = mapped_column(String(50), nullable=True, default="api")
     
     def __repr__(self):
         """Για debugging - δείχνει όμορφα το object"""
-        return f"<Question(id={self.id}, question='{self.question_text[:30]}...')>"
\ No newline at end of file
+        return f"<Question(id={self.id}, question='{self.question_text[:30]}...')>"
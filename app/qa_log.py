@@ -0,0 +1,151 @@
+"""
+Background logging των Q&A στη βάση.
+
+Τα routes δεν περιμένουν το commit της βάσης για να απαντήσουν:
+βάζουν κάθε Q&A σε ένα asyncio.Queue και ένα background task
+τα γράφει σε batches (ένα INSERT + ένα commit ανά batch).
+"""
+
+import asyncio
+import logging
+from typing import Dict, List, Optional
+
+from sqlalchemy import insert
+
+from .database import SessionLocal
+from .models import Question
+
+logger = logging.getLogger(__name__)
+
+# Configuration
+QA_LOG_QUEUE_SIZE = 1024     # Μέγιστος αριθμός Q&A που περιμένουν εγγραφή
+QA_LOG_BATCH_SIZE = 50       # Μέγιστος αριθμός Q&A ανά INSERT
+QA_LOG_FLUSH_INTERVAL = 0.1  # Πόσο περιμένουμε (sec) να μαζευτούν κι άλλα πριν γράψουμε
+
+_queue: Optional[asyncio.Queue] = None
+_writer_task: Optional[asyncio.Task] = None
+_loop: Optional[asyncio.AbstractEventLoop] = None
+
+
+def _write_rows(rows: List[Dict]) -> None:
+    """Γράφει τα rows στη βάση με ένα multi-row INSERT και ένα commit."""
+    db = SessionLocal()
+    try:
+        db.execute(insert(Question), rows)
+        db.commit()
+        logger.info("[DB] Saved %d Q&A pairs to database", len(rows))
+    except Exception as e:
+        db.rollback()
+        logger.error("Failed to save %d Q&A pairs: %s", len(rows), e)
+    finally:
+        db.close()
+
+
+def _enqueue(row: Dict) -> None:
+    """
+    Βάζει ένα row στην ουρά (τρέχει πάντα στο thread του event loop).
+
+    Αν η ουρά είναι γεμάτη, το row γράφεται σε thread ώστε να μη χαθεί
+    και να μη μπλοκάρει το event loop.
+    """
+    if _queue is None:
+        # Ο writer σταμάτησε όσο περίμενε το callback
+        _write_rows([row])
+        return
+    try:
+        _queue.put_nowait(row)
+    except asyncio.QueueFull:
+        logger.warning("[WARN] Q&A log queue is full, writing in a thread")
+        asyncio.get_running_loop().run_in_executor(None, _write_rows, [row])
+
+
+def log_qa(question: str, answer: str, source: Optional[str] = "api") -> None:
+    """
+    Προγραμματίζει την αποθήκευση ενός Q&A στη βάση.
+
+    Επιστρέφει αμέσως και μπορεί να κληθεί και από άλλο thread (π.χ. όταν
+    τρέχει ως sync BackgroundTask στο threadpool): το asyncio.Queue δεν είναι
+    thread-safe, οπότε εκτός loop το row περνάει με call_soon_threadsafe.
+    Αν ο background writer δεν τρέχει, γράφουμε απευθείας.
+    """
+    row = {"question_text": question, "answer_text": answer, "source": source}
+
+    loop = _loop
+    if _queue is None or loop is None or loop.is_closed():
+        _write_rows([row])
+        return
+
+    try:
+        running_loop = asyncio.get_running_loop()
+    except RuntimeError:
+        running_loop = None
+
+    if running_loop is loop:
+        _enqueue(row)
+    else:
+        try:
+            loop.call_soon_threadsafe(_enqueue, row)
+        except RuntimeError:
+            # Το loop έκλεισε ανάμεσα στον έλεγχο και το callback
+            _write_rows([row])
+
+
+async def _qa_writer() -> None:
+    """Αδειάζει την ουρά σε batches μέχρι QA_LOG_BATCH_SIZE."""
+    loop = asyncio.get_running_loop()
+
+    while True:
+        rows = []
+        try:
+            # Περιμένουμε το πρώτο Q&A και μετά μαζεύουμε όσα έρθουν
+            # μέσα στο QA_LOG_FLUSH_INTERVAL
+            rows.append(await _queue.get())
+            deadline = loop.time() + QA_LOG_FLUSH_INTERVAL
+
+            while len(rows) < QA_LOG_BATCH_SIZE:
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    break
+                try:
+                    rows.append(await asyncio.wait_for(_queue.get(), remaining))
+                except asyncio.TimeoutError:
+                    break
+        except asyncio.CancelledError:
+            # Shutdown: δεν χάνουμε όσα έχουμε ήδη βγάλει από την ουρά
+            if rows:
+                _write_rows(rows)
+            raise
+
+        # Το commit είναι blocking I/O, οπότε τρέχει σε thread
+        await asyncio.to_thread(_write_rows, rows)
+
+
+def start_qa_writer() -> None:
+    """Ξεκινάει τον background writer (καλείται στο startup της εφαρμογής)."""
+    global _queue, _writer_task, _loop
+    _loop = asyncio.get_running_loop()
+    _queue = asyncio.Queue(maxsize=QA_LOG_QUEUE_SIZE)
+    _writer_task = asyncio.create_task(_qa_writer())
+
+
+async def stop_qa_writer() -> None:
+    """Σταματάει τον writer και γράφει ό,τι έχει μείνει στην ουρά."""
+    global _queue, _writer_task, _loop
+    if _writer_task is None:
+        return
+
+    _writer_task.cancel()
+    try:
+        await _writer_task
+    except asyncio.CancelledError:
+        pass
+
+    rows = []
+    while not _queue.empty():
+        rows.append(_queue.get_nowait())
+    if rows:
+        _write_rows(rows)
+
+    _queue = None
+    _writer_task = None
+    _loop = None
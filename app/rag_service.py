@@ -3,42 +3,59 @@ Hybrid RAG Service - Συνδυάζει semantic και keyword search.
 
 Αυτό είναι το κεντρικό service που ενορχηστρώνει όλα τα components:
 - Parser για να διαβάσει το knowledge base
-- Embeddings για semantic         # Βήμα 4: Ταξινόμηση και επιστροφή αποτελεσμάτων
-        final_results = list(results_map.values())
-        
-        # Ταξινόμηση κατά combined score
-        final_results.sort(key=lambda x: x.combined_score, reverse=True)
-        
-        # Κρατάμε μόνο τα top n_results
-        final_results = final_results[:n_results]ng
-- ChromaDB για semantic search
+- Embeddings για semantic search (in-memory index)
 - TF-IDF για keyword search
 - Scoring και ranking για τα καλύτερα αποτελέσματα
 """
 
 from typing import List, Dict, Tuple, Optional
+from collections import OrderedDict
+import asyncio
 import logging
 from dataclasses import dataclass
+import hashlib
 import os
+import pickle
+import threading
+import numpy as np
 
 from .kb_parser import KnowledgeBaseParser, QAPair
-from .embeddings_service import EmbeddingsService
-from .chromadb_service import ChromaDBService, SearchResult
+from .embeddings_service import EmbeddingsService, EmbeddingStore, select_top_k
 from .tfidf_service import TFIDFService
 
 logger = logging.getLogger(__name__)
 
+# Configuration
+# Το semantic search γίνεται in-process πάνω σε ένα EmbeddingStore.
+# Το ChromaDB χρειάζεται μόνο αν θέλουμε persistent αντίγραφο των
+# embeddings (π.χ. για τα debug scripts που διαβάζουν τη collection).
+MIRROR_TO_CHROMADB = os.getenv("RAG_MIRROR_CHROMADB", "0") == "1"
+SEARCH_CACHE_SIZE = 1024  # Πόσα αποτελέσματα search κρατάμε στη μνήμη
+SEMANTIC_CACHE_SIZE = 2048  # Πόσα query embeddings κρατάει το semantic cache
+SEMANTIC_CACHE_THRESHOLD = 0.92  # Ελάχιστο cosine για να θεωρηθεί ίδια ερώτηση
+# Ακρίβεια του in-memory semantic index: "float32", "float16" ή "int8".
+# Οι μικρότερες ακρίβειες μειώνουν τη μνήμη 2x/4x με αμελητέα αλλαγή στα scores.
+SEMANTIC_INDEX_PRECISION = os.getenv("RAG_INDEX_PRECISION", "float32")
+CONTEXT_N_RESULTS = 6  # Πόσα αποτελέσματα του search μπαίνουν στο context του LLM
+CONTEXT_SEPARATOR = "\n\n---\n\n"  # Ανάμεσα στα Q&A pairs του context
+KB_CACHE_DIR = "cache"  # Embeddings και TF-IDF index ανά έκδοση του knowledge base
+KB_CACHE_VERSION = 8  # Αυξάνεται όταν αλλάζει η μορφή των cached αρχείων
 
-@dataclass
+
+@dataclass(frozen=True, slots=True)
 class HybridSearchResult:
     """
     Το τελικό αποτέλεσμα του hybrid search.
     
     Περιέχει πληροφορίες από όλες τις μεθόδους αναζήτησης
     και ένα combined score που δείχνει τη συνολική σχετικότητα.
+    
+    Φτιάχνεται ένα ανά αποτέλεσμα σε κάθε search, οπότε έχει slots
+    (χωρίς __dict__). Είναι immutable γιατί τα ίδια objects μοιράζονται
+    από τα search caches.
     """
     qa_pair: QAPair
-    semantic_score: float      # Score από ChromaDB (0-1)
+    semantic_score: float      # Score από το semantic search (0-1)
     keyword_score: float       # Score από TF-IDF (0-1)
     combined_score: float      # Weighted combination (0-1)
     match_type: str           # "semantic", "keyword", or "both"
@@ -60,7 +77,8 @@ class HybridRAGService:
         self,
         knowledge_base_path: str,
         semantic_weight: float = 0.6,
-        keyword_weight: float = 0.4
+        keyword_weight: float = 0.4,
+        force_rebuild: bool = False
     ):
         """
         Initialize Hybrid RAG Service.
@@ -69,6 +87,8 @@ class HybridRAGService:
             knowledge_base_path: Path στο knowledge base file
             semantic_weight: Πόσο βάρος δίνουμε στο semantic search (0-1)
             keyword_weight: Πόσο βάρος δίνουμε στο keyword search (0-1)
+            force_rebuild: Αν True, αγνοεί το cache στο KB_CACHE_DIR και
+                ξαναφτιάχνει embeddings και TF-IDF index
         """
         self.kb_path = knowledge_base_path
         self.semantic_weight = semantic_weight
@@ -81,24 +101,63 @@ class HybridRAGService:
         # Initialize όλα τα services
         self.parser = KnowledgeBaseParser(knowledge_base_path)
         self.embeddings_service = EmbeddingsService()
-        self.chromadb_service = ChromaDBService()
         self.tfidf_service = TFIDFService()
         
+        # LRU cache αποτελεσμάτων: (normalized query, n_results) -> results
+        self._search_cache: "OrderedDict[Tuple[str, int], List[HybridSearchResult]]" = OrderedDict()
+        self._search_cache_lock = threading.Lock()
+        
+        # Semantic cache: ring buffer με τα embeddings προηγούμενων queries
+        # και τα αποτελέσματά τους, για ερωτήσεις που διατυπώνονται αλλιώς
+        self._qcache_matrix: Optional[np.ndarray] = None
+        self._qcache_results: List[Tuple[int, List[HybridSearchResult]]] = []
+        self._qcache_next = 0
+        
+        # Το chromadb import είναι βαρύ, οπότε γίνεται μόνο αν το χρειαστούμε
+        self.chromadb_service = None
+        if MIRROR_TO_CHROMADB:
+            from .chromadb_service import ChromaDBService
+            self.chromadb_service = ChromaDBService()
+        
         # Φόρτωση και indexing του knowledge base
-        self._initialize_knowledge_base()
+        self._initialize_knowledge_base(force_rebuild=force_rebuild)
     
-    def _initialize_knowledge_base(self):
+    def _kb_cache_key(self) -> str:
+        """
+        Content hash του knowledge base μαζί με το embedding model.
+        
+        Αλλαγή στο αρχείο ή στο model δίνει νέο key, οπότε ένα παλιό
+        cache δεν μπορεί ποτέ να χρησιμοποιηθεί κατά λάθος.
+        """
+        digest = hashlib.blake2b(digest_size=16)
+        with open(self.kb_path, 'rb') as f:
+            for block in iter(lambda: f.read(1 << 20), b''):
+                digest.update(block)
+        digest.update(f"\0{self.embeddings_service.model}\0{KB_CACHE_VERSION}".encode("utf-8"))
+        return digest.hexdigest()
+    
+    def _initialize_knowledge_base(self, force_rebuild: bool = False):
         """
         Φορτώνει το knowledge base και δημιουργεί όλα τα indexes.
         
         Αυτή η διαδικασία τρέχει μία φορά κατά την εκκίνηση:
         1. Parse Q&A pairs
         2. Create embeddings  
-        3. Store in ChromaDB
+        3. Build the in-memory semantic index (και ChromaDB αν είναι ενεργό)
         4. Create TF-IDF index
+        
+        Τα embeddings και το TF-IDF index αποθηκεύονται στο KB_CACHE_DIR
+        με key το content hash του αρχείου. Αν το knowledge base δεν έχει
+        αλλάξει, το restart τα φορτώνει από εκεί αντί να τα ξαναφτιάξει.
+        
+        Args:
+            force_rebuild: Αν True, αγνοεί το cache
         """
         logger.info("🚀 Initializing Hybrid RAG Service...")
         
+        # Τα cached αποτελέσματα αφορούν το προηγούμενο knowledge base
+        self.clear_search_cache()
+        
         # Βήμα 1: Parse knowledge base
         logger.info("📖 Parsing knowledge base...")
         self.qa_pairs = self.parser.parse()
@@ -108,27 +167,123 @@ class HybridRAGService:
         texts = [qa.to_text() for qa in self.qa_pairs]
         qa_dicts = [qa.to_dict() for qa in self.qa_pairs]
         
-        # Βήμα 3: Create embeddings
-        logger.info("🧮 Creating embeddings...")
-        embeddings = self.embeddings_service.create_embeddings_batch(
-            texts, 
-            show_progress=True
-        )
+        cache_key = self._kb_cache_key()
+        embeddings_path = os.path.join(KB_CACHE_DIR, f"{cache_key}.npy")
+        tfidf_path = os.path.join(KB_CACHE_DIR, f"{cache_key}.tfidf.pkl")
+        
+        cached = False
+        if not force_rebuild and os.path.exists(embeddings_path) and os.path.exists(tfidf_path):
+            try:
+                embeddings = np.load(embeddings_path, mmap_mode='r')
+                with open(tfidf_path, 'rb') as f:
+                    tfidf_service = pickle.load(f)
+                cached = len(embeddings) == len(self.qa_pairs)
+            except Exception as e:
+                # Ένα pickle από παλιότερη εκδοχή των classes μπορεί να δώσει
+                # AttributeError, ModuleNotFoundError, EOFError κ.λπ. - σε κάθε
+                # περίπτωση απλά ξαναχτίζουμε το cache
+                logger.warning(f"⚠️  Could not load knowledge base cache, rebuilding: {e!r}")
+        
+        if cached:
+            logger.info(f"⚡ Loaded embeddings and TF-IDF index from cache ({cache_key[:12]})")
+            self.tfidf_service = tfidf_service
+        else:
+            # Βήμα 3: Create embeddings
+            logger.info("🧮 Creating embeddings...")
+            embeddings = self.embeddings_service.create_embeddings_batch(
+                texts, 
+                show_progress=False
+            )
         
-        # Βήμα 4: Store in ChromaDB
-        logger.info("💾 Storing in ChromaDB...")
-        self.chromadb_service.add_embeddings(
-            embeddings, 
-            qa_dicts,
-            force_reset=True  # Καθαρίζουμε παλιά δεδομένα
+        # Βήμα 4: In-memory semantic index - ένας κανονικοποιημένος
+        # πίνακας (N, D) στην ίδια σειρά με το self.qa_pairs, οπότε το
+        # search επιστρέφει κατευθείαν τη θέση (row) κάθε Q&A.
+        # Το create_embeddings_batch (και άρα το cache) δίνει ήδη unit
+        # vectors, οπότε με float32 το mmap'ed cache χρησιμοποιείται χωρίς αντίγραφο
+        self.embedding_store = EmbeddingStore(
+            embeddings,
+            precision=SEMANTIC_INDEX_PRECISION,
+            normalized=True
+        )
+        logger.info(
+            f"⚡ Semantic index ready ({len(self.embedding_store)} embeddings, "
+            f"{SEMANTIC_INDEX_PRECISION}, {self.embedding_store.matrix.nbytes / 1024:.0f} KB)"
         )
         
-        # Βήμα 5: Create TF-IDF index
-        logger.info("📊 Creating TF-IDF index...")
-        self.tfidf_service.fit(texts, qa_dicts)
+        if self.chromadb_service is not None:
+            logger.info("💾 Storing in ChromaDB...")
+            self.chromadb_service.add_embeddings(
+                embeddings, 
+                qa_dicts,
+                force_reset=True  # Καθαρίζουμε παλιά δεδομένα
+            )
+        
+        if not cached:
+            # Βήμα 5: Create TF-IDF index
+            logger.info("📊 Creating TF-IDF index...")
+            self.tfidf_service.fit(texts, qa_dicts)
+            
+            self._save_kb_cache(embeddings_path, tfidf_path, embeddings)
         
         logger.info("✅ Hybrid RAG Service initialized successfully!")
     
+    def _save_kb_cache(self, embeddings_path: str, tfidf_path: str, embeddings: np.ndarray):
+        """
+        Γράφει embeddings και TF-IDF index στο KB_CACHE_DIR.
+        
+        Γράφουμε σε προσωρινά αρχεία και μετά os.replace, ώστε ένα
+        restart στη μέση να μην αφήσει μισογραμμένο cache.
+        """
+        try:
+            os.makedirs(KB_CACHE_DIR, exist_ok=True)
+            
+            with open(f"{embeddings_path}.tmp", 'wb') as f:
+                np.save(f, np.asarray(embeddings, dtype=np.float32))
+            with open(f"{tfidf_path}.tmp", 'wb') as f:
+                pickle.dump(self.tfidf_service, f, protocol=pickle.HIGHEST_PROTOCOL)
+            
+            os.replace(f"{embeddings_path}.tmp", embeddings_path)
+            os.replace(f"{tfidf_path}.tmp", tfidf_path)
+            logger.info(f"💾 Saved knowledge base cache to {KB_CACHE_DIR}/")
+        except OSError as e:
+            logger.warning(f"⚠️  Could not save knowledge base cache: {e}")
+    
+    def semantic_search(
+        self,
+        query_embedding,
+        n_results: int = 5
+    ) -> List[Tuple[int, float]]:
+        """
+        Semantic search στο in-memory index.
+        
+        Ένα matrix-vector product πάνω σε όλα τα embeddings, χωρίς
+        κανένα round-trip σε βάση. Το cosine similarity μετατρέπεται
+        στην κλίμακα 0-1 που χρησιμοποιούσε και το ChromaDB:
+        similarity = (1 + cos) / 2.
+        
+        Args:
+            query_embedding: Το embedding της ερώτησης
+            n_results: Πόσα αποτελέσματα να επιστρέψει
+            
+        Returns:
+            List of tuples (qa_id, similarity), ταξινομημένα κατά similarity
+        """
+        return [
+            (self.qa_pairs[row].id, similarity)
+            for row, similarity in self._semantic_search_rows(query_embedding, n_results)
+        ]
+    
+    def _semantic_search_rows(
+        self,
+        query_embedding,
+        n_results: int
+    ) -> List[Tuple[int, float]]:
+        """Όπως το semantic_search, αλλά με rows του self.qa_pairs αντί για qa_ids."""
+        return [
+            (row, (1.0 + cosine) / 2.0)
+            for row, cosine in self.embedding_store.search(query_embedding, n_results)
+        ]
+    
     def search(
         self,
         query: str,
@@ -138,7 +293,7 @@ class HybridRAGService:
         Εκτελεί hybrid search για μια ερώτηση.
         
         Η διαδικασία:
-        1. Semantic search μέσω ChromaDB
+        1. Semantic search στο in-memory index
         2. Keyword search μέσω TF-IDF
         3. Συνδυασμός και scoring
         4. Ranking και επιστροφή των καλύτερων
@@ -150,92 +305,262 @@ class HybridRAGService:
         Returns:
             List of HybridSearchResult, ταξινομημένα κατά combined score
         """
-        logger.info(f"🔍 Hybrid search for: '{query}'")
+        key = self._search_cache_key(query, n_results)
+        cached = self._search_cache_get(key, query)
+        if cached is not None:
+            return cached
         
-        # Βήμα 1: Semantic Search
         query_embedding = self.embeddings_service.create_embedding(query)
-        semantic_results = self.chromadb_service.search(
-            query_embedding, 
-            n_results=n_results
+        return self._finish_search(key, query, query_embedding, n_results)
+    
+    async def asearch(
+        self,
+        query: str,
+        n_results: int = 5
+    ) -> List[HybridSearchResult]:
+        """
+        Async έκδοση του search για τα async routes.
+        
+        Το embedding του query (HTTP request στο Ollama) και το υπόλοιπο
+        search τρέχουν σε threads, ώστε να μη μπλοκάρουν το event loop.
+        Το TF-IDF τρέχει μόνο αν δεν υπάρχει semantic cache hit.
+        
+        Args:
+            query: Η ερώτηση του χρήστη
+            n_results: Μέγιστος αριθμός αποτελεσμάτων
+            
+        Returns:
+            List of HybridSearchResult, ταξινομημένα κατά combined score
+        """
+        key = self._search_cache_key(query, n_results)
+        cached = self._search_cache_get(key, query)
+        if cached is not None:
+            return cached
+        
+        query_embedding = await asyncio.to_thread(
+            self.embeddings_service.create_embedding, query
+        )
+        return await asyncio.to_thread(
+            self._finish_search, key, query, query_embedding, n_results
         )
+    
+    @staticmethod
+    def _search_cache_key(query: str, n_results: int) -> Tuple[str, int]:
+        """
+        Key του search cache.
         
-        # Βήμα 2: Keyword Search  
-        keyword_results = self.tfidf_service.search(query, n_results=n_results)
+        Στα FAQ η ίδια ερώτηση έρχεται ξανά και ξανά, οπότε κρατάμε
+        τα αποτελέσματα ανά (query, n_results). Το key αγνοεί κεφαλαία
+        και επιπλέον κενά.
+        """
+        return (" ".join(query.lower().split()), n_results)
+    
+    def _search_cache_get(
+        self,
+        key: Tuple[str, int],
+        query: str
+    ) -> Optional[List[HybridSearchResult]]:
+        """Τα cached αποτελέσματα για το key, ή None."""
+        with self._search_cache_lock:
+            cached = self._search_cache.get(key)
+            if cached is None:
+                return None
+            self._search_cache.move_to_end(key)
+        
+        logger.info("[CACHE] Cached hybrid search for: '%s'", query)
+        return list(cached)
+    
+    def _finish_search(
+        self,
+        key: Tuple[str, int],
+        query: str,
+        query_embedding: np.ndarray,
+        n_results: int
+    ) -> List[HybridSearchResult]:
+        """
+        Ό,τι μένει από το search αφού έχουμε το embedding του query:
+        semantic cache, hybrid search και αποθήκευση στο search cache.
+        """
+        # Μια σχεδόν ίδια ερώτηση που έχει ήδη γίνει δίνει τα ίδια αποτελέσματα
+        results = self._semantic_cache_lookup(query_embedding, n_results)
+        if results is not None:
+            logger.info("[CACHE] Semantic cache hit for: '%s'", query)
+        else:
+            results = self._hybrid_search(query, query_embedding, n_results)
+            self._semantic_cache_add(query_embedding, n_results, results)
+        
+        with self._search_cache_lock:
+            self._search_cache[key] = results
+            if len(self._search_cache) > SEARCH_CACHE_SIZE:
+                self._search_cache.popitem(last=False)
+        
+        return list(results)
+    
+    def clear_search_cache(self):
+        """Αδειάζει τα caches αποτελεσμάτων (π.χ. όταν αλλάζει το knowledge base)."""
+        with self._search_cache_lock:
+            self._search_cache.clear()
+            self._qcache_matrix = None
+            self._qcache_results = []
+            self._qcache_next = 0
+    
+    def _semantic_cache_lookup(
+        self,
+        query_embedding: np.ndarray,
+        n_results: int
+    ) -> Optional[List[HybridSearchResult]]:
+        """
+        Ψάχνει στο semantic cache μια προηγούμενη ερώτηση με
+        cosine >= SEMANTIC_CACHE_THRESHOLD.
         
-        # Βήμα 3: Συνδυασμός αποτελεσμάτων
-        results_map = {}  # qa_id -> HybridSearchResult
+        Τα embeddings είναι unit vectors, οπότε ένα matrix-vector product
+        δίνει όλα τα cosine similarities μαζί.
         
-        # Προσθήκη semantic results
-        for result in semantic_results:
-            qa_pair = self.parser.get_by_id(result.qa_id)
+        Returns:
+            Τα cached αποτελέσματα, ή None αν δεν βρέθηκε αρκετά κοντινή ερώτηση
+        """
+        with self._search_cache_lock:
+            if not self._qcache_results:
+                return None
             
-            hybrid_result = HybridSearchResult(
-                qa_pair=qa_pair,
-                semantic_score=result.similarity,
-                keyword_score=0.0,  # Θα ενημερωθεί αν βρεθεί και στο TF-IDF
-                combined_score=result.similarity * self.semantic_weight,
-                match_type="semantic",
-                explanation=f"Strong semantic match (score: {result.similarity:.2f})"
-            )
+            similarities = self._qcache_matrix[:len(self._qcache_results)] @ query_embedding
+            best = int(np.argmax(similarities))
+            if similarities[best] < SEMANTIC_CACHE_THRESHOLD:
+                return None
             
-            results_map[result.qa_id] = hybrid_result
-        
-        # Προσθήκη/ενημέρωση με keyword results
-        for qa_id, keyword_score in keyword_results:
-            if qa_id in results_map:
-                # Υπάρχει ήδη από semantic - ενημερώνουμε
-                result = results_map[qa_id]
-                result.keyword_score = keyword_score
-                result.combined_score = (
-                    result.semantic_score * self.semantic_weight +
-                    keyword_score * self.keyword_weight
-                )
-                result.match_type = "both"
-                result.explanation = (
-                    f"Both semantic ({result.semantic_score:.2f}) "
-                    f"and keyword ({keyword_score:.2f}) match"
+            cached_n_results, results = self._qcache_results[best]
+        
+        # Ένα entry για λιγότερα αποτελέσματα δεν αρκεί για μεγαλύτερο n_results
+        if cached_n_results < n_results:
+            return None
+        return results[:n_results]
+    
+    def _semantic_cache_add(
+        self,
+        query_embedding: np.ndarray,
+        n_results: int,
+        results: List[HybridSearchResult]
+    ):
+        """Προσθέτει ένα query στο semantic cache (FIFO eviction όταν γεμίσει)."""
+        with self._search_cache_lock:
+            if self._qcache_matrix is None:
+                self._qcache_matrix = np.zeros(
+                    (SEMANTIC_CACHE_SIZE, len(query_embedding)), dtype=np.float32
                 )
+            
+            slot = self._qcache_next
+            self._qcache_matrix[slot] = query_embedding
+            if slot < len(self._qcache_results):
+                self._qcache_results[slot] = (n_results, results)
             else:
-                # Νέο αποτέλεσμα μόνο από keyword
-                qa_pair = self.parser.get_by_id(qa_id)
-                
-                hybrid_result = HybridSearchResult(
-                    qa_pair=qa_pair,
-                    semantic_score=0.0,
-                    keyword_score=keyword_score,
-                    combined_score=keyword_score * self.keyword_weight,
-                    match_type="keyword",
-                    explanation=f"Strong keyword match (score: {keyword_score:.2f})"
-                )
-                
-                results_map[qa_id] = hybrid_result
+                self._qcache_results.append((n_results, results))
+            self._qcache_next = (slot + 1) % SEMANTIC_CACHE_SIZE
+    
+    def _hybrid_search(
+        self,
+        query: str,
+        query_embedding: np.ndarray,
+        n_results: int
+    ) -> List[HybridSearchResult]:
+        """Το πραγματικό hybrid search, χωρίς cache (βλ. search)."""
+        logger.info("[SEARCH] Hybrid search for: '%s'", query)
+        
+        # Και οι δύο μέθοδοι επιστρέφουν rows του self.qa_pairs, οπότε
+        # κάθε QAPair βρίσκεται με ένα απλό list index
         
-        # Βήμα 4: Ταξινόμηση και επιστροφή αποτελεσμάτων
-        final_results = list(results_map.values())
+        # Βήμα 1: Semantic Search
+        semantic_results = self._semantic_search_rows(query_embedding, n_results)
         
-        # Ταξινόμηση κατά combined score
-        final_results.sort(key=lambda x: x.combined_score, reverse=True)
+        # Βήμα 2: Keyword Search  
+        keyword_results = self.tfidf_service.search_rows(query, n_results=n_results)
         
-        # Κρατάμε μόνο τα top n_results
-        final_results = final_results[:n_results]
+        # Βήμα 3: Συνδυασμός αποτελεσμάτων.
+        # Τα rows μπαίνουν σε σταθερή σειρά (semantic πρώτα, μετά τα
+        # keyword-only) και τα scores σε δύο παράλληλα arrays, ώστε το
+        # combined score να είναι μία πράξη NumPy για όλα μαζί.
+        semantic_scores = dict(semantic_results)
+        keyword_scores = dict(keyword_results)
         
-        # Logging για debugging
-        logger.info(f"   Semantic results: {len(semantic_results)}")
-        logger.info(f"   Keyword results: {len(keyword_results)}")
-        logger.info(f"   Combined results: {len(final_results)}")
+        candidates = dict.fromkeys(semantic_scores)
+        candidates.update(dict.fromkeys(keyword_scores))
+        rows = list(candidates)
         
-        for i, result in enumerate(final_results[:3]):
-            logger.info(
-                f"   #{i+1}: {result.qa_pair.question[:50]}... "
-                f"(combined: {result.combined_score:.2f}, type: {result.match_type})"
+        semantic_array = np.fromiter(
+            (semantic_scores.get(row, 0.0) for row in rows), dtype=np.float64, count=len(rows)
+        )
+        keyword_array = np.fromiter(
+            (keyword_scores.get(row, 0.0) for row in rows), dtype=np.float64, count=len(rows)
+        )
+        combined = self.semantic_weight * semantic_array + self.keyword_weight * keyword_array
+        
+        # Βήμα 4: Top n_results με argpartition και HybridSearchResult
+        # μόνο για αυτά
+        top_indices, top_scores = select_top_k(combined, n_results)
+        
+        final_results = [
+            self._make_result(
+                rows[index],
+                semantic_scores.get(rows[index]),
+                keyword_scores.get(rows[index]),
+                score
             )
+            for index, score in zip(top_indices.tolist(), top_scores.tolist())
+        ]
+        
+        # Logging για debugging. Lazy %-formatting, ώστε με log level
+        # πάνω από INFO να μη γίνεται καμία μορφοποίηση ανά query
+        if logger.isEnabledFor(logging.INFO):
+            logger.info("   Semantic results: %d", len(semantic_results))
+            logger.info("   Keyword results: %d", len(keyword_results))
+            logger.info("   Combined results: %d", len(final_results))
+            
+            for i, result in enumerate(final_results[:3]):
+                logger.info(
+                    "   #%d: %.50s... (combined: %.2f, type: %s)",
+                    i + 1, result.qa_pair.question, result.combined_score, result.match_type
+                )
         
         return final_results
     
+    def _make_result(
+        self,
+        row: int,
+        semantic_score: Optional[float],
+        keyword_score: Optional[float],
+        combined_score: float
+    ) -> HybridSearchResult:
+        """
+        Φτιάχνει το HybridSearchResult για το Q&A στη θέση row.
+        
+        Ένα score είναι None αν το Q&A δεν βρέθηκε από την αντίστοιχη μέθοδο.
+        """
+        if keyword_score is None:
+            match_type = "semantic"
+            explanation = f"Strong semantic match (score: {semantic_score:.2f})"
+        elif semantic_score is None:
+            match_type = "keyword"
+            explanation = f"Strong keyword match (score: {keyword_score:.2f})"
+        else:
+            match_type = "both"
+            explanation = (
+                f"Both semantic ({semantic_score:.2f}) "
+                f"and keyword ({keyword_score:.2f}) match"
+            )
+        
+        return HybridSearchResult(
+            qa_pair=self.qa_pairs[row],
+            semantic_score=semantic_score or 0.0,
+            keyword_score=keyword_score or 0.0,
+            combined_score=combined_score,
+            match_type=match_type,
+            explanation=explanation
+        )
+    
     def get_context_for_llm(
         self, 
         query: str, 
-        max_context_length: int = 2000
+        max_context_length: int = 2000,
+        results: Optional[List[HybridSearchResult]] = None
     ) -> str:
         """
         Προετοιμάζει το context για το LLM βάσει της ερώτησης.
@@ -246,40 +571,59 @@ class HybridRAGService:
         Args:
             query: Η ερώτηση του χρήστη
             max_context_length: Μέγιστο μήκος context σε χαρακτήρες
+            results: Έτοιμα αποτελέσματα του search(query, CONTEXT_N_RESULTS),
+                αν τα έχει ήδη ο caller - έτσι δεν ξανατρέχει το search
             
         Returns:
             Formatted context string για το LLM
         """
         # Εκτέλεση hybrid search
-        results = self.search(query, n_results=6)
+        if results is None:
+            results = self.search(query, n_results=CONTEXT_N_RESULTS)
         
         if not results:
             return "No relevant information found in the knowledge base."
         
-        # Δημιουργία context
-        context_parts = []
+        # Δημιουργία context: header για το LLM και τα Q&A pairs με
+        # διαχωριστικά, σε μία λίστα που γίνεται join μία φορά στο τέλος
+        context_parts = [f"Here are the most relevant Q&A pairs for the query '{query}':\n\n"]
         total_length = 0
         
-        for i, result in enumerate(results):
-            # Μορφοποίηση κάθε Q&A pair
-            qa_text = f"Q: {result.qa_pair.question}\nA: {result.qa_pair.answer}"
+        for result in results:
+            qa_pair = result.qa_pair
             
-            # Έλεγχος αν χωράει στο context
-            if total_length + len(qa_text) > max_context_length:
+            # Έλεγχος αν χωράει στο context πριν φτιάξουμε το string
+            # ("Q: " + "\nA: " = 7 χαρακτήρες)
+            qa_length = len(qa_pair.question) + len(qa_pair.answer) + 7
+            if total_length + qa_length > max_context_length:
                 break
             
-            context_parts.append(qa_text)
-            total_length += len(qa_text)
+            if total_length:
+                context_parts.append(CONTEXT_SEPARATOR)
+            context_parts.append(f"Q: {qa_pair.question}\nA: {qa_pair.answer}")
+            total_length += qa_length
         
-        # Συνδυασμός με διαχωριστικά
-        context = "\n\n---\n\n".join(context_parts)
-        
-        # Προσθήκη header για το LLM
-        header = f"Here are the most relevant Q&A pairs for the query '{query}':\n\n"
+        return "".join(context_parts)
+    
+    async def aget_context_for_llm(self, query: str, max_context_length: int = 2000) -> str:
+        """
+        Async έκδοση του get_context_for_llm, με το search μέσω asearch.
         
-        return header + context
+        Args:
+            query: Η ερώτηση του χρήστη
+            max_context_length: Μέγιστο μήκος context σε χαρακτήρες
+            
+        Returns:
+            Formatted context string για το LLM
+        """
+        results = await self.asearch(query, n_results=CONTEXT_N_RESULTS)
+        return self.get_context_for_llm(query, max_context_length, results=results)
     
-    def explain_results(self, query: str) -> Dict:
+    def explain_results(
+        self,
+        query: str,
+        results: Optional[List[HybridSearchResult]] = None
+    ) -> Dict:
         """
         Εξηγεί πώς λειτούργησε το hybrid search για μια ερώτηση.
         
@@ -288,11 +632,14 @@ class HybridRAGService:
         
         Args:
             query: Η ερώτηση για ανάλυση
+            results: Έτοιμα αποτελέσματα του search(query), αν τα έχει
+                ήδη ο caller
             
         Returns:
             Dictionary με detailed explanation
         """
-        results = self.search(query)
+        if results is None:
+            results = self.search(query)
         
         # Ανάλυση των αποτελεσμάτων
         semantic_only = [r for r in results if r.match_type == "semantic"]
@@ -5,18 +5,27 @@ API Routes για το FAQ Service.
 Το κρατάμε ξεχωριστό από το main.py για καλύτερη οργάνωση.
 """
 
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Query
+from fastapi.responses import StreamingResponse
+from sqlalchemy import select
 from sqlalchemy.orm import Session
-from typing import List
+from typing import List, AsyncIterator
 from datetime import datetime
+from io import StringIO
+import asyncio
+import json
 import logging
 import os
 
 from .database import get_db
 from .models import Question
-from .schemas import QuestionRequest, AnswerResponse, QuestionHistory
-from .llm_service import llm_service
-from .rag_service import HybridRAGService
+from .schemas import (
+    QuestionRequest, AnswerResponse, QuestionHistory,
+    BatchQuestionRequest, BatchAnswerResponse
+)
+from .llm_service import get_llm_service
+from .rag_service import HybridRAGService, CONTEXT_N_RESULTS
+from .qa_log import log_qa
 
 # Ρυθμίζουμε το logging
 logger = logging.getLogger(__name__)
@@ -44,23 +53,23 @@ def get_rag_service():
 
 @router.post("/ask", response_model=AnswerResponse)
 async def ask_question(
-    request: QuestionRequest, 
-    db: Session = Depends(get_db)
+    request: QuestionRequest,
+    background_tasks: BackgroundTasks
 ):
     """
     Ask a question to the FAQ system.
-    
+
     Η διαδικασία:
     1. Λαμβάνουμε την ερώτηση από τον χρήστη
     2. Χρησιμοποιούμε το RAG για να βρούμε σχετικό context
     3. Στέλνουμε την ερώτηση και το context στο LLM
-    4. Αποθηκεύουμε την ερώτηση και απάντηση στη βάση
-    5. Επιστρέφουμε την απάντηση
-    
+    4. Επιστρέφουμε την απάντηση
+    5. Αποθηκεύουμε την ερώτηση και απάντηση στη βάση (στο background)
+
     Args:
         request: Η ερώτηση του χρήστη
-        db: Database session (injected automatically)
-    
+        background_tasks: FastAPI background tasks (injected automatically)
+
     Returns:
         AnswerResponse με την απάντηση του AI
     """
@@ -68,47 +77,138 @@ async def ask_question(
         # Παίρνουμε το RAG service
         rag = get_rag_service()
         
-        logger.info(f"📝 Processing question: {request.question[:50]}...")
+        logger.info("[ASK] Processing question: %.50s...", request.question)
         
-        # Χρησιμοποιούμε το RAG για να βρούμε relevant context
-        context = rag.get_context_for_llm(request.question)
+        # Χρησιμοποιούμε το RAG για να βρούμε relevant context.
+        # Το asearch τρέχει το embedding και το TF-IDF ταυτόχρονα σε threads,
+        # οπότε δεν μπλοκάρει το event loop
+        context = await rag.aget_context_for_llm(request.question)
         
-        logger.info(f"🔍 RAG found relevant context ({len(context)} chars)")
+        logger.info("[RAG] Found relevant context (%d chars)", len(context))
         
         # Παίρνουμε απάντηση από το LLM με το context
-        answer_text = llm_service.generate_answer_with_context(
+        answer_text = await get_llm_service().generate_answer_with_context(
             question=request.question,
             context=context
         )
         
-        # Δημιουργούμε νέο record στη βάση
-        db_question = Question(
-            question_text=request.question,
-            answer_text=answer_text
+        # Η αποθήκευση γίνεται αφού σταλεί η απάντηση, από τον
+        # background writer του qa_log
+        background_tasks.add_task(log_qa, request.question, answer_text, request.source)
+
+        # Επιστρέφουμε την απάντηση
+        return AnswerResponse(answer=answer_text)
+
+    except Exception as e:
+        # Αν κάτι πάει στραβά, επιστρέφουμε user-friendly error
+        raise HTTPException(
+            status_code=500,
+            detail=f"An error occurred while processing your question: {str(e)}"
+        )
+
+
+@router.post("/ask/stream")
+async def ask_question_stream(request: QuestionRequest):
+    """
+    Ask a question and receive the answer as server-sent events.
+    
+    Ίδια διαδικασία με το /ask, αλλά η απάντηση στέλνεται κομμάτι-κομμάτι
+    (ένα `data:` event ανά κομμάτι, JSON-encoded string) όσο την παράγει
+    το LLM. Στο τέλος στέλνουμε ένα `event: done`, ή ένα `event: error`
+    (με JSON-encoded μήνυμα) αν το LLM αποτύχει. Μόνο οι ολοκληρωμένες
+    απαντήσεις αποθηκεύονται στη βάση.
+    
+    Args:
+        request: Η ερώτηση του χρήστη
+    
+    Returns:
+        StreamingResponse (text/event-stream)
+    """
+    try:
+        rag = get_rag_service()
+        context = await rag.aget_context_for_llm(request.question)
+    except Exception as e:
+        raise HTTPException(
+            status_code=500,
+            detail=f"An error occurred while processing your question: {str(e)}"
         )
+    
+    logger.info("[ASK] Streaming answer for: %.50s...", request.question)
+    
+    async def event_stream() -> AsyncIterator[str]:
+        # Κρατάμε ολόκληρη την απάντηση για να την αποθηκεύσουμε στο τέλος
+        answer = StringIO()
         
-        # Αποθηκεύουμε στη βάση
-        db.add(db_question)
-        db.commit()
-        db.refresh(db_question)  # Για να πάρουμε το generated ID
+        try:
+            async for chunk in get_llm_service().stream_answer_with_context(
+                question=request.question,
+                context=context
+            ):
+                answer.write(chunk)
+                yield f"data: {json.dumps(chunk)}\n\n"
+        except Exception as e:
+            logger.error("[FAIL] Streaming answer failed: %s", e)
+            message = "An error occurred while processing your question. Please try again."
+            yield f"event: error\ndata: {json.dumps(message)}\n\n"
+            return
         
-        logger.info(f"💾 Saved Q&A to database (ID: {db_question.id})")
+        yield "event: done\ndata: \n\n"
+
+        log_qa(request.question, answer.getvalue().strip(), request.source)
+    
+    # Με Content-Encoding ήδη ορισμένο, το GZipMiddleware (starlette 0.27)
+    # περνάει το stream αυτούσιο: αλλιώς το gzip κρατάει τα κομμάτια στον
+    # buffer του και ο client δεν βλέπει το πρώτο token αμέσως
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Content-Encoding": "identity"}
+    )
+
+
+@router.post("/ask_batch", response_model=BatchAnswerResponse)
+async def ask_questions_batch(request: BatchQuestionRequest):
+    """
+    Ask many questions to the FAQ system in one request.
+
+    Οι ερωτήσεις στέλνονται στο LLM ταυτόχρονα, οπότε ένα Ollama με
+    OLLAMA_NUM_PARALLEL > 1 τις εξυπηρετεί μαζί αντί για μία-μία.
+    Τα Q&A αποθηκεύονται στη βάση στο background από τον qa_log writer.
+
+    Args:
+        request: Οι ερωτήσεις του χρήστη
+
+    Returns:
+        BatchAnswerResponse με τις απαντήσεις στην ίδια σειρά
+    """
+    try:
+        rag = get_rag_service()
         
-        # Επιστρέφουμε την απάντηση
-        return AnswerResponse(answer=answer_text)
+        logger.info("[ASK] Processing batch of %d questions", len(request.questions))
+        
+        # RAG context για κάθε ερώτηση, παράλληλα
+        contexts = await asyncio.gather(*(
+            rag.aget_context_for_llm(question)
+            for question in request.questions
+        ))
         
+        # Όλες οι ερωτήσεις στο LLM ταυτόχρονα
+        answers = await get_llm_service().generate_answers(request.questions, contexts)
+        
+        for question, answer in zip(request.questions, answers):
+            log_qa(question, answer, request.source)
+
+        return BatchAnswerResponse(answers=answers)
+
     except Exception as e:
-        # Αν κάτι πάει στραβά, κάνουμε rollback
-        db.rollback()
-        # Και επιστρέφουμε user-friendly error
         raise HTTPException(
             status_code=500,
-            detail=f"An error occurred while processing your question: {str(e)}"
+            detail=f"An error occurred while processing your questions: {str(e)}"
         )
 
 
 @router.get("/history", response_model=List[QuestionHistory])
-async def get_history(
+def get_history(
     n: int = Query(
         default=10,
         ge=1,
@@ -123,6 +223,9 @@ async def get_history(
     Επιστρέφει τις πιο πρόσφατες ερωτήσεις, με τις νεότερες πρώτες.
     Μπορείς να ελέγξεις πόσες θες με το parameter 'n'.
     
+    Είναι απλό `def` ώστε το FastAPI να τρέχει το synchronous
+    SQLAlchemy query στο threadpool και όχι στο event loop.
+    
     Args:
         n: Αριθμός ερωτήσεων που θέλεις (1-100, default: 10)
         db: Database session
@@ -131,15 +234,19 @@ async def get_history(
         List of QuestionHistory objects
     """
     try:
-        # Query στη βάση - παίρνουμε τις τελευταίες n ερωτήσεις
-        questions = db.query(Question)\
-            .order_by(Question.timestamp.desc())\
-            .limit(n)\
-            .all()
+        # Query στη βάση - παίρνουμε τις τελευταίες n ερωτήσεις.
+        # Core SELECT αντί για ORM query: το endpoint είναι read-only,
+        # οπότε δεν χρειαζόμαστε Question objects και identity map
+        stmt = select(
+            Question.id,
+            Question.question_text,
+            Question.answer_text,
+            Question.timestamp,
+            Question.source
+        ).order_by(Question.timestamp.desc()).limit(n)
         
-        # Το FastAPI θα μετατρέψει αυτόματα τα SQLAlchemy objects
-        # σε QuestionHistory schemas χάρη στο from_attributes=True
-        return questions
+        # Το FastAPI μετατρέπει τα rows σε QuestionHistory schemas
+        return db.execute(stmt).mappings().all()
         
     except Exception as e:
         raise HTTPException(
@@ -149,7 +256,7 @@ async def get_history(
 
 
 @router.get("/stats")
-async def get_stats(db: Session = Depends(get_db)):
+def get_stats(db: Session = Depends(get_db)):
     """
     Get statistics about the FAQ system.
     
@@ -187,7 +294,7 @@ async def test_llm_connection():
     ότι το Ollama τρέχει και το Mistral είναι διαθέσιμο.
     """
     try:
-        test_result = llm_service.test_connection()
+        test_result = await get_llm_service().test_connection()
         return test_result
     except Exception as e:
         raise HTTPException(
@@ -197,7 +304,7 @@ async def test_llm_connection():
 
 
 @router.post("/rag/search")
-async def search_knowledge_base(request: QuestionRequest):
+def search_knowledge_base(request: QuestionRequest):
     """
     Εκτελεί RAG search χωρίς να καλέσει το LLM.
     
@@ -206,21 +313,26 @@ async def search_knowledge_base(request: QuestionRequest):
     - Κατανόηση του πώς λειτουργεί το hybrid search
     - Testing χωρίς να περιμένεις το LLM
     
+    Όλη η δουλειά είναι synchronous, οπότε το endpoint είναι απλό `def`
+    και το FastAPI το τρέχει στο threadpool.
+    
     Returns:
         Detailed search results με scores και explanations
     """
     try:
         rag = get_rag_service()
         
-        # Εκτέλεση hybrid search
-        results = rag.search(request.question, n_results=5)
+        # Ένα μόνο hybrid search: δείχνουμε τα top 5 και το context
+        # χρησιμοποιεί όσα θα έπαιρνε και στο /ask
+        context_results = rag.search(request.question, n_results=CONTEXT_N_RESULTS)
+        results = context_results[:5]
         
         # Μετατροπή αποτελεσμάτων σε JSON-friendly format
         search_results = []
         for result in results:
             search_results.append({
                 "question": result.qa_pair.question,
-                "answer": result.qa_pair.answer[:200] + "..." if len(result.qa_pair.answer) > 200 else result.qa_pair.answer,
+                "answer": result.qa_pair.answer_preview,
                 "scores": {
                     "semantic": round(result.semantic_score, 3),
                     "keyword": round(result.keyword_score, 3),
@@ -231,13 +343,14 @@ async def search_knowledge_base(request: QuestionRequest):
             })
         
         # Παίρνουμε και explanation για το search
-        explanation = rag.explain_results(request.question)
+        explanation = rag.explain_results(request.question, results=results)
+        context = rag.get_context_for_llm(request.question, results=context_results)
         
         return {
             "query": request.question,
             "results": search_results,
             "explanation": explanation,
-            "context_preview": rag.get_context_for_llm(request.question)[:500] + "..."
+            "context_preview": context[:500] + "..."
         }
         
     except Exception as e:
@@ -245,30 +358,3 @@ async def search_knowledge_base(request: QuestionRequest):
             status_code=500,
             detail=f"RAG search failed: {str(e)}"
         )
-async def get_stats(db: Session = Depends(get_db)):
-    """
-    Get statistics about the FAQ system.
-    
-    Αυτό είναι ένα bonus endpoint που δείχνει χρήσιμα στατιστικά.
-    Καλή πρακτική για monitoring και debugging.
-    """
-    try:
-        total_questions = db.query(Question).count()
-        
-        # Βρίσκουμε την πιο πρόσφατη ερώτηση
-        latest_question = db.query(Question)\
-            .order_by(Question.timestamp.desc())\
-            .first()
-        
-        return {
-            "total_questions": total_questions,
-            "latest_question_time": latest_question.timestamp if latest_question else None,
-            "api_version": "1.0.0",
-            "status": "operational"
-        }
-        
-    except Exception as e:
-        raise HTTPException(
-            status_code=500,
-            detail=f"Error retrieving stats: {str(e)}"
-        )
\ No newline at end of file
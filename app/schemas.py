@@ -7,7 +7,7 @@ Pydantic schemas για validation και serialization.
 """
 
 from pydantic import BaseModel, Field, validator
-from typing import Optional
+from typing import Optional, List
 from datetime import datetime
 
 
@@ -38,6 +38,34 @@ class QuestionRequest(BaseModel):
         return v.strip()
 
 
+class BatchQuestionRequest(BaseModel):
+    """
+    Schema για πολλές ερωτήσεις σε ένα request.
+    
+    Κάθε ερώτηση έχει τους ίδιους περιορισμούς με το QuestionRequest.
+    """
+    questions: List[str] = Field(
+        ...,
+        min_length=1,
+        max_length=20,  # Όριο για να μην "πνίξουμε" το Ollama με ένα request
+        description="The questions to ask the FAQ system"
+    )
+
+    source: Optional[str] = Field(
+        default="api",
+        pattern="^(web|api|mobile)$",
+        description="The source of the questions (e.g., 'api', 'web', etc.)"
+    )
+
+    @validator('questions', each_item=True)
+    def validate_question(cls, v):
+        """Καθαρίζει κάθε ερώτηση και ελέγχει το μήκος της"""
+        v = v.strip()
+        if not 5 <= len(v) <= 500:
+            raise ValueError("each question must be 5-500 characters long")
+        return v
+
+
 class AnswerResponse(BaseModel):
     """
     Schema για την απάντηση που επιστρέφουμε.
@@ -51,6 +79,16 @@ class AnswerResponse(BaseModel):
     )
 
 
+class BatchAnswerResponse(BaseModel):
+    """
+    Schema για τις απαντήσεις ενός batch, στην ίδια σειρά με τις ερωτήσεις.
+    """
+    answers: List[str] = Field(
+        ...,
+        description="The AI-generated answers, in the same order as the questions"
+    )
+
+
 class QuestionHistory(BaseModel):
     """
     Schema για το ιστορικό ερωτήσεων.
@@ -4,11 +4,16 @@ Script για να ελέγξει αν όλα είναι έτοιμα για τ
 Τρέξε το με: python setup_check.py
 """
 
+import importlib.util
 import subprocess
 import sys
 import os
 import requests
 
+# Timeout (sec) για το ping στο Ollama: ένα Ollama που δεν απαντάει
+# πρέπει να αποτυγχάνει γρήγορα και όχι να κρεμάει το script
+OLLAMA_CHECK_TIMEOUT = 2
+
 
 def check_python_version():
     """Έλεγχος Python version."""
@@ -36,12 +41,13 @@ def check_dependencies():
         "ollama"
     ]
     
+    # Το find_spec βρίσκει το package χωρίς να το κάνει import, οπότε δεν
+    # φορτώνουμε chromadb/sklearn κτλ. μόνο για να δούμε αν υπάρχουν
     missing = []
     for package in required_packages:
-        try:
-            __import__(package)
+        if importlib.util.find_spec(package) is not None:
             print(f"✅ {package} - installed")
-        except ImportError:
+        else:
             print(f"❌ {package} - NOT installed")
             missing.append(package)
     
@@ -58,7 +64,7 @@ def check_ollama():
     print("\n🦙 Checking Ollama...")
     
     try:
-        response = requests.get("http://localhost:11434/api/tags")
+        response = requests.get("http://localhost:11434/api/tags", timeout=OLLAMA_CHECK_TIMEOUT)
         if response.status_code == 200:
             print("✅ Ollama is running")
             
@@ -93,6 +99,9 @@ def check_ollama():
         print("❌ Ollama is not running")
         print("   Run: ollama serve")
         return False
+    except requests.exceptions.Timeout:
+        print(f"❌ Ollama did not respond within {OLLAMA_CHECK_TIMEOUT}s")
+        return False
 
 
 def check_knowledge_base():
@@ -130,9 +139,18 @@ def check_project_structure():
         "data/knowledge_base.txt"
     ]
     
+    # Ένα scandir ανά φάκελο (app/, data/) αντί για ένα stat ανά αρχείο
+    existing = set()
+    for directory in {os.path.dirname(file) for file in required_files}:
+        try:
+            with os.scandir(directory) as entries:
+                existing.update(f"{directory}/{entry.name}" for entry in entries)
+        except FileNotFoundError:
+            pass
+    
     missing = []
     for file in required_files:
-        if os.path.exists(file):
+        if file in existing:
             print(f"✅ {file}")
         else:
             print(f"❌ {file} - NOT found")
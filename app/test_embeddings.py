@@ -34,19 +34,24 @@ def main():
         "How secure is my data?"
     ]
     
-    embeddings = service.create_embeddings_batch(texts)
+    # Το query του bonus μπαίνει στο ίδιο batch, ώστε όλα τα embeddings
+    # να έρθουν με ένα request
+    query = "I forgot my password"
+    batch = service.create_embeddings_batch([query] + texts)
+    query_emb, embeddings = batch[0], batch[1:]
     print(f"\n✅ Created {len(embeddings)} embeddings")
     
     # Bonus: Δείξε πώς παρόμοια κείμενα έχουν κοντινά embeddings
     print("\n🎯 Bonus: Finding similar texts")
-    query = "I forgot my password"
-    query_emb = service.create_embedding(query)
     
     print(f"\nQuery: '{query}'")
     print("Similarities with other texts:")
     
-    for i, text in enumerate(texts):
-        similarity = service.cosine_similarity(query_emb, embeddings[i])
+    # Τα embeddings του batch είναι unit vectors, οπότε όλα τα cosine
+    # similarities βγαίνουν με ένα matrix-vector product
+    similarities = embeddings @ query_emb
+    
+    for text, similarity in zip(texts, similarities):
         print(f"  - '{text}': {similarity:.3f}")
 
 if __name__ == "__main__":
@@ -9,12 +9,17 @@ import json
 import time
 
 BASE_URL = "http://127.0.0.1:8001"
+LLM_TEST_URL = f"{BASE_URL}/api/v1/llm/test"
+ASK_STREAM_URL = f"{BASE_URL}/api/v1/ask/stream"
+HISTORY_URL = f"{BASE_URL}/api/v1/history"
+
+session = requests.Session()  # keep-alive connections
 
 def test_llm_connection():
     """Τεστάρει αν το LLM είναι συνδεδεμένο."""
     print("🔍 Testing LLM connection...")
     
-    response = requests.get(f"{BASE_URL}/api/v1/llm/test")
+    response = session.get(LLM_TEST_URL)
     
     if response.status_code == 200:
         data = response.json()
@@ -51,29 +56,56 @@ def test_faq_questions():
         print(f"❓ Question: {question}")
         
         # Μετράμε τον χρόνο απόκρισης
-        start_time = time.time()
+        start_time = time.perf_counter()
         
-        # Στέλνουμε την ερώτηση
-        response = requests.post(
-            f"{BASE_URL}/api/v1/ask",
-            json={"question": question}
+        # Στέλνουμε την ερώτηση στο streaming endpoint, ώστε να μετρήσουμε
+        # και πότε έρχεται το πρώτο κομμάτι της απάντησης (time to first token)
+        response = session.post(
+            ASK_STREAM_URL,
+            json={"question": question},
+            stream=True
         )
         
-        end_time = time.time()
+        if response.status_code != 200:
+            print(f"❌ Error: {response.status_code} - {response.text}")
+            continue
+        
+        # Server-sent events: ένα `data:` (JSON string) ανά κομμάτι και
+        # `event: done` (ή `event: error`) στο τέλος. Διαβάζουμε όλο το
+        # response, ώστε η connection να γυρίσει στο pool του session
+        first_chunk_time = None
+        chunks = []
+        event = None
+        error = None
+        for line in response.iter_lines(decode_unicode=True):
+            if line.startswith("event: "):
+                event = line[len("event: "):]
+            elif line.startswith("data: "):
+                if event == "error":
+                    error = json.loads(line[len("data: "):])
+                elif event is None:
+                    if first_chunk_time is None:
+                        first_chunk_time = time.perf_counter()
+                    chunks.append(json.loads(line[len("data: "):]))
+        
+        end_time = time.perf_counter()
         response_time = end_time - start_time
         
-        if response.status_code == 200:
-            answer = response.json()["answer"]
-            print(f"✅ Answer: {answer[:200]}{'...' if len(answer) > 200 else ''}")
-            print(f"⏱️  Response time: {response_time:.2f} seconds")
-        else:
-            print(f"❌ Error: {response.status_code} - {response.text}")
+        if error is not None:
+            print(f"❌ Error after {response_time:.2f} seconds: {error}")
+            continue
+        
+        answer = "".join(chunks).strip()
+        print(f"✅ Answer: {answer[:200]}{'...' if len(answer) > 200 else ''}")
+        if first_chunk_time is not None:
+            print(f"⏱️  Time to first token: {first_chunk_time - start_time:.2f} seconds")
+        print(f"⏱️  Response time: {response_time:.2f} seconds")
 
 def test_history():
     """Τεστάρει το history endpoint."""
     print("\n📚 Testing history endpoint...")
     
-    response = requests.get(f"{BASE_URL}/api/v1/history?n=5")
+    response = session.get(HISTORY_URL, params={"n": 5})
     
     if response.status_code == 200:
         history = response.json()
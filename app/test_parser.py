@@ -6,6 +6,33 @@ Test script για τον Knowledge Base Parser.
 
 from app.kb_parser import KnowledgeBaseParser, load_knowledge_base
 import json
+import os
+import tempfile
+
+# Knowledge base layouts που πρέπει να δίνουν τα ίδια pairs:
+# (όνομα, περιεχόμενο, αναμενόμενα (id, question, answer))
+LAYOUT_CASES = [
+    (
+        "Q/A σε ξεχωριστές γραμμές",
+        "FAQ\n\nQ: How do I reset?\nA: Click reset.\nMore text.\n\nQ: Refund?\nA: 30 days.\n",
+        [(0, "How do I reset?", "Click reset. More text."), (1, "Refund?", "30 days.")],
+    ),
+    (
+        "Q: ... A: ... στην ίδια γραμμή",
+        "Q: How do I reset? A: Click reset.\nQ: Refund? A: 30 days,\nrefundable.\n",
+        [(0, "How do I reset?", "Click reset."), (1, "Refund?", "30 days, refundable.")],
+    ),
+    (
+        "Αριθμημένα 1. Q:",
+        "1. Q: How do I reset?\nA: Click reset.\n2. Q: Refund? A: 30 days.\n",
+        [(0, "How do I reset?", "Click reset."), (1, "Refund?", "30 days.")],
+    ),
+    (
+        "Q: χωρίς απάντηση δεν αλλάζει τα IDs",
+        "Q: Orphan?\n\nQ: Second?\nA: Yes.\nQ:\nA: No question.\nQ: Third?\nA: Ok.\n",
+        [(0, "Second?", "Yes."), (2, "Third?", "Ok.")],
+    ),
+]
 
 def test_parser():
     """Τεστάρει τον parser με το πραγματικό knowledge base."""
@@ -51,5 +78,58 @@ def test_parser():
     
     print("\n✅ Parser testing completed successfully!")
 
+def test_parser_layouts():
+    """Τεστάρει τον parser με τα layouts που υποστηρίζει το knowledge base."""
+    
+    print("🔍 Testing Knowledge Base layouts\n")
+    
+    for name, content, expected in LAYOUT_CASES:
+        with tempfile.NamedTemporaryFile(
+            'w', suffix='.txt', encoding='utf-8', delete=False
+        ) as f:
+            f.write(content)
+        
+        try:
+            qa_pairs = KnowledgeBaseParser(f.name).parse()
+        finally:
+            os.unlink(f.name)
+        
+        got = [(qa.id, qa.question, qa.answer) for qa in qa_pairs]
+        assert got == expected, f"{name}: {got} != {expected}"
+        print(f"✅ {name}: {len(got)} pairs")
+    
+    print("\n✅ Layout testing completed successfully!")
+
+def test_search_by_keyword():
+    """Το search_by_keyword κάνει substring match (π.χ. refund -> Refunds)."""
+    
+    print("🔍 Testing keyword search\n")
+    
+    content = (
+        "Q: Are refunds available?\nA: Yes, plans are refundable.\n"
+        "Q: How do I get a refund?\nA: Email support.\n"
+        "Q: How do I reset my password?\nA: Click reset.\n"
+    )
+    with tempfile.NamedTemporaryFile(
+        'w', suffix='.txt', encoding='utf-8', delete=False
+    ) as f:
+        f.write(content)
+    
+    try:
+        parser = KnowledgeBaseParser(f.name)
+        parser.parse()
+    finally:
+        os.unlink(f.name)
+    
+    for keyword, expected_ids in [("refund", [0, 1]), ("Fund", [0, 1]),
+                                  ("a refund", [1]), ("password", [2])]:
+        got = [qa.id for qa in parser.search_by_keyword(keyword)]
+        assert got == expected_ids, f"{keyword!r}: {got} != {expected_ids}"
+        print(f"✅ '{keyword}': {got}")
+    
+    print("\n✅ Keyword search testing completed successfully!")
+
 if __name__ == "__main__":
-    test_parser()
\ No newline at end of file
+    test_parser()
+    test_parser_layouts()
+    test_search_by_keyword()
\ No newline at end of file
@@ -0,0 +1,88 @@
+"""
+Test script για τον background Q&A writer (app/qa_log.py).
+
+Τρέξε το με: python -m pytest app/test_qa_log.py
+
+Το test γράφει σε μια προσωρινή SQLite βάση (tmp_path), όχι στο ./faq.db.
+"""
+
+import asyncio
+import time
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app import qa_log
+from app.database import Base
+from app.models import Question
+from app.qa_log import log_qa, start_qa_writer, stop_qa_writer
+
+# Μέγιστος χρόνος (sec) μέχρι το row να φτάσει στη βάση
+MAX_DELAY = 1.0
+
+
+@pytest.fixture
+def temp_session(tmp_path, monkeypatch):
+    """Προσωρινή SQLite βάση, που χρησιμοποιεί και ο qa_log writer."""
+    engine = create_engine(
+        f"sqlite:///{tmp_path / 'qa_log.db'}",
+        connect_args={"check_same_thread": False}
+    )
+    Base.metadata.create_all(bind=engine)
+    session_factory = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    monkeypatch.setattr(qa_log, "SessionLocal", session_factory)
+    yield session_factory
+    engine.dispose()
+
+
+def _find_row(session_factory, question: str):
+    """Επιστρέφει το Question με αυτό το κείμενο (ή None)."""
+    db = session_factory()
+    try:
+        return db.query(Question).filter(Question.question_text == question).first()
+    finally:
+        db.close()
+
+
+def _log_and_wait(session_factory, question: str) -> float:
+    """
+    Καλεί το log_qa από thread (όπως ένα sync BackgroundTask) και
+    επιστρέφει σε πόσα sec εμφανίστηκε το row στη βάση.
+    """
+    # Αφήνουμε το event loop να μείνει idle (μπλοκαρισμένο στο select)
+    time.sleep(0.2)
+
+    start_time = time.perf_counter()
+    log_qa(question, "test answer", "test")
+
+    while time.perf_counter() - start_time < MAX_DELAY:
+        if _find_row(session_factory, question) is not None:
+            return time.perf_counter() - start_time
+        time.sleep(0.05)
+    return float("inf")
+
+
+async def _log_from_worker_thread(session_factory, question: str) -> float:
+    """
+    Τρέχει το _log_and_wait σε thread με τον writer ενεργό.
+
+    Το polling γίνεται μέσα στο thread, οπότε το event loop μένει idle:
+    ο writer πρέπει να ξυπνήσει μόνο από το log_qa.
+    """
+    start_qa_writer()
+    try:
+        return await asyncio.to_thread(_log_and_wait, session_factory, question)
+    finally:
+        await stop_qa_writer()
+
+
+def test_log_qa_from_worker_thread(temp_session):
+    """Το log_qa από άλλο thread πρέπει να γράφει στη βάση αμέσως."""
+    print("🔍 Testing log_qa from a worker thread\n")
+
+    delay = asyncio.run(_log_from_worker_thread(temp_session, "qa_log thread test"))
+    print(f"⏱️  Row reached the DB in {delay:.3f}s")
+    assert delay < MAX_DELAY, f"Row was not written within {MAX_DELAY}s"
+
+    print("✅ qa_log thread test passed!")
@@ -7,14 +7,48 @@ TF-IDF Service - Keyword-based search.
 """
 
 from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.metrics.pairwise import cosine_similarity
+from sklearn.pipeline import FeatureUnion
+from sklearn.preprocessing import normalize
+from scipy.sparse import csr_matrix
+from collections import Counter
 import numpy as np
 from typing import List, Dict, Tuple
+from functools import lru_cache
 import logging
 import re
 
+from .embeddings_service import select_top_k
+
 logger = logging.getLogger(__name__)
 
+# Πόσα processed queries κρατάμε (τα ίδια queries έρχονται ξανά και ξανά)
+PREPROCESS_CACHE_SIZE = 4096
+
+# Character n-grams (μέσα σε όρια λέξεων): πιάνουν παραλλαγές όπως
+# "SOC2" / "SOC 2" χωρίς το κόστος των word trigrams
+CHAR_NGRAM_RANGE = (3, 5)
+CHAR_MAX_FEATURES = 300
+
+# Ειδικοί χαρακτήρες (όλα εκτός από a-z, αριθμούς, whitespace και -).
+# Με το + ένα ολόκληρο run γίνεται ένα κενό σε ένα βήμα.
+_SPECIAL_CHARS_RE = re.compile(r'[^a-z0-9\s\-]+')
+
+
+def _preprocess_text(text: str) -> str:
+    """Η προεπεξεργασία του TFIDFService.preprocess_text, χωρίς cache."""
+    # Lowercase και αφαίρεση ειδικών χαρακτήρων (κρατάμε αριθμούς και -).
+    # Emails και URLs δεν χρειάζονται δικό τους πέρασμα: τα '.', '@', '/'
+    # γίνονται κενά όπως κάθε άλλος ειδικός χαρακτήρας, οπότε π.χ. το
+    # support@cloudsphere.com δίνει τα tokens "support cloudsphere com".
+    # Το split() ενώνει και τα πολλαπλά spaces.
+    return ' '.join(_SPECIAL_CHARS_RE.sub(' ', text.lower()).split())
+
+
+# Το preprocessing είναι pure function του text, οπότε τα queries
+# γίνονται cache σε επίπεδο module (όχι ανά instance, ώστε το
+# TFIDFService να μένει picklable)
+_cached_preprocess_text = lru_cache(maxsize=PREPROCESS_CACHE_SIZE)(_preprocess_text)
+
 
 class TFIDFService:
     """
@@ -27,9 +61,10 @@ class TFIDFService:
     def __init__(self):
         """Initialize TF-IDF service."""
         # Ο TfidfVectorizer μετατρέπει κείμενα σε TF-IDF vectors
-        self.vectorizer = TfidfVectorizer(
-            # Χρησιμοποιούμε 1-3 grams (μονές λέξεις, ζευγάρια, τριάδες)
-            ngram_range=(1, 3),
+        word_vectorizer = TfidfVectorizer(
+            # Χρησιμοποιούμε 1-2 grams (μονές λέξεις, ζευγάρια): τα trigrams
+            # σπάνια ταιριάζουν και έπιαναν θέσεις στο vocabulary
+            ngram_range=(1, 2),
             
             # Αγνοούμε πολύ κοινές λέξεις (the, is, at, etc.)
             stop_words='english',
@@ -44,13 +79,44 @@ class TFIDFService:
             min_df=2,
             
             # Χρησιμοποιούμε sublinear scaling για καλύτερα αποτελέσματα
-            sublinear_tf=True
+            sublinear_tf=True,
+            
+            # Float32 αντί για το default float64: οι τιμές είναι στο [0, 1]
+            # και η ακρίβεια αρκεί για ranking, με τη μισή μνήμη
+            dtype=np.float32
         )
         
+        # Δεύτερος vectorizer με character n-grams για ακρωνύμια και
+        # παραλλαγές γραφής. Το FeatureUnion ενώνει τα δύο vectors σε ένα,
+        # οπότε τα transform / similarities δουλεύουν όπως πριν.
+        char_vectorizer = TfidfVectorizer(
+            analyzer='char_wb',
+            ngram_range=CHAR_NGRAM_RANGE,
+            max_features=CHAR_MAX_FEATURES,
+            max_df=0.8,
+            sublinear_tf=True,
+            dtype=np.float32
+        )
+        
+        self.vectorizer = FeatureUnion([
+            ('word', word_vectorizer),
+            ('char', char_vectorizer),
+        ])
+        
         self.documents = []
+        self._doc_token_sets = []  # Τα tokens κάθε εγγράφου, για το explain_search
+        self._qa_ids = np.empty(0, dtype=np.int64)  # Το qa_id κάθε row, για το search
         self.document_vectors = None
+        self.feature_names = None  # Μόνο οι word features (οι πρώτες στήλες του union)
+        self._query_parts = []  # (analyzer, vocabulary, idf, sublinear_tf, offset) ανά vectorizer
+        self._n_features = 0
         self.is_fitted = False
         
+        # Το τελευταίο (processed query, TF-IDF vector): το search και το
+        # get_important_terms καλούνται συνήθως για το ίδιο query (π.χ. στο
+        # /rag/search), οπότε το transform γίνεται μία φορά
+        self._last_query = None
+        
     def preprocess_text(self, text: str) -> str:
         """
         Προεπεξεργασία κειμένου για TF-IDF.
@@ -58,7 +124,7 @@ class TFIDFService:
         Κάνουμε:
         - Lowercase για case-insensitive matching
         - Αφαίρεση περιττών χαρακτήρων
-        - Διατήρηση σημαντικών στοιχείων (emails, URLs, numbers)
+        - Διατήρηση αριθμών και - (π.χ. "24-hour", "27001")
         
         Args:
             text: Το αρχικό κείμενο
@@ -66,26 +132,7 @@ class TFIDFService:
         Returns:
             Καθαρισμένο κείμενο
         """
-        # Lowercase
-        text = text.lower()
-        
-        # Διατηρούμε emails ως ενιαίες λέξεις
-        text = re.sub(r'([a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,})', 
-                     lambda m: m.group(0).replace('.', 'DOT').replace('@', 'AT'), 
-                     text)
-        
-        # Διατηρούμε URLs
-        text = re.sub(r'(https?://[^\s]+)', 
-                     lambda m: m.group(0).replace('/', 'SLASH').replace('.', 'DOT'), 
-                     text)
-        
-        # Αφαιρούμε ειδικούς χαρακτήρες αλλά κρατάμε αριθμούς και -
-        text = re.sub(r'[^a-z0-9\s\-]', ' ', text)
-        
-        # Πολλαπλά spaces σε ένα
-        text = ' '.join(text.split())
-        
-        return text
+        return _cached_preprocess_text(text)
     
     def fit(self, documents: List[str], qa_pairs: List[Dict]):
         """
@@ -99,28 +146,143 @@ class TFIDFService:
             qa_pairs: List με τα αντίστοιχα Q&A objects
         """
         # Προεπεξεργασία κειμένων
-        self.documents = [self.preprocess_text(doc) for doc in documents]
+        # Κάθε έγγραφο γίνεται preprocess μία φορά, οπότε δεν περνάει από το cache
+        self.documents = [_preprocess_text(doc) for doc in documents]
+        self._doc_token_sets = [frozenset(doc.split()) for doc in self.documents]
         self.qa_pairs = qa_pairs
+        self._qa_ids = np.fromiter((qa['id'] for qa in qa_pairs), dtype=np.int64, count=len(qa_pairs))
         
         # Εκπαίδευση του vectorizer και μετατροπή εγγράφων
         try:
-            self.document_vectors = self.vectorizer.fit_transform(self.documents)
+            self.document_vectors = self._normalized(self.vectorizer.fit_transform(self.documents))
+            self._set_feature_names()
+            self._prepare_query_transform()
+            self._last_query = None
             self.is_fitted = True
             
             # Logging για debugging
-            feature_names = self.vectorizer.get_feature_names_out()
             logger.info(f"✅ TF-IDF fitted with {len(self.documents)} documents")
-            logger.info(f"   Vocabulary size: {len(feature_names)}")
-            logger.info(f"   Sample features: {list(feature_names[:10])}")
+            logger.info(f"   Vocabulary size: {len(self.feature_names)} words + "
+                        f"{self.document_vectors.shape[1] - len(self.feature_names)} char n-grams")
+            logger.info(f"   Sample features: {list(self.feature_names[:10])}")
             
         except ValueError as e:
             logger.error(f"Error fitting TF-IDF: {e}")
             logger.error("This usually happens with too few documents or all stop words")
-            # Fallback σε απλούστερο vectorizer
-            self.vectorizer = TfidfVectorizer(ngram_range=(1, 2), min_df=1)
-            self.document_vectors = self.vectorizer.fit_transform(self.documents)
+            # Fallback σε απλούστερους vectorizers (χωρίς min_df / max_df)
+            self.vectorizer = FeatureUnion([
+                ('word', TfidfVectorizer(ngram_range=(1, 2), min_df=1, dtype=np.float32)),
+                ('char', TfidfVectorizer(
+                    analyzer='char_wb',
+                    ngram_range=CHAR_NGRAM_RANGE,
+                    max_features=CHAR_MAX_FEATURES,
+                    dtype=np.float32
+                )),
+            ])
+            self.document_vectors = self._normalized(self.vectorizer.fit_transform(self.documents))
+            self._set_feature_names()
+            self._prepare_query_transform()
+            self._last_query = None
             self.is_fitted = True
     
+    def _set_feature_names(self):
+        """
+        Κρατάει τα ονόματα των word features για τα explanations.
+        
+        Οι char n-grams (π.χ. " soc") δεν λένε κάτι στον χρήστη, οπότε
+        τα important terms βγαίνουν μόνο από τις word στήλες του union.
+        """
+        self.feature_names = self.vectorizer.named_transformers['word'].get_feature_names_out()
+    
+    def _prepare_query_transform(self):
+        """
+        Κρατάει ό,τι χρειάζεται το _fast_transform από κάθε fitted vectorizer:
+        τον analyzer, το vocabulary, τα IDF weights και τη θέση (offset)
+        των στηλών του μέσα στο union.
+        """
+        self._query_parts = []
+        offset = 0
+        for _, vectorizer in self.vectorizer.transformer_list:
+            self._query_parts.append((
+                vectorizer.build_analyzer(),
+                vectorizer.vocabulary_,
+                vectorizer.idf_.astype(np.float32),
+                vectorizer.sublinear_tf,
+                offset
+            ))
+            offset += len(vectorizer.vocabulary_)
+        self._n_features = offset
+    
+    @staticmethod
+    def _normalized(matrix):
+        """
+        L2-normalized CSR πίνακας.
+        
+        Με μοναδιαία rows το cosine similarity είναι απλό dot product,
+        οπότε τα norms των εγγράφων υπολογίζονται μία φορά στο fit
+        και όχι σε κάθε query.
+        """
+        return normalize(matrix.tocsr(), norm='l2', copy=False)
+    
+    def _query_vector(self, text: str):
+        """
+        Προεπεξεργασία και TF-IDF transform ενός query (sparse 1 x V).
+        
+        Κρατάμε το αποτέλεσμα του τελευταίου query, ώστε διαδοχικές
+        κλήσεις για το ίδιο κείμενο να μην ξανακάνουν tokenization.
+        """
+        processed_text = self.preprocess_text(text)
+        
+        last = self._last_query
+        if last is not None and last[0] == processed_text:
+            return last[1]
+        
+        vector = self._fast_transform(processed_text)
+        self._last_query = (processed_text, vector)
+        return vector
+    
+    def _fast_transform(self, processed_text: str) -> csr_matrix:
+        """
+        Το ίδιο αποτέλεσμα με το _normalized(vectorizer.transform([text])),
+        για ένα μόνο query.
+        
+        Ένα query έχει λίγα tokens, οπότε το validation και το χτίσιμο
+        sparse πινάκων του sklearn κοστίζουν περισσότερο από τον ίδιο τον
+        υπολογισμό. Εδώ: analyzer -> counts -> (sublinear) tf * idf ->
+        L2 ανά vectorizer, όπως το TfidfVectorizer, και τελικό L2.
+        """
+        indices = []
+        data = []
+        for analyze, vocabulary, idf, sublinear_tf, offset in self._query_parts:
+            counts = Counter(
+                index for index in map(vocabulary.get, analyze(processed_text))
+                if index is not None
+            )
+            if not counts:
+                continue
+            
+            part_indices = np.fromiter(counts.keys(), dtype=np.int32, count=len(counts))
+            part_data = np.fromiter(counts.values(), dtype=np.float32, count=len(counts))
+            if sublinear_tf:
+                part_data = np.log(part_data) + 1
+            part_data *= idf[part_indices]
+            part_data /= np.linalg.norm(part_data)
+            
+            order = np.argsort(part_indices)
+            indices.append(part_indices[order] + offset)
+            data.append(part_data[order])
+        
+        if not indices:
+            return csr_matrix((1, self._n_features), dtype=np.float32)
+        
+        indices = np.concatenate(indices)
+        data = np.concatenate(data)
+        data /= np.linalg.norm(data)
+        return csr_matrix(
+            (data, indices, np.array([0, len(data)], dtype=np.int32)),
+            shape=(1, self._n_features)
+        )
+    
     def search(self, query: str, n_results: int = 3) -> List[Tuple[int, float]]:
         """
         Αναζήτηση με TF-IDF.
@@ -134,31 +296,102 @@ class TFIDFService:
         Returns:
             List of tuples (qa_id, similarity_score)
         """
+        rows, scores = self._search_arrays(query, n_results)
+        return list(zip(self._qa_ids[rows].tolist(), scores.tolist()))
+    
+    def search_rows(self, query: str, n_results: int = 3) -> List[Tuple[int, float]]:
+        """
+        Όπως το search, αλλά επιστρέφει τη θέση (row) κάθε εγγράφου
+        στη λίστα του fit αντί για το qa_id.
+        
+        Returns:
+            List of tuples (row, similarity_score)
+        """
+        rows, scores = self._search_arrays(query, n_results)
+        return list(zip(rows.tolist(), scores.tolist()))
+    
+    def _search_arrays(self, query: str, n_results: int) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Τα top-n (rows, scores) ενός query ως numpy arrays,
+        ώστε το search να κάνει το mapping σε qa_ids με fancy indexing.
+        """
         if not self.is_fitted:
             logger.error("TF-IDF not fitted yet!")
-            return []
+            return np.empty(0, dtype=np.intp), np.empty(0, dtype=np.float32)
+        
+        # Προεπεξεργασία και μετατροπή query σε TF-IDF vector
+        query_vector = self._query_vector(query)
+        
+        # Cosine similarity με όλα τα έγγραφα: ένα sparse matrix-vector
+        # product, αφού και τα δύο μέρη είναι ήδη κανονικοποιημένα
+        similarities = (self.document_vectors @ query_vector.T).toarray().ravel()
+        
+        return self._top_positive(similarities, n_results)
+    
+    @staticmethod
+    def _top_positive(similarities: np.ndarray, n_results: int) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Τα top-n αποτελέσματα (argpartition, όχι sort όλων),
+        μόνο όσα έχουν κάποια ομοιότητα (score > 0).
+        """
+        top_indices, top_scores = select_top_k(similarities, n_results)
+        mask = top_scores > 0
+        return top_indices[mask], top_scores[mask]
+    
+    def search_batch(self, queries: List[str], n_results: int = 3) -> List[List[Tuple[int, float]]]:
+        """
+        Όπως το search, για πολλά queries μαζί.
+        
+        Args:
+            queries: Οι ερωτήσεις
+            n_results: Πόσα αποτελέσματα ανά ερώτηση
+            
+        Returns:
+            Μία λίστα από tuples (qa_id, similarity_score) ανά query,
+            στην ίδια σειρά με τα queries
+        """
+        return [
+            list(zip(self._qa_ids[rows].tolist(), scores.tolist()))
+            for rows, scores in self._search_arrays_batch(queries, n_results)
+        ]
+    
+    def search_rows_batch(self, queries: List[str], n_results: int = 3) -> List[List[Tuple[int, float]]]:
+        """
+        Όπως το search_rows, για πολλά queries μαζί.
         
-        # Προεπεξεργασία query
-        processed_query = self.preprocess_text(query)
+        Όλα τα queries γίνονται transform με μία κλήση και τα similarities
+        βγαίνουν με ένα sparse matrix product (N x M) αντί για M ξεχωριστά.
         
-        # Μετατροπή query σε TF-IDF vector
-        query_vector = self.vectorizer.transform([processed_query])
+        Returns:
+            Μία λίστα από tuples (row, similarity_score) ανά query
+        """
+        return [
+            list(zip(rows.tolist(), scores.tolist()))
+            for rows, scores in self._search_arrays_batch(queries, n_results)
+        ]
+    
+    def _search_arrays_batch(
+        self,
+        queries: List[str],
+        n_results: int
+    ) -> List[Tuple[np.ndarray, np.ndarray]]:
+        """Όπως το _search_arrays, για πολλά queries μαζί."""
+        if not self.is_fitted:
+            logger.error("TF-IDF not fitted yet!")
+            empty = (np.empty(0, dtype=np.intp), np.empty(0, dtype=np.float32))
+            return [empty for _ in queries]
         
-        # Υπολογισμός cosine similarity με όλα τα έγγραφα
-        similarities = cosine_similarity(query_vector, self.document_vectors).flatten()
+        if not queries:
+            return []
         
-        # Βρίσκουμε τα top-n αποτελέσματα
-        top_indices = np.argsort(similarities)[::-1][:n_results]
+        query_vectors = self._normalized(
+            self.vectorizer.transform([self.preprocess_text(query) for query in queries])
+        )
         
-        # Δημιουργούμε τα αποτελέσματα
-        results = []
-        for idx in top_indices:
-            if similarities[idx] > 0:  # Μόνο αν υπάρχει κάποια ομοιότητα
-                qa_id = self.qa_pairs[idx]['id']
-                score = float(similarities[idx])
-                results.append((qa_id, score))
+        # Μία στήλη similarities ανά query
+        similarities = (self.document_vectors @ query_vectors.T).toarray()
         
-        return results
+        return [self._top_positive(column, n_results) for column in similarities.T]
     
     def get_important_terms(self, text: str, top_n: int = 5) -> List[Tuple[str, float]]:
         """
@@ -178,22 +411,20 @@ class TFIDFService:
             return []
         
         # Προεπεξεργασία και μετατροπή
-        processed_text = self.preprocess_text(text)
-        text_vector = self.vectorizer.transform([processed_text])
-        
-        # Παίρνουμε τα feature names
-        feature_names = self.vectorizer.get_feature_names_out()
-        
-        # Παίρνουμε τα TF-IDF scores
-        tfidf_scores = text_vector.toarray()[0]
-        
-        # Βρίσκουμε non-zero scores
-        non_zero_indices = np.where(tfidf_scores > 0)[0]
+        return self._top_terms(self._query_vector(text), top_n)
+    
+    def _top_terms(self, vector, top_n: int) -> List[Tuple[str, float]]:
+        """
+        Οι top_n όροι ενός TF-IDF vector (1 x V CSR row), κατά score.
         
-        # Δημιουργούμε list με (term, score)
+        Ο sparse vector έχει ήδη μόνο τους non-zero όρους,
+        οπότε δεν χρειάζεται dense πίνακας μεγέθους V.
+        """
+        n_words = len(self.feature_names)
         term_scores = [
-            (feature_names[i], tfidf_scores[i]) 
-            for i in non_zero_indices
+            (self.feature_names[i], score)
+            for i, score in zip(vector.indices, vector.data)
+            if i < n_words and score > 0
         ]
         
         # Ταξινομούμε κατά score
@@ -220,16 +451,18 @@ class TFIDFService:
         # Terms από το query
         query_terms = set(self.preprocess_text(query).split())
         
-        # Terms από το αποτέλεσμα
-        result_terms = set(self.documents[result_idx].split())
+        # Terms από το αποτέλεσμα (υπολογισμένα μία φορά στο fit)
+        result_terms = self._doc_token_sets[result_idx]
         
         # Κοινά terms
         matching_terms = query_terms.intersection(result_terms)
         
         # TF-IDF scores για τα matching terms
         important_query_terms = self.get_important_terms(query, top_n=10)
-        important_result_terms = self.get_important_terms(
-            self.documents[result_idx], 
+        # Το έγγραφο είναι ήδη vectorized από το fit: παίρνουμε το row του
+        # αντί να το ξανακάνουμε transform (και να χαθεί το cached query)
+        important_result_terms = self._top_terms(
+            self.document_vectors[result_idx], 
             top_n=10
         )
         
@@ -2,14 +2,27 @@
 """
 Debug script to check what's stored in ChromaDB
 """
+import re
 import sys
 sys.path.append('.')
-from app.chromadb_service import ChromaDBService
+from app.chromadb_service import get_chromadb_service
+
+# Ένα compiled regex ανά αναζήτηση: όλοι οι όροι ελέγχονται σε ένα πέρασμα
+SOC2_RE = re.compile(r'SOC|compliance|certification')
+REFUND_RE = re.compile(r'refund|policy', re.IGNORECASE)
+
+
+def print_matches(documents, pattern):
+    """Τυπώνει τα documents που ταιριάζουν με το pattern."""
+    for i, doc in enumerate(documents):
+        if pattern.search(doc):
+            print(f"Found at index {i}: {doc[:100]}...")
+
 
 def main():
     # Ελέγχουμε τι έχει αποθηκευτεί
-    chromadb = ChromaDBService()
-    result = chromadb.collection.get()
+    chromadb = get_chromadb_service()
+    result = chromadb.collection.get(include=['documents'])
 
     print(f"Total documents in ChromaDB: {len(result['documents'])}")
     print("\nFirst 5 stored documents:")
@@ -17,14 +30,10 @@ def main():
         print(f"{i+1}. {doc[:80]}...")
 
     print("\nSearching for SOC 2 related content:")
-    for i, doc in enumerate(result['documents']):
-        if 'SOC' in doc or 'compliance' in doc or 'certification' in doc:
-            print(f"Found at index {i}: {doc[:100]}...")
+    print_matches(result['documents'], SOC2_RE)
 
     print("\nSearching for refund related content:")
-    for i, doc in enumerate(result['documents']):
-        if 'refund' in doc.lower() or 'policy' in doc.lower():
-            print(f"Found at index {i}: {doc[:100]}...")
+    print_matches(result['documents'], REFUND_RE)
 
 if __name__ == "__main__":
     main()
@@ -5,16 +5,16 @@ Quick debug για να δούμε τα πραγματικά ChromaDB distances.
 
 import sys
 sys.path.append('.')
-from app.chromadb_service import ChromaDBService
-from app.embeddings_service import EmbeddingsService
+from app.chromadb_service import get_chromadb_service
+from app.embeddings_service import get_embeddings_service
 import numpy as np
 
 print('🔍 DEBUGGING CHROMADB DISTANCES')
 print('='*50)
 
 try:
-    embeddings_service = EmbeddingsService() 
-    chromadb_service = ChromaDBService()
+    embeddings_service = get_embeddings_service()
+    chromadb_service = get_chromadb_service()
     
     # Test queries
     queries = [
@@ -33,18 +33,19 @@ try:
         
         # Raw ChromaDB query
         results = chromadb_service.collection.query(
-            query_embeddings=[query_embedding],
+            query_embeddings=[query_embedding.tolist()],
             n_results=3,
             include=['documents', 'metadatas', 'distances']
         )
         
-        distances = results['distances'][0]
+        distances = np.asarray(results['distances'][0])
         documents = results['documents'][0]
         
-        for i, distance in enumerate(distances):
-            old_sim = max(0.0, 1.0 - (distance / 400.0))
-            new_sim = 1.0 / (1.0 + distance)
-            
+        # Similarities για όλα τα distances μαζί (vectorized)
+        old_sims = np.maximum(0.0, 1.0 - distances / 400.0)
+        new_sims = 1.0 / (1.0 + distances)
+        
+        for i, (distance, old_sim, new_sim) in enumerate(zip(distances, old_sims, new_sims)):
             print(f'  Result {i+1}:')
             print(f'    Distance: {distance:.6f}')
             print(f'    Old similarity: {old_sim:.6f}')  
@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""
+Debug script για τα embeddings: normalization και ChromaDB similarity scores.
+
+Όλα τα queries γίνονται embed με ένα batch call και ψάχνονται στο
+ChromaDB με ένα query, οπότε τα στατιστικά βγαίνουν vectorized (N x D).
+
+Το create_embeddings_batch επιστρέφει ήδη κανονικοποιημένα vectors, οπότε
+ο έλεγχος normalization γίνεται στα raw vectors του Ollama (/api/embed).
+"""
+
+import sys
+import os
+import numpy as np
+import requests
+sys.path.insert(0, os.path.abspath('.'))
+
+from app.embeddings_service import get_embeddings_service
+from app.chromadb_service import get_chromadb_service
+
+# Test queries
+QUERIES = [
+    "SOC 2 compliance certification",
+    "What is your refund policy?",
+    "Can I deploy with Docker?",
+]
+
+
+def fetch_raw_embeddings(embeddings_service, queries):
+    """
+    Τα embeddings όπως τα επιστρέφει το Ollama, χωρίς normalization.
+    
+    Ένα request στο /api/embed για όλα τα queries. Σε παλιότερο Ollama
+    (χωρίς /api/embed) πέφτουμε σε ένα /api/embeddings ανά query.
+    """
+    response = requests.post(
+        f"{embeddings_service.base_url}/api/embed",
+        json={"model": embeddings_service.model, "input": queries}
+    )
+    if response.status_code != 404:
+        response.raise_for_status()
+        return np.asarray(response.json()["embeddings"], dtype=np.float32)
+    
+    rows = []
+    for query in queries:
+        response = requests.post(
+            f"{embeddings_service.base_url}/api/embeddings",
+            json={"model": embeddings_service.model, "prompt": query}
+        )
+        response.raise_for_status()
+        rows.append(response.json()["embedding"])
+    return np.asarray(rows, dtype=np.float32)
+
+
+def debug_embedding_normalization(queries, embeddings):
+    """Norms και στατιστικά για όλα τα raw embeddings μαζί (ένα row ανά query)."""
+    print("🔍 Debugging embedding normalization...")
+
+    norms = np.linalg.norm(embeddings, axis=1)
+    mins = embeddings.min(axis=1)
+    maxs = embeddings.max(axis=1)
+    means = embeddings.mean(axis=1)
+    stds = embeddings.std(axis=1)
+    is_normalized = np.abs(norms - 1.0) < 0.01
+
+    print(f"Embedding dimensions: {embeddings.shape[1]}")
+    for i, text in enumerate(queries):
+        print(f"\nText: '{text}'")
+        print(f"  Embedding magnitude (L2 norm): {norms[i]:.6f}")
+        print(f"  Min value: {mins[i]:.6f}")
+        print(f"  Max value: {maxs[i]:.6f}")
+        print(f"  Mean value: {means[i]:.6f}")
+        print(f"  Standard deviation: {stds[i]:.6f}")
+        print(f"  Is normalized (norm ≈ 1.0): {is_normalized[i]}")
+
+    if not is_normalized.all():
+        print("\n⚠️  Embeddings are NOT normalized!")
+        print("This explains the large L2 distances in ChromaDB")
+
+        # Show what normalized would look like
+        normalized = embeddings / norms[:, np.newaxis]
+        print(f"Normalized magnitudes: {np.round(np.linalg.norm(normalized, axis=1), 6).tolist()}")
+
+
+def debug_similarity(queries, embeddings, n_results=3):
+    """Raw ChromaDB distances για όλα τα queries, με ένα batch query."""
+    print("\n🔍 Debugging ChromaDB similarity scores...")
+
+    chromadb_service = get_chromadb_service()
+    results = chromadb_service.collection.query(
+        query_embeddings=embeddings.tolist(),
+        n_results=n_results,
+        include=["metadatas", "distances"]
+    )
+
+    # Ένα row distances ανά query (N x n_results)
+    distances = np.asarray(results['distances'])
+
+    # Different similarity calculations
+    similarity_1 = 1 / (1 + distances)  # Current method
+    similarity_2 = 1 - np.minimum(distances / 2, 1)  # Alternative method
+    similarity_3 = np.maximum(0, 1 - distances)  # Simple subtraction
+
+    for q, query in enumerate(queries):
+        print(f"\nQuery: '{query}'")
+        print("=" * 50)
+
+        for i, metadata in enumerate(results['metadatas'][q]):
+            print(f"Result #{i+1}:")
+            print(f"  Question: {metadata['question'][:60]}...")
+            print(f"  Raw L2 Distance: {distances[q, i]}")
+            print(f"  Similarity method 1: {similarity_1[q, i]:.6f}")
+            print(f"  Similarity method 2: {similarity_2[q, i]:.6f}")
+            print(f"  Similarity method 3: {similarity_3[q, i]:.6f}")
+            print()
+
+
+if __name__ == "__main__":
+    embeddings_service = get_embeddings_service()
+    embeddings = np.asarray(
+        embeddings_service.create_embeddings_batch(QUERIES, show_progress=False)
+    )
+
+    debug_embedding_normalization(QUERIES, fetch_raw_embeddings(embeddings_service, QUERIES))
+    debug_similarity(QUERIES, embeddings)
@@ -50,11 +50,11 @@ def debug_rag():
                 # Test semantic search directly
                 print("\n  🧪 Testing semantic search directly...")
                 embedding = rag.embeddings_service.create_embedding(query)
-                semantic_results = rag.chromadb_service.search(embedding, n_results=3)
+                semantic_results = rag.semantic_search(embedding, n_results=3)
                 print(f"  Semantic search returned {len(semantic_results)} results")
                 
-                for j, sr in enumerate(semantic_results):
-                    print(f"    #{j+1}: similarity={sr.similarity:.3f}, qa_id={sr.qa_id}")
+                for j, (qa_id, similarity) in enumerate(semantic_results):
+                    print(f"    #{j+1}: similarity={similarity:.3f}, qa_id={qa_id}")
                 
                 # Test keyword search directly
                 print("\n  🧪 Testing keyword search directly...")
@@ -1,42 +1,60 @@
 """
-Script to fix the database schema by adding the missing 'source' column.
+Script to fix the database schema by adding the missing 'source' column
+and bringing the indexes in line with app/models.py.
 """
 
 import sqlite3
 import os
 
 def fix_database():
-    """Add the missing 'source' column to the questions table."""
+    """Add the missing 'source' column and the timestamp index to the questions table."""
     db_path = "faq.db"
     
     if not os.path.exists(db_path):
         print("❌ Database file not found")
         return False
     
+    conn = None
     try:
-        # Connect to the database
-        conn = sqlite3.connect(db_path)
+        # Connect to the database. isolation_level=None lets us manage the
+        # transaction explicitly, so the whole migration is one write.
+        conn = sqlite3.connect(db_path, isolation_level=None)
         cursor = conn.cursor()
         
+        # Same journal settings as app/database.py. journal_mode cannot be
+        # changed inside a transaction, so set it before BEGIN.
+        cursor.execute("PRAGMA journal_mode=WAL")
+        cursor.execute("PRAGMA synchronous=NORMAL")
+        cursor.execute("BEGIN IMMEDIATE")
+        
         # Check if the source column exists
         cursor.execute("PRAGMA table_info(questions)")
         columns = [column[1] for column in cursor.fetchall()]
         
         if 'source' in columns:
             print("✅ 'source' column already exists")
-            return True
+        else:
+            # Add the missing column. The DEFAULT fills existing rows,
+            # so no separate backfill UPDATE is needed.
+            print("🔧 Adding 'source' column to questions table...")
+            cursor.execute("ALTER TABLE questions ADD COLUMN source VARCHAR(50) DEFAULT 'api'")
         
-        # Add the missing column
-        print("🔧 Adding 'source' column to questions table...")
-        cursor.execute("ALTER TABLE questions ADD COLUMN source VARCHAR(50) DEFAULT 'api'")
+        # The history endpoint orders by timestamp, so it needs an index.
+        # The old index on the primary key is redundant (SQLite already
+        # indexes it) and only costs an extra b-tree write per INSERT.
+        print("🔧 Updating indexes on questions table...")
+        cursor.execute("CREATE INDEX IF NOT EXISTS ix_questions_timestamp ON questions (timestamp)")
+        cursor.execute("DROP INDEX IF EXISTS ix_questions_id")
         
         # Commit the changes
-        conn.commit()
+        cursor.execute("COMMIT")
         print("✅ Database schema fixed successfully!")
         
         return True
         
     except Exception as e:
+        if conn and conn.in_transaction:
+            conn.rollback()
         print(f"❌ Error fixing database: {e}")
         return False
         
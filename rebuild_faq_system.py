@@ -40,7 +40,8 @@ def rebuild_faq_system():
         rag_service = HybridRAGService(
             knowledge_base_path=kb_path,
             semantic_weight=0.6,  # 60% semantic, 40% keyword
-            keyword_weight=0.4
+            keyword_weight=0.4,
+            force_rebuild=True
         )
         
         build_time = time.time() - start_time
@@ -49,7 +50,6 @@ def rebuild_faq_system():
         # Get stats
         print("\n📊 Step 3: System Statistics")
         parser_stats = rag_service.parser.get_stats()
-        chromadb_stats = rag_service.chromadb_service.get_stats()
         
         print(f"  📖 Knowledge Base:")
         print(f"    - Total Q&A pairs: {parser_stats['total_pairs']}")
@@ -57,9 +57,14 @@ def rebuild_faq_system():
         print(f"    - Avg question length: {parser_stats['average_question_length']}")
         print(f"    - Avg answer length: {parser_stats['average_answer_length']}")
         
-        print(f"  🗄️  ChromaDB:")
-        print(f"    - Total embeddings: {chromadb_stats['total_embeddings']}")
-        print(f"    - Collection name: {chromadb_stats['collection_name']}")
+        print(f"  ⚡ Semantic index:")
+        print(f"    - Total embeddings: {len(rag_service.embedding_store)}")
+        
+        if rag_service.chromadb_service is not None:
+            chromadb_stats = rag_service.chromadb_service.get_stats()
+            print(f"  🗄️  ChromaDB:")
+            print(f"    - Total embeddings: {chromadb_stats['total_embeddings']}")
+            print(f"    - Collection name: {chromadb_stats['collection_name']}")
         
         return rag_service
         
@@ -3,8 +3,8 @@
 Test Docker deployment query - out of knowledge base question
 """
 
+import orjson
 import requests
-import json
 
 def test_docker_query():
     """Test την Docker ερώτηση που είναι εκτός knowledge base"""
@@ -18,7 +18,7 @@ def test_docker_query():
     response = requests.post(url, json={"question": query})
     
     if response.status_code == 200:
-        data = response.json()
+        data = orjson.loads(response.content)
         
         print(f"📊 Found {len(data['results'])} results\n")
         
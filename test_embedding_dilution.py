@@ -3,11 +3,12 @@
 Test to prove the embedding dilution problem
 """
 import sys
+import numpy as np
 sys.path.append('.')
-from app.embeddings_service import EmbeddingsService
+from app.embeddings_service import get_embeddings_service
 
 def main():
-    emb_service = EmbeddingsService()
+    emb_service = get_embeddings_service()
 
     # Test query
     query = 'SOC 2 compliance certification'
@@ -25,8 +26,6 @@ Answer: CloudSphere is SOC 2 Type II, ISO 27001, GDPR, and HIPAA-ready. Formal a
     print(f'🔍 Query: "{query}"')
     print()
     
-    query_emb = emb_service.create_embedding(query)
-    
     # Test όλες τις παραλλαγές
     tests = [
         ("Question only", question_only),
@@ -34,9 +33,18 @@ Answer: CloudSphere is SOC 2 Type II, ISO 27001, GDPR, and HIPAA-ready. Formal a
         ("Combined Q+A", combined)
     ]
     
-    for name, text in tests:
-        text_emb = emb_service.create_embedding(text)
-        similarity = emb_service.cosine_similarity(query_emb, text_emb)
+    # Το query και όλες οι παραλλαγές σε ένα batch (ένα /api/embed request,
+    # ή ταυτόχρονα requests αν το Ollama δεν έχει batch endpoint)
+    batch = emb_service.create_embeddings_batch(
+        [query] + [text for _, text in tests], show_progress=False
+    )
+    query_emb, text_embs = batch[0], batch[1:]
+    
+    # Τα embeddings του batch είναι unit vectors, οπότε όλα τα cosine
+    # similarities βγαίνουν με ένα matrix-vector product
+    similarities = text_embs @ query_emb
+    
+    for (name, _), similarity in zip(tests, similarities):
         print(f'{name:15} similarity: {similarity:.6f}')
         print(f'{"":15} Above 0.05? {similarity > 0.05}')
         print()
@@ -46,20 +54,26 @@ Answer: CloudSphere is SOC 2 Type II, ISO 27001, GDPR, and HIPAA-ready. Formal a
     print("🔍 CHECKING CHROMADB STORED EMBEDDINGS")
     print("="*50)
     
-    from app.chromadb_service import ChromaDBService
-    chromadb = ChromaDBService()
+    from app.chromadb_service import get_chromadb_service
+    chromadb = get_chromadb_service()
     
-    # Παίρνουμε τα stored documents
-    result = chromadb.collection.get()
-    soc_docs = [doc for doc in result['documents'] if 'SOC' in doc]
+    # Παίρνουμε τα stored documents μαζί με τα embeddings τους, ώστε η
+    # σύγκριση να γίνει με το vector που είναι πράγματι αποθηκευμένο
+    # (και χωρίς νέο embedding request για το document)
+    result = chromadb.collection.get(include=['documents', 'embeddings'])
+    soc_index = next(
+        (i for i, doc in enumerate(result['documents']) if 'SOC' in doc), None
+    )
     
-    if soc_docs:
-        stored_doc = soc_docs[0]
+    if soc_index is not None:
+        stored_doc = result['documents'][soc_index]
         print(f"Stored document preview: {stored_doc[:100]}...")
         
         # Υπολογίζουμε manual similarity
-        stored_emb = emb_service.create_embedding(stored_doc)
-        manual_sim = emb_service.cosine_similarity(query_emb, stored_emb)
+        # Το add_embeddings αποθηκεύει unit vectors και το query_emb είναι
+        # επίσης κανονικοποιημένο, οπότε το cosine είναι σκέτο dot product
+        stored_emb = np.asarray(result['embeddings'][soc_index], dtype=np.float32)
+        manual_sim = float(stored_emb @ query_emb)
         
         # Σύγκριση με ChromaDB search
         search_results = chromadb.search(query_emb, n_results=1)
@@ -9,16 +9,20 @@ import os
 sys.path.insert(0, os.path.abspath('.'))
 
 import numpy as np
-from typing import List
+from typing import List, Union
 
+rng = np.random.default_rng(0)  # Σταθερό seed
 
-def normalize_embedding(embedding: List[float]) -> List[float]:
-    """Normalize embedding to unit length (norm = 1)."""
-    emb_array = np.array(embedding)
-    norm = np.linalg.norm(emb_array)
+DTYPE = np.float32  # Όπως τα embeddings της εφαρμογής
+
+
+def normalize_embedding(embedding: Union[List[float], np.ndarray]) -> np.ndarray:
+    """Normalize embedding to unit length (norm = 1), as a float32 array."""
+    emb_array = np.ascontiguousarray(embedding, dtype=np.float32)
+    norm = np.sqrt(np.vdot(emb_array, emb_array))
     if norm == 0:
-        return embedding
-    return (emb_array / norm).tolist()
+        return emb_array
+    return emb_array / norm
 
 
 def test_normalization_effects():
@@ -27,7 +31,7 @@ def test_normalization_effects():
     print("=" * 60)
     
     # Mock embeddings με διαφορετικά norms (όπως τα δικά μας)
-    base_vector = np.array([1.5, -0.8, 2.1, -1.2, 0.9])
+    base_vector = np.array([1.5, -0.8, 2.1, -1.2, 0.9], dtype=DTYPE)
     
     # Test cases με διαφορετικά magnitude
     embeddings = [
@@ -38,44 +42,51 @@ def test_normalization_effects():
     ]
     
     queries = [
-        base_vector * 10 + np.random.normal(0, 0.1, 5),  # Παρόμοιο
-        base_vector * 10 + np.random.normal(0, 5, 5),    # Κάπως παρόμοιο
+        base_vector * 10 + rng.normal(0, 0.1, 5).astype(DTYPE),  # Παρόμοιο
+        base_vector * 10 + rng.normal(0, 5, 5).astype(DTYPE),    # Κάπως παρόμοιο
     ]
     
+    # Όλα τα embeddings σε έναν πίνακα (ένα row ανά embedding), ώστε κάθε
+    # μέθοδος να υπολογίζεται με μία vectorized πράξη για όλα μαζί
+    E = np.stack(embeddings)
+    assert E.dtype == DTYPE
+    sq_norms = np.einsum('ij,ij->i', E, E)
+    norms = np.sqrt(sq_norms)
+    
     print("📏 Embedding Norms:")
-    for i, emb in enumerate(embeddings):
-        print(f"  Embedding {i+1}: norm = {np.linalg.norm(emb):.2f}")
+    for i, norm in enumerate(norms):
+        print(f"  Embedding {i+1}: norm = {norm:.2f}")
     print()
     
     for q_idx, query in enumerate(queries):
-        print(f"🔍 Query {q_idx+1} (norm = {np.linalg.norm(query):.2f}):")
+        # Ένα E @ q για όλες τις μεθόδους: οι αποστάσεις βγαίνουν από τα
+        # dot products και τα norms, χωρίς πίνακες διαφορών (E - q)
+        dots = E @ query
+        query_sq_norm = np.vdot(query, query)
+        query_norm = np.sqrt(query_sq_norm)
+        
+        print(f"🔍 Query {q_idx+1} (norm = {query_norm:.2f}):")
         print(f"{'Method':<20} {'Emb1':<8} {'Emb2':<8} {'Emb3':<8} {'Emb4':<8}")
         print("-" * 60)
         
         # 1. L2 Distance (current ChromaDB method)
-        l2_distances = [np.linalg.norm(query - emb) for emb in embeddings]
-        l2_similarities = [1.0 / (1.0 + d) for d in l2_distances]
+        # ||e - q||² = ||e||² - 2 e·q + ||q||² (το max κόβει αρνητικά από rounding)
+        l2_distances = np.sqrt(np.maximum(sq_norms - 2 * dots + query_sq_norm, 0.0))
+        l2_similarities = 1.0 / (1.0 + l2_distances)
         print(f"{'L2 + Our Method':<20} {l2_similarities[0]:.3f}  {l2_similarities[1]:.3f}  {l2_similarities[2]:.3f}  {l2_similarities[3]:.3f}")
         
         # 2. Cosine Similarity (raw)
-        cosine_sims = []
-        for emb in embeddings:
-            cos_sim = np.dot(query, emb) / (np.linalg.norm(query) * np.linalg.norm(emb))
-            cosine_sims.append(cos_sim)
+        cosine_sims = dots / (norms * query_norm)
         print(f"{'Cosine (raw)':<20} {cosine_sims[0]:.3f}  {cosine_sims[1]:.3f}  {cosine_sims[2]:.3f}  {cosine_sims[3]:.3f}")
         
         # 3. Normalized embeddings + L2
-        norm_query = query / np.linalg.norm(query)
-        norm_embeddings = [emb / np.linalg.norm(emb) for emb in embeddings]
-        norm_l2_distances = [np.linalg.norm(norm_query - norm_emb) for norm_emb in norm_embeddings]
-        norm_l2_similarities = [1.0 / (1.0 + d) for d in norm_l2_distances]
+        # Για unit vectors: ||e - q|| = sqrt(2 - 2 cos)
+        norm_l2_distances = np.sqrt(np.maximum(2.0 - 2.0 * cosine_sims, 0.0))
+        norm_l2_similarities = 1.0 / (1.0 + norm_l2_distances)
         print(f"{'Normalized + L2':<20} {norm_l2_similarities[0]:.3f}  {norm_l2_similarities[1]:.3f}  {norm_l2_similarities[2]:.3f}  {norm_l2_similarities[3]:.3f}")
         
         # 4. Normalized embeddings + Cosine (should be identical to #3)
-        norm_cosine_sims = []
-        for norm_emb in norm_embeddings:
-            cos_sim = np.dot(norm_query, norm_emb)  # dot product για normalized vectors
-            norm_cosine_sims.append(cos_sim)
+        norm_cosine_sims = cosine_sims  # dot product των normalized vectors = cosine
         print(f"{'Normalized + Cosine':<20} {norm_cosine_sims[0]:.3f}  {norm_cosine_sims[1]:.3f}  {norm_cosine_sims[2]:.3f}  {norm_cosine_sims[3]:.3f}")
         print()
 
@@ -88,43 +99,47 @@ def test_real_world_scenarios():
     # Simulated embeddings για πραγματικές ερωτήσεις
     scenarios = {
         "Identical questions": {
-            "query": np.array([2.1, -1.5, 0.8, 1.9, -0.7]) * 15,
-            "target": np.array([2.1, -1.5, 0.8, 1.9, -0.7]) * 15 + np.random.normal(0, 0.1, 5)
+            "query": np.array([2.1, -1.5, 0.8, 1.9, -0.7], dtype=DTYPE) * 15,
+            "target": np.array([2.1, -1.5, 0.8, 1.9, -0.7], dtype=DTYPE) * 15 + rng.normal(0, 0.1, 5).astype(DTYPE)
         },
         "Similar questions": {
-            "query": np.array([1.8, -1.2, 1.1, 1.7, -0.9]) * 15,
-            "target": np.array([1.9, -1.3, 0.9, 1.8, -0.8]) * 15
+            "query": np.array([1.8, -1.2, 1.1, 1.7, -0.9], dtype=DTYPE) * 15,
+            "target": np.array([1.9, -1.3, 0.9, 1.8, -0.8], dtype=DTYPE) * 15
         },
         "Related topics": {
-            "query": np.array([1.5, -0.8, 2.1, -1.2, 0.9]) * 15,
-            "target": np.array([0.9, -1.1, 1.8, -0.7, 1.3]) * 15
+            "query": np.array([1.5, -0.8, 2.1, -1.2, 0.9], dtype=DTYPE) * 15,
+            "target": np.array([0.9, -1.1, 1.8, -0.7, 1.3], dtype=DTYPE) * 15
         },
         "Different topics": {
-            "query": np.array([1.5, -0.8, 2.1, -1.2, 0.9]) * 15,
-            "target": np.array([-0.5, 2.2, -1.8, 0.3, -1.7]) * 15
+            "query": np.array([1.5, -0.8, 2.1, -1.2, 0.9], dtype=DTYPE) * 15,
+            "target": np.array([-0.5, 2.2, -1.8, 0.3, -1.7], dtype=DTYPE) * 15
         }
     }
     
     print(f"{'Scenario':<20} {'L2+Our':<8} {'Cosine':<8} {'Norm+L2':<8} {'Recommendation'}")
     print("-" * 70)
     
-    for scenario_name, data in scenarios.items():
-        query = data["query"]
-        target = data["target"]
-        
-        # Method 1: L2 + Our conversion (current)
-        l2_dist = np.linalg.norm(query - target)
-        our_sim = 1.0 / (1.0 + l2_dist)
-        
-        # Method 2: True cosine similarity
-        cosine_sim = np.dot(query, target) / (np.linalg.norm(query) * np.linalg.norm(target))
-        
-        # Method 3: Normalized + L2
-        norm_query = query / np.linalg.norm(query)
-        norm_target = target / np.linalg.norm(target)
-        norm_l2_dist = np.linalg.norm(norm_query - norm_target)
-        norm_l2_sim = 1.0 / (1.0 + norm_l2_dist)
-        
+    # Queries και targets σε πίνακες (ένα row ανά scenario), ώστε κάθε
+    # μέθοδος να υπολογίζεται για όλα τα scenarios μαζί
+    Q = np.stack([data["query"] for data in scenarios.values()])
+    T = np.stack([data["target"] for data in scenarios.values()])
+    assert Q.dtype == T.dtype == DTYPE
+    
+    # Method 1: L2 + Our conversion (current)
+    l2_dists = np.linalg.norm(Q - T, axis=1)
+    our_sims = 1.0 / (1.0 + l2_dists)
+    
+    # Method 2: True cosine similarity (row-wise dot products / norms)
+    cosine_sims = np.einsum('ij,ij->i', Q, T) / np.sqrt(
+        np.einsum('ij,ij->i', Q, Q) * np.einsum('ij,ij->i', T, T)
+    )
+    
+    # Method 3: Normalized + L2 (για unit vectors: sqrt(2 - 2 cos))
+    norm_l2_sims = 1.0 / (1.0 + np.sqrt(np.maximum(2.0 - 2.0 * cosine_sims, 0.0)))
+    
+    for scenario_name, our_sim, cosine_sim, norm_l2_sim in zip(
+        scenarios, our_sims, cosine_sims, norm_l2_sims
+    ):
         # Recommendation based on the scenario
         if scenario_name == "Identical questions":
             recommendation = "All good" if our_sim > 0.4 else "Need norm"
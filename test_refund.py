@@ -2,8 +2,8 @@
 """
 Test script για in-scope query - refund policy
 """
+import orjson
 import requests
-import json
 
 def test_refund_query():
     url = "http://localhost:8002/api/v1/rag/search"
@@ -16,7 +16,7 @@ def test_refund_query():
         response = requests.post(url, json={"question": query})
         response.raise_for_status()
         
-        result = response.json()
+        result = orjson.loads(response.content)
         print(f"📊 Found {len(result['results'])} results")
         
         for i, result_item in enumerate(result['results'][:5]):
@@ -66,7 +66,7 @@ def test_refund_query():
         
     except requests.exceptions.RequestException as e:
         print(f"❌ Error: {e}")
-    except json.JSONDecodeError as e:
+    except orjson.JSONDecodeError as e:
         print(f"❌ JSON Error: {e}")
     except Exception as e:
         print(f"❌ Unexpected error: {e}")
@@ -10,6 +10,10 @@ sys.path.insert(0, os.path.abspath('.'))
 
 import numpy as np
 
+rng = np.random.default_rng(0)  # Σταθερό seed
+
+DTYPE = np.float32  # Όπως τα embeddings της εφαρμογής
+
 
 def test_with_mock_data():
     """Δοκιμάζει με simulated ChromaDB data."""
@@ -30,13 +34,18 @@ def test_with_mock_data():
     print(f"{'Distance':<10} {'Old Score':<10} {'New Score':<10} {'Description'}")
     print("-" * 60)
     
-    for distance, description in test_cases:
-        # Παλιά (λάθος) μέθοδος
-        old_similarity = max(0.0, 1.0 - (distance / 400.0))
-        
-        # Νέα (διορθωμένη) μέθοδος
-        new_similarity = 1.0 / (1.0 + distance)
-        
+    # Όλα τα distances μαζί, ώστε οι δύο μετατροπές να γίνονται vectorized
+    distances = np.fromiter((distance for distance, _ in test_cases), dtype=np.float64, count=len(test_cases))
+    
+    # Παλιά (λάθος) μέθοδος
+    old_similarities = np.maximum(0.0, 1.0 - distances / 400.0)
+    
+    # Νέα (διορθωμένη) μέθοδος
+    new_similarities = 1.0 / (1.0 + distances)
+    
+    for (distance, description), old_similarity, new_similarity in zip(
+        test_cases, old_similarities, new_similarities
+    ):
         print(f"{distance:<10.1f} {old_similarity:<10.3f} {new_similarity:<10.3f} {description}")
     
     print("\n💡 Key Improvements:")
@@ -77,16 +86,16 @@ def simulate_realistic_search():
         print(f"{'Rank':<4} {'Distance':<10} {'Similarity':<12} {'Description'}")
         print("-" * 50)
         
-        ranked_results = []
-        for distance, description in scenario['results']:
-            similarity = 1.0 / (1.0 + distance)
-            ranked_results.append((similarity, distance, description))
+        results = scenario['results']
+        distances = np.fromiter((distance for distance, _ in results), dtype=np.float64, count=len(results))
+        similarities = 1.0 / (1.0 + distances)
         
-        # Sort by similarity (descending)
-        ranked_results.sort(key=lambda x: x[0], reverse=True)
+        # Sort by similarity (descending) - stable, ώστε οι ισοβαθμίες
+        # να κρατούν τη σειρά τους όπως με το list.sort
+        order = np.argsort(-similarities, kind='stable')
         
-        for i, (similarity, distance, description) in enumerate(ranked_results, 1):
-            print(f"{i:<4} {distance:<10.1f} {similarity:<12.3f} {description}")
+        for i, index in enumerate(order, 1):
+            print(f"{i:<4} {distances[index]:<10.1f} {similarities[index]:<12.3f} {results[index][1]}")
     
     print("\n✅ Results now show realistic similarity scores!")
     print("   - Perfect matches: ~0.5-0.9 similarity")
@@ -100,29 +109,35 @@ def compare_with_cosine():
     print("=" * 60)
     
     # Mock embeddings (unnormalized, like ours)
-    emb_base = np.array([1.5, -0.8, 2.1, -1.2, 0.9]) * 15  # norm ~21
+    emb_base = np.array([1.5, -0.8, 2.1, -1.2, 0.9], dtype=DTYPE) * 15  # norm ~21
     
     test_embeddings = [
         (emb_base, "Identical embedding"),
-        (emb_base + np.random.normal(0, 0.1, 5), "Almost identical"),
-        (emb_base + np.random.normal(0, 2, 5), "Similar embedding"),
-        (emb_base + np.random.normal(0, 8, 5), "Different embedding"),
-        (np.random.normal(0, 10, 5), "Random embedding")
+        (emb_base + rng.normal(0, 0.1, 5).astype(DTYPE), "Almost identical"),
+        (emb_base + rng.normal(0, 2, 5).astype(DTYPE), "Similar embedding"),
+        (emb_base + rng.normal(0, 8, 5).astype(DTYPE), "Different embedding"),
+        (rng.normal(0, 10, 5).astype(DTYPE), "Random embedding")
     ]
     
     print(f"{'Test Case':<20} {'L2 Dist':<10} {'Our Sim':<10} {'Cosine':<10}")
     print("-" * 60)
     
-    for emb, description in test_embeddings:
-        # L2 distance
-        l2_distance = np.linalg.norm(emb_base - emb)
-        
-        # Our similarity from L2 distance
-        our_similarity = 1.0 / (1.0 + l2_distance)
-        
-        # True cosine similarity
-        cosine_sim = np.dot(emb_base, emb) / (np.linalg.norm(emb_base) * np.linalg.norm(emb))
-        
+    # Όλα τα test embeddings σε έναν πίνακα (ένα row ανά embedding)
+    E = np.stack([emb for emb, _ in test_embeddings])
+    assert E.dtype == DTYPE
+    
+    # L2 distance
+    l2_distances = np.linalg.norm(E - emb_base, axis=1)
+    
+    # Our similarity from L2 distance
+    our_similarities = 1.0 / (1.0 + l2_distances)
+    
+    # True cosine similarity
+    cosine_sims = (E @ emb_base) / np.sqrt(np.einsum('ij,ij->i', E, E) * np.vdot(emb_base, emb_base))
+    
+    for (_, description), l2_distance, our_similarity, cosine_sim in zip(
+        test_embeddings, l2_distances, our_similarities, cosine_sims
+    ):
         print(f"{description:<20} {l2_distance:<10.2f} {our_similarity:<10.3f} {cosine_sim:<10.3f}")
     
     print("\n📊 Analysis:")
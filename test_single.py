@@ -3,13 +3,15 @@
 Single request test to check LLM performance without concurrent load
 """
 
+import orjson
 import requests
-import json
 import time
 
+BASE_URL = "http://localhost:8002/api/v1"
+ASK_URL = f"{BASE_URL}/ask"
+RAG_SEARCH_URL = f"{BASE_URL}/rag/search"
+
 def test_single_request():
-    url = "http://localhost:8002/api/v1/ask"
-    
     payload = {
         "question": "What compliance certifications do you have?"
     }
@@ -17,26 +19,38 @@ def test_single_request():
     print("🔍 Testing single request...")
     print(f"Question: {payload['question']}")
     
-    start_time = time.time()
+    # Ένα Session ώστε το warm-up και το μετρημένο request να
+    # χρησιμοποιούν την ίδια (ήδη ανοιχτή) connection
+    session = requests.Session()
+    
+    # Warm-up (δεν μετράει): τα models φορτώνονται ήδη στο startup του
+    # server, οπότε ζεσταίνουμε μόνο το retrieval (embedding + search cache)
+    # και ο χρόνος παρακάτω αφορά κυρίως το LLM
+    try:
+        session.post(RAG_SEARCH_URL, json=payload, timeout=120)
+    except requests.exceptions.RequestException as e:
+        print(f"⚠️  Warm-up failed: {e}")
+    
+    start_time = time.perf_counter()
     
     try:
-        response = requests.post(url, json=payload, timeout=120)
+        response = session.post(ASK_URL, json=payload, timeout=120)
         
-        end_time = time.time()
+        end_time = time.perf_counter()
         duration = end_time - start_time
         
         print(f"⏱️  Response time: {duration:.2f} seconds")
         print(f"📊 Status code: {response.status_code}")
         
         if response.status_code == 200:
-            data = response.json()
+            data = orjson.loads(response.content)
             print(f"✅ Success! Answer length: {len(data.get('answer', ''))}")
             print(f"📝 Answer: {data.get('answer', 'No answer')}")
         else:
             print(f"❌ Error: {response.text}")
             
     except Exception as e:
-        end_time = time.time()
+        end_time = time.perf_counter()
         duration = end_time - start_time
         print(f"⚠️  Exception after {duration:.2f}s: {e}")
 